@@ -3,6 +3,17 @@ from alembic import context
 from sqlmodel import SQLModel
 from db.sqlmodel import create_engine_from_env as engine
 
+# Import every model module so their tables are registered on the metadata.
+import models.comment  # noqa: F401
+import models.feed  # noqa: F401
+import models.journal  # noqa: F401
+import models.mail  # noqa: F401
+import models.prompt  # noqa: F401
+import models.search  # noqa: F401
+import models.social  # noqa: F401
+import models.subscription  # noqa: F401
+import models.user  # noqa: F401
+
 # Alembic Config object
 config = context.config
 
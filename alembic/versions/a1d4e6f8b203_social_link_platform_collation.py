@@ -0,0 +1,40 @@
+"""social link platform collation
+
+Revision ID: a1d4e6f8b203
+Revises: f2c7a9e05b38
+Create Date: 2026-10-18 17:05:44.281930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1d4e6f8b203'
+down_revision: Union[str, Sequence[str], None] = 'f2c7a9e05b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Binary collation so uq_user_social_links_user_id_platform matches the
+    # bulk upsert's exact-string keys. The old case-insensitive key already
+    # kept case variants apart, so no rows clash.
+    op.alter_column('user_social_links', 'platform',
+               existing_type=sqlmodel.sql.sqltypes.AutoString(length=255),
+               type_=sa.String(length=255).with_variant(mysql.VARCHAR(length=255, collation='utf8mb4_bin'), 'mysql'),
+               existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fails if a user has links differing only in case or accents.
+    op.alter_column('user_social_links', 'platform',
+               existing_type=sa.String(length=255).with_variant(mysql.VARCHAR(length=255, collation='utf8mb4_bin'), 'mysql'),
+               type_=sqlmodel.sql.sqltypes.AutoString(length=255),
+               existing_nullable=False)
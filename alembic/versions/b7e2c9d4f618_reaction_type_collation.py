@@ -0,0 +1,51 @@
+"""reaction type collation
+
+Revision ID: b7e2c9d4f618
+Revises: a1d4e6f8b203
+Create Date: 2026-10-18 17:31:12.904517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c9d4f618'
+down_revision: Union[str, Sequence[str], None] = 'a1d4e6f8b203'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Reaction types are now stored stripped; surrounding whitespace used to
+    # be kept by the single-reaction endpoint. Keep the oldest of each set
+    # that becomes a duplicate once trimmed.
+    op.execute(
+        "DELETE newer FROM journal_reactions AS newer "
+        "JOIN journal_reactions AS older ON older.journal_id = newer.journal_id "
+        "AND older.user_id = newer.user_id "
+        "AND TRIM(older.reaction_type) = TRIM(newer.reaction_type) AND older.id < newer.id"
+    )
+    op.execute("UPDATE journal_reactions SET reaction_type = TRIM(reaction_type)")
+    # Binary collation so the unique key matches the bulk endpoint's
+    # exact-string keys.
+    op.alter_column('journal_reactions', 'reaction_type',
+               existing_type=sqlmodel.sql.sqltypes.AutoString(),
+               type_=sa.String(length=255).with_variant(mysql.VARCHAR(length=255, collation='utf8mb4_bin'), 'mysql'),
+               existing_nullable=False)
+    # Counters of journals that lost padded duplicates are repaired by the
+    # periodic counter reconciliation.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fails if a user has reactions differing only in case or accents.
+    op.alter_column('journal_reactions', 'reaction_type',
+               existing_type=sa.String(length=255).with_variant(mysql.VARCHAR(length=255, collation='utf8mb4_bin'), 'mysql'),
+               type_=sqlmodel.sql.sqltypes.AutoString(),
+               existing_nullable=False)
@@ -0,0 +1,157 @@
+import logging
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger("app.schema")
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+VERSIONS_DIR = ALEMBIC_INI.parent / "alembic" / "versions"
+# "strict" refuses to start on a schema that is not at the latest migration,
+# "warn" only logs it and "off" skips the check.
+SCHEMA_CHECK = os.getenv("SCHEMA_CHECK", "strict").lower()
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+# Alembic's runtime costs a few hundred milliseconds to import, so workers
+# only load it to run migrations; the startup check reads the version
+# table and the revision ids directly.
+_REVISION_ID = re.compile(r"^revision(?:\s*:\s*str)?\s*=\s*['\"]([0-9a-f]+)['\"]", re.MULTILINE)
+_DOWN_REVISION_ID = re.compile(
+    r"^down_revision(?:\s*:[^=]+)?\s*=\s*(?:None|['\"]([0-9a-f]+)['\"])", re.MULTILINE
+)
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    return Config(str(ALEMBIC_INI))
+
+
+@lru_cache(maxsize=1)
+def head_revision() -> str:
+    """Latest migration revision: the one no other revision names as its parent."""
+    revisions, parents = set(), set()
+    for path in VERSIONS_DIR.glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        revision = _REVISION_ID.search(source)
+        down_revision = _DOWN_REVISION_ID.search(source)
+        if revision is None or down_revision is None:
+            continue
+        revisions.add(revision.group(1))
+        if down_revision.group(1):
+            parents.add(down_revision.group(1))
+    heads = revisions - parents
+    if len(heads) != 1:
+        raise SchemaVersionError(f"Expected one migration head, found {sorted(heads) or 'none'}")
+    return heads.pop()
+
+
+async def _current_revision(engine: AsyncEngine) -> Optional[str]:
+    async with engine.connect() as connection:
+        try:
+            return (await connection.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+        except DBAPIError:
+            return None  # never migrated
+
+
+async def check_schema_version(engine: AsyncEngine) -> None:
+    """Compare the database's alembic revision to the latest migration in one query.
+
+    Workers no longer create or reflect tables at startup; the schema is owned
+    by migrations applied once per deploy with `python -m db.migrate`.
+    """
+    if SCHEMA_CHECK == "off":
+        return
+    current = await _current_revision(engine)
+    expected = head_revision()
+    if current == expected:
+        return
+    message = (
+        f"Database schema is at revision {current or 'none'}, expected {expected}; "
+        f"run `python -m db.migrate`"
+    )
+    if SCHEMA_CHECK == "warn":
+        logger.warning(message)
+        return
+    raise SchemaVersionError(message)
+
+
+def migrate(revision: str = "head", sql: bool = False) -> None:
+    """Upgrade the database to `revision`; with `sql`, print the statements instead of running them."""
+    from alembic import command
+
+    command.upgrade(alembic_config(), revision, sql=sql)
+
+
+def _create_all_and_stamp(connection) -> None:
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+    from sqlmodel import SQLModel
+
+    import models.comment  # noqa: F401
+    import models.feed  # noqa: F401
+    import models.journal  # noqa: F401
+    import models.mail  # noqa: F401
+    import models.prompt  # noqa: F401
+    import models.search  # noqa: F401
+    import models.social  # noqa: F401
+    import models.subscription  # noqa: F401
+    import models.user  # noqa: F401
+
+    SQLModel.metadata.create_all(connection)
+    MigrationContext.configure(connection).stamp(
+        ScriptDirectory.from_config(alembic_config()), "head"
+    )
+
+
+async def create_all_and_stamp(engine: AsyncEngine) -> None:
+    """Create every table from the models and mark the database as migrated.
+
+    Only for throwaway stand-in databases (DB_ASYNC_URL, e.g. SQLite), which
+    the MySQL migrations do not target.
+    """
+    async with engine.begin() as connection:
+        await connection.run_sync(_create_all_and_stamp)
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Apply database migrations.")
+    parser.add_argument("revision", nargs="?", default="head")
+    parser.add_argument(
+        "--create-all",
+        action="store_true",
+        help="create tables from the models and stamp them (DB_ASYNC_URL stand-in databases only)",
+    )
+    parser.add_argument("--sql", action="store_true", help="print the MySQL upgrade statements instead of running them")
+    args = parser.parse_args()
+    load_dotenv()
+
+    if args.create_all:
+        from db.sqlmodel import create_async_engine_from_env, dispose_async_engine
+
+        async def _main() -> None:
+            engine = create_async_engine_from_env()
+            try:
+                await create_all_and_stamp(engine)
+            finally:
+                await dispose_async_engine(engine)
+
+        asyncio.run(_main())
+        print(f"Created tables at revision {head_revision()}")
+    else:
+        migrate(args.revision, sql=args.sql)
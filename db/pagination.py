@@ -0,0 +1,51 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def paginate_newest_first(statement, created_at_column, id_column, cursor: Optional[str], skip: int, limit: int):
+    """Order by `(created_at, id)` descending and page by cursor, or by offset when no cursor is given.
+
+    The same ordering is used in both modes so a client can start with
+    `skip` and switch to the returned `next_cursor` without gaps. One row
+    past `limit` is fetched so `split_page` can tell whether another page exists.
+    """
+    statement = statement.order_by(created_at_column.desc(), id_column.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        statement = statement.where(
+            or_(
+                created_at_column < created_at,
+                and_(created_at_column == created_at, id_column < row_id),
+            )
+        )
+    elif skip:
+        statement = statement.offset(skip)
+    return statement.limit(limit + 1)
+
+
+def split_page(rows: Sequence[Any], limit: int) -> tuple[Sequence[Any], Optional[str]]:
+    """The first `limit` rows and the cursor after them, or None when nothing follows."""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last.created_at, last.id)
@@ -0,0 +1,125 @@
+import os
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from middleware.metrics import Histogram, render_metric
+
+
+def _get_int_env(name: str, default_value: int) -> int:
+    try:
+        return int(os.getenv(name, str(default_value)))
+    except ValueError:
+        return default_value
+
+
+# DB_POOL_MAXSIZE is shared with db/mysql.create_pool: the steady-state number of connections.
+POOL_SIZE = _get_int_env("DB_POOL_MAXSIZE", 10)
+POOL_MAX_OVERFLOW = _get_int_env("DB_POOL_MAX_OVERFLOW", 5)
+POOL_TIMEOUT_SECONDS = _get_int_env("DB_POOL_TIMEOUT_SECONDS", 10)
+# Connections older than this are replaced on checkout. Keep it below MySQL's
+# wait_timeout (and any proxy idle timeout) so a dead socket is never handed out.
+POOL_RECYCLE_SECONDS = _get_int_env("DB_POOL_RECYCLE_SECONDS", 1800)
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "").lower() in ("1", "true", "yes")
+
+# Checkout waits are normally sub-millisecond; the tail is what matters.
+CHECKOUT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkout_wait = Histogram(CHECKOUT_BUCKETS)
+        self.exhausted = 0
+        self.timeouts = 0
+
+    def stats(self, pool) -> dict[str, int | float]:
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+            "exhausted": self.exhausted,
+            "timeouts": self.timeouts,
+            "checkouts": sum(self.checkout_wait.counts),
+            "checkout_wait_seconds": round(self.checkout_wait.sum, 6),
+        }
+
+
+class _InstrumentedGet:
+    """Times `QueuePool._do_get`, the only place a checkout can block."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        if self.checkedin() == 0 and self._max_overflow > -1 and self._overflow >= self._max_overflow:
+            self.metrics.exhausted += 1
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.checkout_wait.observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_InstrumentedGet, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedGet, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(pool) -> dict[str, int | float]:
+    metrics = getattr(pool, "metrics", None)
+    return metrics.stats(pool) if metrics is not None else {}
+
+
+def render_pool_metrics(pools: dict[str, object]) -> str:
+    """Prometheus text for instrumented pools, labelled by role (`primary`, `replica`)."""
+    pools = {role: pool for role, pool in pools.items() if getattr(pool, "metrics", None) is not None}
+    lines = []
+    for name, help_text, read in (
+        ("db_pool_size", "Configured steady-state connections.", lambda pool: pool.size()),
+        ("db_pool_checked_out", "Connections currently checked out.", lambda pool: pool.checkedout()),
+        ("db_pool_idle", "Idle connections in the pool.", lambda pool: pool.checkedin()),
+        ("db_pool_overflow", "Connections open beyond the pool size.", lambda pool: max(0, pool.overflow())),
+    ):
+        lines += render_metric(name, "gauge", help_text, {(("role", role),): read(pool) for role, pool in pools.items()})
+    lines += render_metric(
+        "db_pool_exhausted_total",
+        "counter",
+        "Checkouts that found no idle connection and no overflow headroom.",
+        {(("role", role),): pool.metrics.exhausted for role, pool in pools.items()},
+    )
+    lines += render_metric(
+        "db_pool_timeouts_total",
+        "counter",
+        "Checkouts that gave up after the pool timeout.",
+        {(("role", role),): pool.metrics.timeouts for role, pool in pools.items()},
+    )
+    lines += [
+        "# HELP db_pool_checkout_wait_seconds Time spent waiting for a pooled connection.",
+        "# TYPE db_pool_checkout_wait_seconds histogram",
+    ]
+    for role, pool in sorted(pools.items()):
+        lines += pool.metrics.checkout_wait.render("db_pool_checkout_wait_seconds", role=role)
+    return "\n".join(lines) + "\n"
+
+
+def pool_options(url: str, asynchronous: bool) -> dict:
+    """Engine keyword arguments for the configured pool."""
+    if url.startswith("sqlite") and ":memory:" in url:
+        return {}  # single shared connection; nothing to size
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if asynchronous else InstrumentedQueuePool,
+        "pool_size": POOL_SIZE,
+        "max_overflow": POOL_MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT_SECONDS,
+        "pool_recycle": POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": POOL_PRE_PING,
+    }
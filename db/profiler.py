@@ -0,0 +1,104 @@
+import os
+import re
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def _get_int_env(name: str, default_value: int) -> int:
+    try:
+        return int(os.getenv(name, str(default_value)))
+    except ValueError:
+        return default_value
+
+
+SQL_PROFILER_ENABLED = os.getenv("SQL_PROFILER", "").lower() in ("1", "true", "yes")
+# The same statement shape this many times in one request is reported as a likely N+1.
+REPEAT_THRESHOLD = _get_int_env("SQL_PROFILER_REPEAT_THRESHOLD", 3)
+RECENT_PROFILES = _get_int_env("SQL_PROFILER_RECENT", 50)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryProfile:
+    """Queries issued while one profile is active (normally one HTTP request)."""
+
+    def __init__(self, label: str = "", capture: bool = False):
+        self.label = label
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter[str] = Counter()
+        # With `capture`, every (statement, parameters) pair is kept, e.g. to EXPLAIN it.
+        self.statements: Optional[list[tuple[str, Any]]] = [] if capture else None
+
+    def record(self, statement: str, seconds: float, parameters: Any = None) -> None:
+        self.count += 1
+        self.seconds += seconds
+        # Statements are already parameterized, so the text is the shape.
+        self.shapes[_WHITESPACE.sub(" ", statement).strip()] += 1
+        if self.statements is not None:
+            self.statements.append((statement, parameters))
+
+    def repeated(self, threshold: int = REPEAT_THRESHOLD) -> dict[str, int]:
+        return {shape: count for shape, count in self.shapes.items() if count >= threshold}
+
+    def as_dict(self) -> dict:
+        return {
+            "label": self.label,
+            "queries": self.count,
+            "db_ms": round(self.seconds * 1000, 3),
+            "repeated": self.repeated(),
+        }
+
+
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+recent_profiles: deque[dict] = deque(maxlen=max(1, RECENT_PROFILES))
+
+
+@contextmanager
+def profile_queries(label: str = "", capture: bool = False) -> Iterator[QueryProfile]:
+    """Attribute queries run in the current context to a fresh `QueryProfile`."""
+    profile = QueryProfile(label, capture)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def assert_query_budget(profile: QueryProfile, max_queries: int, repeat_threshold: int = REPEAT_THRESHOLD) -> None:
+    """Fail if `profile` ran more than `max_queries` queries or repeated a statement shape N+1-style."""
+    problems = []
+    if profile.count > max_queries:
+        problems.append(f"{profile.count} queries over a budget of {max_queries}")
+    for shape, count in profile.repeated(repeat_threshold).items():
+        problems.append(f"{count}x {shape}")
+    if problems:
+        raise AssertionError(f"{profile.label}: " + "; ".join(problems))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return  # started before the profiler was installed on a live engine
+    started = starts.pop()
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(statement, time.perf_counter() - started, parameters)
+
+
+def install_query_profiler(engine: Engine) -> None:
+    """Hook cursor execution on a sync engine (use `AsyncEngine.sync_engine` for async ones)."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,24 @@
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+
+def select_columns(model, schema: type[BaseModel], fields: Optional[str], always: Iterable[str] = ("id", "created_at")):
+    """Columns of `model` backing `schema`, narrowed to a `fields=a,b,c` sparse fieldset.
+
+    `always` columns are selected regardless so rows can still be keyed and
+    paged by cursor. Names outside `schema` are rejected with a 400.
+    """
+    if not fields:
+        names = list(schema.model_fields)
+    else:
+        requested = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = sorted(set(requested) - set(schema.model_fields))
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown field(s): {', '.join(unknown)}",
+            )
+        names = list(dict.fromkeys([*always, *requested]))
+    return [getattr(model, name) for name in names]
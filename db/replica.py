@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Mapping, Optional
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from security.jwt import decode_access_token
+from security.principal_cache import TTLCache, principal_cache
+
+logger = logging.getLogger("app.replica")
+
+
+def _get_int_env(name: str, default_value: int) -> int:
+    try:
+        return int(os.getenv(name, str(default_value)))
+    except ValueError:
+        return default_value
+
+
+# After a write, the same client reads from the primary for this long.
+READ_YOUR_WRITES_SECONDS = _get_int_env("DB_READ_YOUR_WRITES_SECONDS", 5)
+READ_YOUR_WRITES_MAX_USERS = _get_int_env("DB_READ_YOUR_WRITES_MAX_USERS", 10_000)
+# Replicas further behind than this (or whose lag cannot be measured) are skipped.
+REPLICA_MAX_LAG_SECONDS = _get_int_env("DB_REPLICA_MAX_LAG_SECONDS", 2)
+REPLICA_LAG_CHECK_SECONDS = _get_int_env("DB_REPLICA_LAG_CHECK_SECONDS", 5)
+
+STICKY_COOKIE = "primary_until"
+
+
+# Users who committed within READ_YOUR_WRITES_SECONDS. Bearer-token clients
+# (mobile apps, scripts) drop cookies, so stickiness is keyed by the caller;
+# the cookie still covers anonymous writes such as sign-up.
+recent_writers: TTLCache[bool] = TTLCache(READ_YOUR_WRITES_MAX_USERS, READ_YOUR_WRITES_SECONDS)
+
+
+def _caller_id(request: Request) -> Optional[int]:
+    """User id from the request's bearer token, or None when there is no valid one."""
+    parts = request.headers.get("authorization", "").split()
+    if len(parts) != 2 or parts[0].lower() != "bearer":
+        return None
+    user_id = principal_cache.get_user_id(parts[1])
+    if user_id is not None:
+        return user_id
+    try:
+        return int(decode_access_token(parts[1]).get("sub"))
+    except (HTTPException, TypeError, ValueError):
+        return None
+
+
+def mark_primary_sticky(request: Request, response: Response) -> None:
+    until = int(time.time()) + READ_YOUR_WRITES_SECONDS
+    response.set_cookie(
+        STICKY_COOKIE, str(until), max_age=READ_YOUR_WRITES_SECONDS, httponly=True, samesite="lax"
+    )
+    user_id = _caller_id(request)
+    if user_id is not None:
+        recent_writers.set(user_id, True)
+
+
+def _is_sticky(request: Request) -> bool:
+    try:
+        if int(request.cookies.get(STICKY_COOKIE, "0")) > time.time():
+            return True
+    except ValueError:
+        pass
+    user_id = _caller_id(request)
+    return user_id is not None and recent_writers.get(user_id) is not None
+
+
+# MySQL 8.0.22+ names the column after the source; MariaDB (which also accepts
+# SHOW REPLICA STATUS) and older MySQL still call it the master.
+_LAG_COLUMNS = ("Seconds_Behind_Source", "Seconds_Behind_Master")
+
+
+def replication_lag(row: Optional[Mapping[str, Any]]) -> Optional[float]:
+    """Seconds behind from a replica status row, or None when it cannot be trusted.
+
+    No row means replication is not configured; a missing or NULL column means
+    the server reports lag some other way or replication is stopped.
+    """
+    if row is None:
+        return None
+    for column in _LAG_COLUMNS:
+        value = row.get(column)
+        if value is not None:
+            return float(value)
+    return None
+
+
+class ReplicaLagMonitor:
+    """Background task that samples replication lag; `usable` gates routing to the replica.
+
+    The replica starts out unusable until the first successful sample.
+    """
+
+    def __init__(self, engine: AsyncEngine, interval_seconds: int, max_lag_seconds: int):
+        self.engine = engine
+        self.interval_seconds = max(1, interval_seconds)
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_seconds: Optional[float] = None
+        self.usable = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def measure(self) -> Optional[float]:
+        if self.engine.dialect.name != "mysql":
+            return 0.0  # local stand-ins have no replication to lag behind
+        async with self.engine.connect() as connection:
+            for statement in ("SHOW REPLICA STATUS", "SHOW SLAVE STATUS"):
+                try:
+                    row = (await connection.execute(text(statement))).mappings().first()
+                except Exception:
+                    continue
+                return replication_lag(row)
+        return None
+
+    async def check(self) -> None:
+        try:
+            self.lag_seconds = await self.measure()
+        except Exception:
+            logger.exception("replica lag check failed")
+            self.lag_seconds = None
+        usable = self.lag_seconds is not None and self.lag_seconds <= self.max_lag_seconds
+        if usable != self.usable:
+            logger.warning("replica routing changed", extra={"usable": usable, "lag_seconds": self.lag_seconds})
+        self.usable = usable
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval_seconds)
+
+    def stats(self) -> dict[str, Optional[float | bool]]:
+        return {"usable": self.usable, "lag_seconds": self.lag_seconds, "max_lag_seconds": self.max_lag_seconds}
+
+
+async def get_read_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Session for read-only handlers: the replica when it is fresh enough, else the primary.
+
+    Callers that wrote within `READ_YOUR_WRITES_SECONDS` stay on the primary.
+    """
+    state = request.app.state
+    session_factory = state.async_session_factory
+    monitor: Optional[ReplicaLagMonitor] = getattr(state, "replica_lag_monitor", None)
+    if monitor is not None and monitor.usable and not _is_sticky(request):
+        session_factory = state.replica_session_factory
+    async with session_factory() as session:
+        yield session
@@ -1,8 +1,15 @@
 import os
-from typing import Iterator
+from typing import AsyncIterator, Optional
 
-from fastapi import Request
-from sqlmodel import Session, create_engine
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlmodel import create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db.pool import pool_options
+from db.profiler import SQL_PROFILER_ENABLED, install_query_profiler
+from db.replica import mark_primary_sticky
 
 
 def _require_env(name: str) -> str:
@@ -21,17 +28,73 @@ def build_mysql_url() -> str:
     return f"mysql+pymysql://{user}:{password}@{host}:{port}/{db_name}?charset=utf8mb4"
 
 
+def build_async_mysql_url() -> str:
+    # DB_ASYNC_URL lets a local stand-in (e.g. sqlite+aiosqlite) replace MySQL.
+    override = _require_env("DB_ASYNC_URL")
+    if override:
+        return override
+    return build_mysql_url().replace("mysql+pymysql://", "mysql+aiomysql://", 1)
+
+
+def build_replica_async_url() -> str:
+    """Async URL of the read replica, or "" when every read stays on the primary."""
+    override = _require_env("DB_REPLICA_ASYNC_URL")
+    if override:
+        return override
+    host = _require_env("DB_REPLICA_HOST")
+    if not host:
+        return ""
+    port = os.getenv("DB_REPLICA_PORT", os.getenv("DB_PORT", "3306"))
+    user = os.getenv("DB_REPLICA_USER", os.getenv("DB_USER", "root"))
+    password = os.getenv("DB_REPLICA_PASSWORD", os.getenv("DB_PASSWORD", ""))
+    db_name = _require_env("DB_NAME")
+    return f"mysql+aiomysql://{user}:{password}@{host}:{port}/{db_name}?charset=utf8mb4"
+
+
 def create_engine_from_env():
     url = build_mysql_url()
-    print( url)
-    return create_engine(url, pool_pre_ping=True)
+    engine = create_engine(url, **pool_options(url, asynchronous=False))
+    if SQL_PROFILER_ENABLED:
+        install_query_profiler(engine)
+    return engine
+
+
+def create_async_engine_from_env() -> AsyncEngine:
+    url = build_async_mysql_url()
+    engine = create_async_engine(url, **pool_options(url, asynchronous=True))
+    if SQL_PROFILER_ENABLED:
+        install_query_profiler(engine.sync_engine)
+    return engine
+
+
+def create_async_replica_engine_from_env() -> Optional[AsyncEngine]:
+    url = build_replica_async_url()
+    if not url:
+        return None
+    engine = create_async_engine(url, **pool_options(url, asynchronous=True))
+    if SQL_PROFILER_ENABLED:
+        install_query_profiler(engine.sync_engine)
+    return engine
+
+
+def create_async_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    # Handlers keep using ORM objects (and the current user) after commit, so
+    # attributes must not be expired and lazily reloaded outside the loop.
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
 def dispose_engine(engine) -> None:
     engine.dispose()
 
 
-def get_session(request: Request) -> Iterator[Session]:
-    session_factory = request.app.state.sql_session_factory
-    with session_factory() as session:
-        yield session
\ No newline at end of file
+async def dispose_async_engine(engine: AsyncEngine) -> None:
+    await engine.dispose()
+
+
+async def get_async_session(request: Request, response: Response) -> AsyncIterator[AsyncSession]:
+    session_factory = request.app.state.async_session_factory
+    async with session_factory() as session:
+        if getattr(request.app.state, "replica_session_factory", None) is not None:
+            # Keep this caller's reads on the primary until replicas have caught up.
+            event.listen(session.sync_session, "after_commit", lambda _: mark_primary_sticky(request, response))
+        yield session
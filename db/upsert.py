@@ -0,0 +1,52 @@
+import os
+from typing import Sequence
+
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+def _get_int_env(name: str, default_value: int) -> int:
+    try:
+        return int(os.getenv(name, str(default_value)))
+    except ValueError:
+        return default_value
+
+
+# Upper bound on items in one bulk request; enforced by the request schemas.
+BULK_MAX_ITEMS = _get_int_env("BULK_MAX_ITEMS", 100)
+
+
+async def upsert_rows(
+    session: AsyncSession,
+    model,
+    rows: Sequence[dict],
+    key_columns: Sequence[str],
+    update_columns: Sequence[str] = (),
+) -> None:
+    """One multi-row INSERT that updates `update_columns` on a unique-key clash.
+
+    With no `update_columns` clashing rows are left untouched. `key_columns`
+    name the unique key; MySQL infers it, SQLite (used in development) needs it.
+    Rows are inserted as given, so they must carry values for columns whose
+    defaults live on the SQLModel class, such as `created_at`.
+    """
+    if not rows:
+        return
+    if session.bind.dialect.name == "sqlite":
+        statement = sqlite_insert(model).values(list(rows))
+        if update_columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=list(key_columns),
+                set_={column: statement.excluded[column] for column in update_columns},
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=list(key_columns))
+    else:
+        statement = mysql_insert(model).values(list(rows))
+        # Re-assigning a key column is a no-op update; unlike INSERT IGNORE
+        # it does not also swallow foreign key and truncation errors.
+        statement = statement.on_duplicate_key_update(
+            {column: statement.inserted[column] for column in update_columns or key_columns[:1]}
+        )
+    await session.exec(statement)
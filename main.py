@@ -3,8 +3,14 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from dotenv import load_dotenv
 
-from db.sqlmodel import create_engine_from_env, dispose_engine
-from sqlmodel import SQLModel, Session
+from db.migrate import check_schema_version
+from db.replica import REPLICA_LAG_CHECK_SECONDS, REPLICA_MAX_LAG_SECONDS, ReplicaLagMonitor
+from db.sqlmodel import (
+    create_async_engine_from_env,
+    create_async_replica_engine_from_env,
+    create_async_session_factory,
+    dispose_async_engine,
+)
 from routers.user_routes import router as user_router
 from routers.health_routes import router as health_router
 from routers.journal_routes import router as journal_router
@@ -13,8 +19,27 @@ from routers.social_routes import router as social_router
 from routers.subscription_routes import router as subscription_router
 from routers.prompt_routes import router as prompt_router
 from routers.miscellaneous_routes import router as miscellaneous_router
+from routers.feed_routes import router as feed_router
+from routers.tag_routes import router as tag_router
+from routers.metrics_routes import router as metrics_router
 from middleware.timing import TimingMiddleware
+from middleware.compression import CompressionMiddleware
+from middleware.query_profiler import QueryProfilerMiddleware
+from db.profiler import SQL_PROFILER_ENABLED
 from middleware.exception_handlers import register_exception_handlers
+from security.otp_store import otp_store
+from security.passwords import password_hasher
+from services.content_service import content_processor
+from services.counter_service import RECONCILE_INTERVAL_SECONDS, CounterReconciler
+from services.tag_service import TRENDING_RESYNC_SECONDS, TrendingTagsResync
+from services.mail_service import MailOutboxWorker, create_transport_from_env
+from services.engagement_buffer import (
+    FLUSH_INTERVAL_MS,
+    FLUSH_MAX_EVENTS,
+    WAL_DIR,
+    WRITE_BEHIND_ENABLED,
+    EngagementBuffer,
+)
 
 load_dotenv()
 
@@ -22,14 +47,49 @@ load_dotenv()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Starting up...")
-    app.state.sql_engine = create_engine_from_env()
-    # Auto-create tables at startup
-    SQLModel.metadata.create_all(app.state.sql_engine)
-    app.state.sql_session_factory = lambda: Session(app.state.sql_engine)
+    app.state.async_engine = create_async_engine_from_env()
+    try:
+        await check_schema_version(app.state.async_engine)
+    except Exception:
+        await dispose_async_engine(app.state.async_engine)
+        raise
+    app.state.async_session_factory = create_async_session_factory(app.state.async_engine)
+    app.state.replica_engine = create_async_replica_engine_from_env()
+    app.state.replica_session_factory = None
+    app.state.replica_lag_monitor = None
+    if app.state.replica_engine is not None:
+        app.state.replica_session_factory = create_async_session_factory(app.state.replica_engine)
+        app.state.replica_lag_monitor = ReplicaLagMonitor(
+            app.state.replica_engine, REPLICA_LAG_CHECK_SECONDS, REPLICA_MAX_LAG_SECONDS
+        )
+        app.state.replica_lag_monitor.start()
+    counter_reconciler = CounterReconciler(app.state.async_session_factory, RECONCILE_INTERVAL_SECONDS)
+    counter_reconciler.start()
+    trending_resync = TrendingTagsResync(app.state.async_session_factory, TRENDING_RESYNC_SECONDS)
+    await trending_resync.start()
+    app.state.mail_worker = MailOutboxWorker(app.state.async_session_factory, create_transport_from_env())
+    app.state.mail_worker.start()
+    app.state.engagement_buffer = None
+    if WRITE_BEHIND_ENABLED:
+        app.state.engagement_buffer = EngagementBuffer(
+            app.state.async_session_factory, WAL_DIR, FLUSH_MAX_EVENTS, FLUSH_INTERVAL_MS
+        )
+        await app.state.engagement_buffer.start()
     try:
         yield
     finally:
-        dispose_engine(app.state.sql_engine)
+        if app.state.engagement_buffer is not None:
+            await app.state.engagement_buffer.stop()
+        await app.state.mail_worker.stop()
+        await trending_resync.stop()
+        await counter_reconciler.stop()
+        if app.state.replica_engine is not None:
+            await app.state.replica_lag_monitor.stop()
+            await dispose_async_engine(app.state.replica_engine)
+        await dispose_async_engine(app.state.async_engine)
+        await otp_store.close()
+        password_hasher.shutdown()
+        content_processor.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -43,10 +103,16 @@ app.include_router(social_router)
 app.include_router(subscription_router)
 app.include_router(prompt_router)
 app.include_router(miscellaneous_router)
+app.include_router(feed_router)
+app.include_router(tag_router)
 app.include_router(health_router)
+app.include_router(metrics_router)
 
 
+app.add_middleware(CompressionMiddleware)
 app.add_middleware(TimingMiddleware)
+if SQL_PROFILER_ENABLED:
+    app.add_middleware(QueryProfilerMiddleware)
 
 # if __name__ == "__main__":
 #     uvicorn.run("main:app", host=HOST, port=PORT)
\ No newline at end of file
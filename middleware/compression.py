@@ -0,0 +1,257 @@
+import gzip
+import os
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def _get_int_env(name: str, default_value: int) -> int:
+    try:
+        return int(os.getenv(name, str(default_value)))
+    except ValueError:
+        return default_value
+
+
+# Bodies smaller than this are sent as-is; below roughly a packet, compression
+# saves no round-trips and still costs CPU.
+COMPRESSION_MIN_BYTES = _get_int_env("COMPRESSION_MIN_BYTES", 1024)
+GZIP_LEVEL = _get_int_env("COMPRESSION_GZIP_LEVEL", 6)
+BROTLI_QUALITY = _get_int_env("COMPRESSION_BROTLI_QUALITY", 5)
+# Compressed bodies of responses that carry an ETag are kept for reuse, up to
+# this many bytes in total (least recently used evicted first).
+COMPRESSION_CACHE_BYTES = _get_int_env("COMPRESSION_CACHE_BYTES", 16 * 1024 * 1024)
+
+# Content types worth compressing; images, archives and other already
+# compressed formats are left alone.
+_COMPRESSIBLE_TYPES = frozenset(
+    {
+        "application/json",
+        "application/javascript",
+        "application/xml",
+        "image/svg+xml",
+    }
+)
+_COMPRESSIBLE_PREFIXES = ("text/",)
+
+
+@lru_cache(maxsize=1)
+def _brotli():
+    """The optional `brotli` package, or None; `br` is only offered when it is installed."""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def _compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type in _COMPRESSIBLE_TYPES or media_type.startswith(_COMPRESSIBLE_PREFIXES)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Best of `br` and `gzip` acceptable to the client, by q-value then server preference."""
+    offered = ["br", "gzip"] if _brotli() is not None else ["gzip"]
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            weights[coding] = quality
+    best, best_quality = None, 0.0
+    for coding in offered:
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return _brotli().compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+# (path, query string, ETag, encoding): the query can select a different body
+# (e.g. `fields=`) under the same row-derived ETag.
+CacheKey = tuple[str, bytes, str, str]
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies keyed by `CacheKey`, bounded by total bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[CacheKey, bytes] = OrderedDict()
+        self.size = 0
+
+    def get(self, key: CacheKey) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def put(self, key: CacheKey, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self._entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ResponseCompressor:
+    """Compresses response bodies, reusing cached output for bodies identified by an ETag."""
+
+    def __init__(self, cache_bytes: int):
+        self.cache = CompressedBodyCache(cache_bytes)
+        self.compressed = 0
+        self.cache_hits = 0
+        self.skipped_small = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    def compress(self, body: bytes, encoding: str, key: Optional[CacheKey] = None) -> bytes:
+        compressed = self.cache.get(key) if key else None
+        if compressed is not None:
+            self.cache_hits += 1
+        else:
+            started = time.process_time()
+            compressed = compress(body, encoding)
+            self.cpu_seconds += time.process_time() - started
+            self.compressed += 1
+            if key:
+                self.cache.put(key, compressed)
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+        return compressed
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "compressed": self.compressed,
+            "cache_hits": self.cache_hits,
+            "skipped_small": self.skipped_small,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "cache_entries": len(self.cache),
+            "cache_bytes": self.cache.size,
+        }
+
+
+response_compressor = ResponseCompressor(COMPRESSION_CACHE_BYTES)
+
+
+def _weaken_etag(start_message: Message) -> None:
+    start_message.setdefault("headers", [])
+    headers = MutableHeaders(scope=start_message)
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["etag"] = f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """Pure ASGI response compression negotiated from Accept-Encoding.
+
+    Only complete (non-streaming) bodies of compressible content types at
+    or above `min_bytes` are compressed. When the response carries an ETag
+    the compressed body is cached under it, so a hot journal is compressed
+    once per encoding rather than on every hit. The ETag is weakened, as
+    the compressed bytes differ from the identity representation. It is
+    weakened on every response to a client that accepts an encoding,
+    including 304s and bodies too small to compress, so the validator a
+    client stores always matches the one it is later sent; the
+    conditional-GET check already compares weakly.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        min_bytes: int = COMPRESSION_MIN_BYTES,
+        compressor: Optional[ResponseCompressor] = None,
+    ):
+        self.app = app
+        self.min_bytes = min_bytes
+        self.compressor = compressor or response_compressor
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                _weaken_etag(message)
+                headers = Headers(raw=message.get("headers", []))
+                if (
+                    message["status"] < 200
+                    or message["status"] in (204, 304)
+                    or "content-encoding" in headers
+                    or not _compressible(headers.get("content-type", ""))
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message  # held until the body is known
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            if message.get("more_body", False):
+                # Streaming responses are passed through untouched.
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+            await self._send_complete(scope, encoding, start_message, message.get("body", b""), send)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_complete(
+        self, scope: Scope, encoding: str, start_message: Message, body: bytes, send: Send
+    ) -> None:
+        headers = MutableHeaders(raw=list(start_message.get("headers", [])))
+        headers.add_vary_header("Accept-Encoding")
+        if len(body) < self.min_bytes:
+            self.compressor.skipped_small += 1
+            start_message["headers"] = headers.raw
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        etag = headers.get("etag")
+        key = (scope["path"], scope["query_string"], etag, encoding) if etag and scope["method"] == "GET" else None
+        compressed = self.compressor.compress(body, encoding, key)
+
+        headers["content-encoding"] = encoding
+        headers["content-length"] = str(len(compressed))
+        start_message["headers"] = headers.raw
+        await send(start_message)
+        await send({"type": "http.response.body", "body": compressed})
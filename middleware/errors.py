@@ -1,22 +1,26 @@
 import logging
-from typing import Callable
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 logger = logging.getLogger("app.errors")
 
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable):
+class ErrorHandlingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         try:
-            return await call_next(request)
-        except Exception as exc:
+            await self.app(scope, receive, send)
+        except Exception:
             logger.exception(
                 "Unhandled error",
                 extra={
-                    "path": request.url.path,
-                    "method": request.method,
+                    "path": scope["path"],
+                    "method": scope["method"],
                 },
             )
-            raise
\ No newline at end of file
+            raise
@@ -4,6 +4,9 @@ import uuid
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
+from sqlalchemy.exc import IntegrityError
+
+from middleware.http_cache import NotModified, not_modified_handler
 
 
 async def http_exception_handler(request: Request, exc: HTTPException):
@@ -14,6 +17,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             "message": exc.detail if isinstance(exc.detail, str) else "Request failed",
             "data": None,
         },
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -28,6 +32,35 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+# MySQL ER_DUP_ENTRY and ER_DUP_UNIQUE.
+_MYSQL_DUPLICATE_KEY_ERRORS = {1062, 1169}
+_SQLITE_DUPLICATE_KEY_ERRORS = {"SQLITE_CONSTRAINT_UNIQUE", "SQLITE_CONSTRAINT_PRIMARYKEY"}
+
+
+def is_unique_violation(exc: IntegrityError) -> bool:
+    """Whether `exc` is a duplicate key, as opposed to a foreign key, NOT NULL or CHECK failure."""
+    error_name = getattr(exc.orig, "sqlite_errorname", None)
+    if error_name is not None:
+        return error_name in _SQLITE_DUPLICATE_KEY_ERRORS
+    args = getattr(exc.orig, "args", ())
+    return bool(args) and args[0] in _MYSQL_DUPLICATE_KEY_ERRORS
+
+
+async def integrity_error_handler(request: Request, exc: IntegrityError):
+    # Unique constraints back duplicate checks (follows, favorites, reactions, ...).
+    # Any other violation is a bug rather than a conflict.
+    if not is_unique_violation(exc):
+        return await unhandled_exception_handler(request, exc)
+    return JSONResponse(
+        status_code=409,
+        content={
+            "status": False,
+            "message": "Resource already exists",
+            "data": None,
+        },
+    )
+
+
 async def unhandled_exception_handler(request: Request, exc: Exception):
     request_id = str(uuid.uuid4())
     return JSONResponse(
@@ -43,4 +76,6 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
 def register_exception_handlers(app: FastAPI) -> None:
     app.add_exception_handler(HTTPException, http_exception_handler)
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(IntegrityError, integrity_error_handler)
+    app.add_exception_handler(NotModified, not_modified_handler)
     app.add_exception_handler(Exception, unhandled_exception_handler)
\ No newline at end of file
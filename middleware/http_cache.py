@@ -0,0 +1,92 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, Optional
+
+from fastapi import Request, Response
+
+
+class NotModified(Exception):
+    """Raised by `Validators.check` to short-circuit a handler with a bodiless 304."""
+
+    def __init__(self, headers: dict[str, str]):
+        self.headers = headers
+
+
+async def not_modified_handler(request: Request, exc: NotModified):
+    return Response(status_code=304, headers=exc.headers)
+
+
+def etag_for(*parts: Any) -> str:
+    """Strong ETag over the `repr` of `parts` (ids, timestamps, counters, row values)."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def content_etag(rows: Iterable[Any]) -> str:
+    """ETag over the column values of SQLModel instances or result rows, for resources without an `updated_at`."""
+    return etag_for(*(tuple(row.model_dump().values()) if hasattr(row, "model_dump") else tuple(row) for row in rows))
+
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored.
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+class Validators:
+    def __init__(self, request: Request, response: Response, cache_control: str):
+        self.request = request
+        self.response = response
+        response.headers["Cache-Control"] = cache_control
+
+    def check(self, etag: Optional[str] = None, last_modified: Optional[datetime] = None) -> None:
+        """Attach validators to the response; raise `NotModified` if the client's copy is current.
+
+        Call before building the response payload so a 304 skips serialization.
+        `last_modified` is a naive UTC datetime, as stored by the models.
+        """
+        headers = {"Cache-Control": self.response.headers["Cache-Control"]}
+        if etag is not None:
+            headers["ETag"] = etag
+        if last_modified is not None:
+            headers["Last-Modified"] = _http_date(last_modified)
+        self.response.headers.update(headers)
+
+        if_none_match = self.request.headers.get("if-none-match")
+        if if_none_match is not None:
+            # If-Modified-Since is ignored when If-None-Match is present (RFC 9110 13.1.3).
+            if etag is not None and _etag_matches(if_none_match, etag):
+                raise NotModified(headers)
+            return
+        if_modified_since = self.request.headers.get("if-modified-since")
+        if if_modified_since is not None and last_modified is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            if last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since:
+                raise NotModified(headers)
+
+
+class ConditionalGet:
+    """Route dependency giving handlers conditional-GET support under a fixed Cache-Control policy.
+
+        validators: Annotated[Validators, Depends(ConditionalGet("private, no-cache"))]
+        ...
+        validators.check(etag=etag_for(row.id, row.updated_at), last_modified=row.updated_at)
+    """
+
+    def __init__(self, cache_control: str):
+        self.cache_control = cache_control
+
+    def __call__(self, request: Request, response: Response) -> Validators:
+        return Validators(request, response, self.cache_control)
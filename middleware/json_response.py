@@ -0,0 +1,63 @@
+from typing import Any
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+
+class PreEncodedJSON(bytes):
+    """JSON body already produced by the response model's serializer."""
+
+
+class EnvelopeJSONResponse(JSONResponse):
+    """JSONResponse rendered by pydantic-core instead of the stdlib json module."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, PreEncodedJSON):
+            return content
+        return to_json(content)
+
+
+class _JSONResponseField:
+    """Response field that serializes straight to JSON bytes.
+
+    FastAPI validates the handler's return value against the response model,
+    dumps it to plain Python objects and then json.dumps them. Dumping
+    straight to JSON bytes does the last two steps in one pass in Rust.
+    Validation itself is left to the wrapped field: it is what keeps
+    ORM-only columns out of responses, and instances already of the model's
+    type pass through it.
+    """
+
+    def __init__(self, field: Any, response_model: Any):
+        self._field = field
+        self._adapter = TypeAdapter(response_model)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._field, name)
+
+    def serialize(self, value: Any, *, mode: str = "json", **options) -> Any:
+        if mode != "json":
+            return self._field.serialize(value, mode=mode, **options)
+        return PreEncodedJSON(self._adapter.dump_json(value, **options))
+
+
+class EnvelopeRoute(APIRoute):
+    """Route class that encodes `response_model` output with `EnvelopeJSONResponse`."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        response_class = kwargs.get("response_class")
+        if response_class is None or isinstance(response_class, DefaultPlaceholder):
+            kwargs["response_class"] = DefaultPlaceholder(EnvelopeJSONResponse)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        field = self.secure_cloned_response_field
+        if field is not None and issubclass(response_class, EnvelopeJSONResponse):
+            self.secure_cloned_response_field = _JSONResponseField(field, self.response_model)
+        return super().get_route_handler()
@@ -0,0 +1,98 @@
+from collections import defaultdict
+from typing import Sequence
+
+# Prometheus client defaults, in seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class Histogram:
+    """One Prometheus histogram series (a fixed label set)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # Non-cumulative per-bucket counts; the last slot is +Inf.
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for index, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[index] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+
+    def render(self, name: str, **labels: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for upper, count in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += count
+            le = upper if isinstance(upper, str) else repr(upper)
+            lines.append(f"{name}_bucket{_labels(**labels, le=le)} {cumulative}")
+        lines.append(f"{name}_sum{_labels(**labels)} {self.sum}")
+        lines.append(f"{name}_count{_labels(**labels)} {cumulative}")
+        return lines
+
+
+def render_metric(name: str, kind: str, help_text: str, samples: dict[tuple[tuple[str, str], ...], float]) -> list[str]:
+    """HELP/TYPE header plus one line per `((label, value), ...) -> sample`."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in sorted(samples.items()):
+        lines.append(f"{name}{_labels(**dict(labels))} {value}")
+    return lines
+
+
+class HttpMetrics:
+    """In-process request metrics rendered in the Prometheus text exposition format.
+
+    Series are keyed by route template (`/journals/{journal_id}`), never by
+    raw path, so cardinality stays bounded by the number of routes.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.in_flight = 0
+        self.requests: dict[tuple[str, str, str], int] = defaultdict(int)
+        self.durations: dict[tuple[str, str], Histogram] = {}
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float) -> None:
+        self.requests[(method, route, str(status_code))] += 1
+        histogram = self.durations.get((method, route))
+        if histogram is None:
+            histogram = self.durations[(method, route)] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def render(self) -> str:
+        lines = render_metric(
+            "http_requests_in_flight", "gauge", "Requests currently being served.", {(): self.in_flight}
+        )
+        lines += render_metric(
+            "http_requests_total",
+            "counter",
+            "Completed requests by route template and status code.",
+            {
+                (("method", method), ("route", route), ("status", status_code)): count
+                for (method, route, status_code), count in self.requests.items()
+            },
+        )
+        lines += [
+            "# HELP http_request_duration_seconds Request latency by route template.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.durations.items()):
+            lines += histogram.render("http_request_duration_seconds", method=method, route=route)
+        return "\n".join(lines) + "\n"
+
+
+http_metrics = HttpMetrics()
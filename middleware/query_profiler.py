@@ -0,0 +1,51 @@
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from db.profiler import profile_queries, recent_profiles
+
+logger = logging.getLogger("app.sql")
+
+
+class QueryProfilerMiddleware:
+    """Profiles the SQL issued by each request.
+
+    Adds `X-DB-Query-Count`, `X-DB-Time-Ms` and `X-DB-Repeated-Queries`
+    (statement shapes at or above the N+1 threshold) to the response, logs
+    likely N+1 patterns, and keeps recent profiles for `/health/sql-profile`.
+    Queries issued after the response has started are not in the headers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with profile_queries(f"{scope['method']} {scope['path']}") as profile:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-db-query-count", str(profile.count).encode()),
+                        (b"x-db-time-ms", f"{profile.seconds * 1000:.3f}".encode()),
+                        (b"x-db-repeated-queries", str(len(profile.repeated())).encode()),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    profile.label = f"{scope['method']} {route}"
+                repeated = profile.repeated()
+                if repeated:
+                    logger.warning(
+                        "likely N+1 queries",
+                        extra={"route": profile.label, "repeated": repeated},
+                    )
+                recent_profiles.append(profile.as_dict())
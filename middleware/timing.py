@@ -1,23 +1,52 @@
 import time
 import logging
-from typing import Callable
+from typing import Optional
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from middleware.metrics import HttpMetrics, http_metrics
 
 logger = logging.getLogger("app.timing")
 
 
-class TimingMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, slow_ms: int = 500):
-        super().__init__(app)
+class TimingMiddleware:
+    """Pure ASGI request timing: `X-Process-Time` header, slow-request log and route metrics.
+
+    The header carries milliseconds until the response starts; the metrics
+    observe the full request including the body, so streaming responses are
+    measured correctly and passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, slow_ms: int = 500, metrics: Optional[HttpMetrics] = None):
+        self.app = app
         self.slow_ms = slow_ms
+        self.metrics = metrics or http_metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next: Callable):
         start = time.perf_counter()
-        response = await call_next(request)
-        duration_ms = int((time.perf_counter() - start) * 1000)
-        response.headers["X-Process-Time"] = str(duration_ms)
-        if duration_ms >= self.slow_ms:
-            logger.warning("slow request", extra={"path": request.url.path, "ms": duration_ms})
-        return response
\ No newline at end of file
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration_ms = int((time.perf_counter() - start) * 1000)
+                message["headers"] = [*message.get("headers", []), (b"x-process-time", str(duration_ms).encode())]
+            await send(message)
+
+        self.metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.metrics.in_flight -= 1
+            seconds = time.perf_counter() - start
+            # The router stores the matched route in the scope; unmatched paths share one series.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            self.metrics.observe(scope["method"], route, status_code, seconds)
+            duration_ms = int(seconds * 1000)
+            if duration_ms >= self.slow_ms:
+                logger.warning("slow request", extra={"path": route, "ms": duration_ms})
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Optional, Annotated
 
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from models.user import User
 from models.journal import Journal
@@ -8,6 +9,10 @@ from models.journal import Journal
 
 class Comment(SQLModel, table=True):
     __tablename__ = "comments"
+    __table_args__ = (
+        # Keyset pagination per journal: WHERE journal_id, is_deleted ORDER BY created_at, id.
+        Index("ix_comments_journal_id_is_deleted_created_at_id", "journal_id", "is_deleted", "created_at", "id"),
+    )
 
     id: Annotated[Optional[int], Field(default=None, primary_key=True)]
     journal_id: Annotated[int, Field(foreign_key="journals.id")]
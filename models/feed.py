@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Annotated
+
+from sqlalchemy import Index
+from sqlmodel import SQLModel, Field
+
+
+class UserTimeline(SQLModel, table=True):
+    """Materialized home timeline rows written when a journal is fanned out to followers."""
+
+    __tablename__ = "user_timeline"
+    __table_args__ = (
+        Index("ix_user_timeline_user_id_created_at_journal_id", "user_id", "created_at", "journal_id"),
+        Index("ix_user_timeline_journal_id", "journal_id"),
+    )
+
+    user_id: Annotated[int, Field(foreign_key="users.id", primary_key=True)]
+    journal_id: Annotated[int, Field(foreign_key="journals.id", primary_key=True)]
+    author_id: Annotated[int, Field(foreign_key="users.id")]
+    # Copy of the journal's created_at so the timeline can be paged from its own index.
+    created_at: Annotated[datetime, Field(nullable=False)]
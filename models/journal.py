@@ -1,49 +1,101 @@
 from datetime import datetime
 from typing import Optional, Annotated, List
 
+from sqlalchemy import Index, String, Text, UniqueConstraint
+from sqlalchemy.dialects.mysql import MEDIUMTEXT, VARCHAR
 from sqlmodel import SQLModel, Field, Relationship
 from models.user import User
 
 
 class Journal(SQLModel, table=True):
     __tablename__ = "journals"
+    __table_args__ = (
+        # Keyset pagination for the public listing: WHERE is_deleted ORDER BY created_at, id.
+        Index("ix_journals_is_deleted_created_at_id", "is_deleted", "created_at", "id"),
+        # Per-author listing, used when the feed pulls journals of high-follower accounts.
+        Index("ix_journals_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id: Annotated[Optional[int], Field(default=None, primary_key=True)]
     user_id: Annotated[int, Field(foreign_key="users.id")]
     title: Annotated[str, Field(max_length=255)]
+    # Derived from html_content by services.content_service on every write.
     body_snippet: Annotated[Optional[str], Field(default=None)]
-    html_content: Annotated[Optional[str], Field(default=None)]
+    html_content: Annotated[Optional[str], Field(default=None, sa_type=Text().with_variant(MEDIUMTEXT(), "mysql"))]
+    word_count: Annotated[int, Field(default=0, sa_column_kwargs={"server_default": "0"})]
+    reading_time_minutes: Annotated[int, Field(default=0, sa_column_kwargs={"server_default": "0"})]
     is_private: Annotated[bool, Field(default=False)]
     image_url: Annotated[Optional[str], Field(default=None)]
     is_deleted: Annotated[bool, Field(default=False)]
     deleted_at: Annotated[Optional[datetime], Field(default=None)]
+    # Denormalized engagement counters, kept in step by services.counter_service.
+    reactions_count: Annotated[int, Field(default=0, sa_column_kwargs={"server_default": "0"})]
+    comments_count: Annotated[int, Field(default=0, sa_column_kwargs={"server_default": "0"})]
+    favorites_count: Annotated[int, Field(default=0, sa_column_kwargs={"server_default": "0"})]
+    shares_count: Annotated[int, Field(default=0, sa_column_kwargs={"server_default": "0"})]
     created_at: Annotated[datetime, Field(default_factory=datetime.utcnow, nullable=False)]
     updated_at: Annotated[datetime, Field(default_factory=datetime.utcnow, nullable=False)]
 
     user: Optional[User] = Relationship(back_populates="journals")
     comments: List["Comment"] = Relationship(back_populates="journal")
 
+class Tag(SQLModel, table=True):
+    """Tag dictionary; `name` is normalized by `services.tag_service.normalize_tag`."""
+
+    __tablename__ = "tags"
+    __table_args__ = (
+        UniqueConstraint("name", name="uq_tags_name"),
+    )
+
+    id: Annotated[Optional[int], Field(default=None, primary_key=True)]
+    # Binary collation, so uq_tags_name agrees with Python string equality:
+    # the default one would treat "café" and "cafe" as the same tag.
+    name: Annotated[str, Field(sa_type=String(100).with_variant(VARCHAR(100, collation="utf8mb4_bin"), "mysql"))]
+    created_at: Annotated[datetime, Field(default_factory=datetime.utcnow, nullable=False)]
+
+
 class JournalTags(SQLModel, table=True):
     __tablename__ = "journal_tags"
+    __table_args__ = (
+        UniqueConstraint("journal_id", "tag_id", name="uq_journal_tags_journal_id_tag_id"),
+        # Keyset pagination of one tag's journals without touching the journals table order.
+        Index("ix_journal_tags_tag_id_journal_created_at_journal_id", "tag_id", "journal_created_at", "journal_id"),
+        # Seeding the trending window.
+        Index("ix_journal_tags_created_at", "created_at"),
+    )
 
     id: Annotated[Optional[int], Field(default=None, primary_key=True)]
     journal_id: Annotated[int, Field(foreign_key="journals.id")]
-    tag: Annotated[str, Field(max_length=100)]
+    tag_id: Annotated[int, Field(foreign_key="tags.id")]
+    # Copy of the journal's created_at so a tag's journals can be paged from this table's index.
+    journal_created_at: Annotated[datetime, Field(nullable=False)]
     created_at: Annotated[datetime, Field(default_factory=datetime.utcnow, nullable=False)]
 
 
 class JournalReactions(SQLModel, table=True):
     __tablename__ = "journal_reactions"
+    __table_args__ = (
+        UniqueConstraint(
+            "journal_id", "user_id", "reaction_type",
+            name="uq_journal_reactions_journal_id_user_id_reaction_type",
+        ),
+    )
 
     id: Annotated[Optional[int], Field(default=None, primary_key=True)]
     journal_id: Annotated[int, Field(foreign_key="journals.id")]
     user_id: Annotated[int, Field(foreign_key="users.id")]
-    reaction_type: str
+    # Binary collation, like tags.name: the unique key must agree with the
+    # exact strings the bulk endpoint keys its results by.
+    reaction_type: Annotated[str, Field(sa_type=String(255).with_variant(VARCHAR(255, collation="utf8mb4_bin"), "mysql"))]
     created_at: Annotated[datetime, Field(default_factory=datetime.utcnow, nullable=False)]
 
 
 class JournalFavorites(SQLModel, table=True):
     __tablename__ = "journal_favorites"
+    __table_args__ = (
+        UniqueConstraint("user_id", "journal_id", name="uq_journal_favorites_user_id_journal_id"),
+        Index("ix_journal_favorites_journal_id", "journal_id"),
+    )
 
     id: Annotated[Optional[int], Field(default=None, primary_key=True)]
     journal_id: Annotated[int, Field(foreign_key="journals.id")]
@@ -53,11 +105,17 @@ class JournalFavorites(SQLModel, table=True):
 
 class JournalShares(SQLModel, table=True):
     __tablename__ = "journal_shares"
+    __table_args__ = (
+        UniqueConstraint("idempotency_key", name="uq_journal_shares_idempotency_key"),
+        Index("ix_journal_shares_journal_id", "journal_id"),
+    )
 
     id: Annotated[Optional[int], Field(default=None, primary_key=True)]
     journal_id: Annotated[int, Field(foreign_key="journals.id")]
     user_id: Annotated[int, Field(foreign_key="users.id")]
     share_type: Annotated[str, Field(default="internal")]
+    # Client- or server-generated key that makes retried/replayed shares no-ops.
+    idempotency_key: Annotated[Optional[str], Field(default=None, max_length=100)]
     shared_at: Annotated[datetime, Field(default_factory=datetime.utcnow, nullable=False)]
 
 
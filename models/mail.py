@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Annotated, Optional
+
+from sqlalchemy import Index, Text
+from sqlmodel import SQLModel, Field
+
+
+class MailOutbox(SQLModel, table=True):
+    """Outbound mail written in the request's transaction and delivered by `MailOutboxWorker`."""
+
+    __tablename__ = "mail_outbox"
+    __table_args__ = (
+        Index("ix_mail_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id: Annotated[Optional[int], Field(default=None, primary_key=True)]
+    to_email: Annotated[str, Field(max_length=255)]
+    to_name: Annotated[str, Field(max_length=255)]
+    subject: Annotated[str, Field(max_length=255)]
+    text_body: Annotated[str, Field(sa_type=Text)]
+    html_body: Annotated[Optional[str], Field(default=None, sa_type=Text)]
+    # pending -> sent | failed
+    status: Annotated[str, Field(default="pending", max_length=20)]
+    attempts: Annotated[int, Field(default=0)]
+    # Also serves as the claim lease: a claimed row is pushed into the future.
+    next_attempt_at: Annotated[datetime, Field(default_factory=datetime.utcnow, nullable=False)]
+    last_error: Annotated[Optional[str], Field(default=None, max_length=255)]
+    created_at: Annotated[datetime, Field(default_factory=datetime.utcnow, nullable=False)]
+    sent_at: Annotated[Optional[datetime], Field(default=None)]
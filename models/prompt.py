@@ -1,11 +1,15 @@
 from datetime import datetime
 from typing import Optional, Annotated
 
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 
 
 class Prompts(SQLModel, table=True):
     __tablename__ = "prompts"
+    __table_args__ = (
+        Index("ix_prompts_is_active", "is_active"),
+    )
 
     id: Annotated[Optional[int], Field(default=None, primary_key=True)]
     text: str
@@ -16,6 +20,9 @@ class Prompts(SQLModel, table=True):
 
 class UserPrompts(SQLModel, table=True):
     __tablename__ = "user_prompts"
+    __table_args__ = (
+        Index("ix_user_prompts_user_id_is_active", "user_id", "is_active"),
+    )
 
     id: Annotated[Optional[int], Field(default=None, primary_key=True)]
     user_id: Annotated[int, Field(foreign_key="users.id")]
@@ -0,0 +1,35 @@
+from typing import Annotated
+
+from sqlalchemy import Index, String
+from sqlalchemy.dialects import mysql
+from sqlmodel import SQLModel, Field
+
+
+class JournalSearchDocument(SQLModel, table=True):
+    """One row per searchable (public, non-deleted) journal; `length` feeds BM25 length normalization."""
+
+    __tablename__ = "journal_search_documents"
+
+    journal_id: Annotated[int, Field(foreign_key="journals.id", primary_key=True)]
+    length: Annotated[int, Field(nullable=False)]
+
+
+class JournalSearchTerm(SQLModel, table=True):
+    """Inverted index posting: `term` occurs `tf` times (weighted) in `journal_id`."""
+
+    __tablename__ = "journal_search_terms"
+    __table_args__ = (
+        Index("ix_journal_search_terms_journal_id", "journal_id"),
+    )
+
+    # Binary collation: the default one folds accents and case, so "café" and
+    # "cafe" would collide on the primary key.
+    term: Annotated[
+        str,
+        Field(
+            primary_key=True,
+            sa_type=String(64).with_variant(mysql.VARCHAR(64, collation="utf8mb4_bin"), "mysql"),
+        ),
+    ]
+    journal_id: Annotated[int, Field(foreign_key="journals.id", primary_key=True)]
+    tf: Annotated[int, Field(nullable=False)]
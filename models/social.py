@@ -1,12 +1,18 @@
 from datetime import datetime
 from typing import Optional, Annotated
 
+from sqlalchemy import Index, UniqueConstraint
 from sqlmodel import SQLModel, Field, Relationship
 from models.user import User
 
 
 class UserFollows(SQLModel, table=True):
     __tablename__ = "user_follows"
+    __table_args__ = (
+        UniqueConstraint("follower_id", "following_id", name="uq_user_follows_follower_id_following_id"),
+        # Reverse direction for fan-out: followers of an author.
+        Index("ix_user_follows_following_id_follower_id", "following_id", "follower_id"),
+    )
 
     id: Annotated[Optional[int], Field(default=None, primary_key=True)]
     follower_id: Annotated[int, Field(foreign_key="users.id")]
@@ -16,6 +22,11 @@ class UserFollows(SQLModel, table=True):
 
 class UserBlocks(SQLModel, table=True):
     __tablename__ = "user_blocks"
+    __table_args__ = (
+        UniqueConstraint("blocker_id", "blocked_id", name="uq_user_blocks_blocker_id_blocked_id"),
+        # Reverse direction: who has blocked a given user.
+        Index("ix_user_blocks_blocked_id_blocker_id", "blocked_id", "blocker_id"),
+    )
 
     id: Annotated[Optional[int], Field(default=None, primary_key=True)]
     blocker_id: Annotated[int, Field(foreign_key="users.id")]
@@ -8,7 +8,7 @@ class UserSubscriptions(SQLModel, table=True):
     __tablename__ = "user_subscriptions"
 
     id: Annotated[Optional[int], Field(default=None, primary_key=True)]
-    user_id: Annotated[int, Field(foreign_key="users.id")]
+    user_id: Annotated[int, Field(foreign_key="users.id", index=True)]
     package_name: Annotated[str, Field(max_length=255)]
     status: Annotated[str, Field(default="active")]
     start_date: Annotated[datetime, Field(default_factory=datetime.utcnow)]
@@ -21,7 +21,7 @@ class UserPaymentMethods(SQLModel, table=True):
     __tablename__ = "user_payment_methods"
 
     id: Annotated[Optional[int], Field(default=None, primary_key=True)]
-    user_id: Annotated[int, Field(foreign_key="users.id")]
+    user_id: Annotated[int, Field(foreign_key="users.id", index=True)]
     card_type: Optional[str] = None
     card_number_hash: Optional[str] = None
     expiry_date: Optional[str] = None
@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import Optional, Annotated, List
 
+from sqlalchemy import String, UniqueConstraint
+from sqlalchemy.dialects.mysql import VARCHAR
 from sqlmodel import SQLModel, Field, Relationship
 
 
@@ -22,30 +24,32 @@ class User(SQLModel, table=True):
     youtube_url: Annotated[Optional[str], Field(max_length=255, default=None)]
     tiktok_url: Annotated[Optional[str], Field(max_length=255, default=None)]
     website_url: Annotated[Optional[str], Field(max_length=255, default=None)]
+    followers_count: Annotated[int, Field(default=0, sa_column_kwargs={"server_default": "0"})]
     created_at: Annotated[datetime, Field(default_factory=datetime.utcnow, nullable=False)]
     updated_at: Annotated[datetime, Field(default_factory=datetime.utcnow, nullable=False)]
     journals: List["Journal"] = Relationship(back_populates="user")
     comments: List["Comment"] = Relationship(back_populates="user")
 
-class ForgetPassword(SQLModel, table=True):
-    __tablename__ = "forget_password"
-    email: Annotated[str, Field(primary_key=True, max_length=255)]
-    expiretime: datetime
-    otp: Annotated[str, Field(max_length=100)]
-
-
 class UserSocialLinks(SQLModel, table=True):
     __tablename__ = "user_social_links"
+    __table_args__ = (
+        UniqueConstraint("user_id", "platform", name="uq_user_social_links_user_id_platform"),
+    )
 
     id: Annotated[Optional[int], Field(default=None, primary_key=True)]
-    user_id: Annotated[int, Field(foreign_key="users.id")]
-    platform: Annotated[str, Field(max_length=255)]
+    user_id: Annotated[int, Field(foreign_key="users.id", index=True)]
+    # Binary collation, so the unique key agrees with the exact-string keys
+    # the bulk upsert builds; the default one would fold "GitHub" into "github".
+    platform: Annotated[str, Field(sa_type=String(255).with_variant(VARCHAR(255, collation="utf8mb4_bin"), "mysql"))]
     url: str
     created_at: Annotated[datetime, Field(default_factory=datetime.utcnow, nullable=False)]
 
 
 class UserNotifications(SQLModel, table=True):
     __tablename__ = "user_notifications"
+    __table_args__ = (
+        UniqueConstraint("user_id", name="uq_user_notifications_user_id"),
+    )
 
     id: Annotated[Optional[int], Field(default=None, primary_key=True)]
     user_id: Annotated[int, Field(foreign_key="users.id")]
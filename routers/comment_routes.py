@@ -1,54 +1,67 @@
-from typing import Annotated, List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from models.user import User
+from typing import Annotated, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.comment import Comment
 from schemas.comment import CommentCreate, CommentResponse, CommentUpdate
 from security.dependencies import get_current_user
-from db.sqlmodel import get_session
+from security.principal_cache import AuthPrincipal
+from db.pagination import paginate_newest_first, split_page
+from db.replica import get_read_session
+from db.sqlmodel import get_async_session
 from schemas.common import APIResponse
+from services.counter_service import increment_counter
+from services.visibility_service import Viewer, get_viewer, require_visible_journal
+from middleware.json_response import EnvelopeRoute
 
-router = APIRouter(prefix="/comments", tags=["comments"])
+router = APIRouter(prefix="/comments", tags=["comments"], route_class=EnvelopeRoute)
 
 
 @router.post("/", response_model=APIResponse[CommentResponse])
 async def create_comment(
     comment_data: CommentCreate,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+    viewer: Annotated[Viewer, Depends(get_viewer)],
 ):
+    # Missing, deleted, private and blocked journals are all a 404 rather than
+    # a foreign key error.
+    await require_visible_journal(session, viewer, comment_data.journal_id)
     comment = Comment(**comment_data.model_dump(), user_id=current_user.id)
     session.add(comment)
-    session.commit()
-    session.refresh(comment)
+    await increment_counter(session, comment.journal_id, "comments_count")
+    await session.commit()
+    await session.refresh(comment)
     return APIResponse(
         message="Comment created successfully",
         data=comment,
-        success=True,
-        status="success",
-        code=status.HTTP_201_CREATED,
     )
 
 
 @router.get("/{journal_id}", response_model=APIResponse[List[CommentResponse]])
 async def get_comments_for_journal(
     journal_id: int,
-    session: Annotated[Session, Depends(get_session)],
-    skip: int = 0,
-    limit: int = 10,
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    viewer: Annotated[Viewer, Depends(get_viewer)],
+    skip: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=100)] = 10,
+    cursor: Optional[str] = None,
 ):
-    comments = session.exec(
-        select(Comment)
-        .where(Comment.journal_id == journal_id, Comment.is_deleted == False)
-        .offset(skip)
-        .limit(limit)
-    ).all()
+    await require_visible_journal(session, viewer, journal_id)
+    statement = paginate_newest_first(
+        select(Comment).where(Comment.journal_id == journal_id, Comment.is_deleted == False),
+        Comment.created_at,
+        Comment.id,
+        cursor,
+        skip,
+        limit,
+    )
+    comments, next_page = split_page((await session.exec(statement)).all(), limit)
     return APIResponse(
         message="Comments retrieved successfully",
         data=comments,
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
+        next_cursor=next_page,
     )
 
 
@@ -56,10 +69,10 @@ async def get_comments_for_journal(
 async def update_comment(
     comment_id: int,
     comment_data: CommentUpdate,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
-    comment = session.get(Comment, comment_id)
+    comment = await session.get(Comment, comment_id)
     if not comment or comment.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found"
@@ -67,37 +80,39 @@ async def update_comment(
 
     comment.text = comment_data.text
     session.add(comment)
-    session.commit()
-    session.refresh(comment)
+    await session.commit()
+    await session.refresh(comment)
     return APIResponse(
         message="Comment updated successfully",
         data=comment,
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
 
 
 @router.delete("/{comment_id}", response_model=APIResponse)
 async def delete_comment(
     comment_id: int,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
-    comment = session.get(Comment, comment_id)
+    comment = await session.get(Comment, comment_id)
     if not comment or comment.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found"
         )
 
-    comment.is_deleted = True
-    session.add(comment)
-    session.commit()
+    # Only the request that actually flips the flag decrements the counter, so
+    # concurrent deletes of the same comment count once.
+    result = await session.exec(
+        update(Comment)
+        .where(Comment.id == comment_id, Comment.is_deleted == False)
+        .values(is_deleted=True)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 1:
+        await increment_counter(session, comment.journal_id, "comments_count", -1)
+    await session.commit()
 
     return APIResponse(
         message="Comment deleted successfully",
         data={},
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
\ No newline at end of file
@@ -0,0 +1,34 @@
+from typing import Annotated, List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models.journal import Journal
+from schemas.journal import JournalSummary
+from security.dependencies import get_current_user
+from security.principal_cache import AuthPrincipal
+from db.projection import select_columns
+from db.replica import get_read_session
+from schemas.common import APIResponse
+from services.feed_service import read_feed
+from services.visibility_service import Viewer, get_viewer
+from middleware.json_response import EnvelopeRoute
+
+router = APIRouter(prefix="/feed", tags=["feed"], route_class=EnvelopeRoute)
+
+
+@router.get("/", response_model=APIResponse[List[JournalSummary]])
+async def get_feed(
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    # The feed is per user; `get_viewer` alone would also admit anonymous callers.
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+    viewer: Annotated[Viewer, Depends(get_viewer)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: Optional[str] = None,
+    fields: Annotated[Optional[str], Query(description="Comma-separated JournalSummary fields")] = None,
+):
+    columns = select_columns(Journal, JournalSummary, fields)
+    journals, next_page = await read_feed(session, viewer, cursor, limit, columns)
+    return APIResponse(
+        message="Feed retrieved successfully",
+        data=[journal._mapping for journal in journals],
+        next_cursor=next_page,
+    )
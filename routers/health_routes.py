@@ -1,16 +1,85 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
-from sqlmodel import Session, text
+from fastapi import APIRouter, Depends, Request
+from sqlmodel import text
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from db.sqlmodel import get_session
+from db.pool import pool_stats
+from db.profiler import recent_profiles
+from db.sqlmodel import get_async_session
 from schemas.common import APIResponse
+from security.passwords import password_hasher
+from security.principal_cache import principal_cache
+from services.content_service import content_processor
+from services.visibility_service import block_sets
+from middleware.compression import response_compressor
+from middleware.json_response import EnvelopeRoute
 
-router = APIRouter(prefix="/health", tags=["health"])
+router = APIRouter(prefix="/health", tags=["health"], route_class=EnvelopeRoute)
 
 @router.get("/db", response_model=APIResponse[dict[str, str]])
-def health_db(session: Annotated[Session, Depends(get_session)]):
-    session.exec(text("SELECT 1"))
+async def health_db(session: Annotated[AsyncSession, Depends(get_async_session)]):
+    await session.exec(text("SELECT 1"))
     return APIResponse(message="Database healthy", data={"db": "ok"})
 
 
+@router.get("/db-pool", response_model=APIResponse[dict[str, dict[str, int | float]]])
+async def health_db_pool(request: Request):
+    stats = {"primary": pool_stats(request.app.state.async_engine.pool)}
+    if request.app.state.replica_engine is not None:
+        stats["replica"] = pool_stats(request.app.state.replica_engine.pool)
+    return APIResponse(message="Database pool stats", data=stats)
+
+
+@router.get("/db-replica", response_model=APIResponse[dict[str, float | bool | None]])
+async def health_db_replica(request: Request):
+    monitor = request.app.state.replica_lag_monitor
+    stats = monitor.stats() if monitor is not None else {}
+    return APIResponse(message="Read replica status", data=stats)
+
+
+@router.get("/auth-cache", response_model=APIResponse[dict[str, int]])
+async def health_auth_cache():
+    return APIResponse(message="Auth cache stats", data=principal_cache.stats())
+
+
+@router.get("/block-cache", response_model=APIResponse[dict[str, int]])
+async def health_block_cache():
+    return APIResponse(message="Block set cache stats", data=block_sets.stats())
+
+
+
+@router.get("/password-hasher", response_model=APIResponse[dict[str, int | float]])
+async def health_password_hasher():
+    return APIResponse(message="Password hasher stats", data=password_hasher.stats())
+
+
+@router.get("/content-processor", response_model=APIResponse[dict[str, int]])
+async def health_content_processor():
+    return APIResponse(message="Content processor stats", data=content_processor.stats())
+
+
+@router.get("/compression", response_model=APIResponse[dict[str, int | float]])
+async def health_compression():
+    return APIResponse(message="Response compression stats", data=response_compressor.stats())
+
+
+
+@router.get("/engagement-buffer", response_model=APIResponse[dict[str, int]])
+async def health_engagement_buffer(request: Request):
+    engagement_buffer = request.app.state.engagement_buffer
+    stats = engagement_buffer.stats() if engagement_buffer is not None else {}
+    return APIResponse(message="Engagement buffer stats", data=stats)
+
+
+
+@router.get("/sql-profile", response_model=APIResponse[list[dict]])
+async def health_sql_profile():
+    # Empty unless the app runs with SQL_PROFILER=1.
+    return APIResponse(message="Recent SQL profiles", data=list(recent_profiles))
+
+
+
+@router.get("/mail-outbox", response_model=APIResponse[dict[str, int]])
+async def health_mail_outbox(request: Request):
+    return APIResponse(message="Mail outbox stats", data=request.app.state.mail_worker.stats())
@@ -1,69 +1,211 @@
+from datetime import datetime
 from typing import Annotated, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from models.user import User
-from models.journal import Journal, JournalTags, JournalReactions, JournalFavorites, JournalShares, JournalReports
-from schemas.journal import JournalCreate, JournalResponse, JournalUpdate, JournalTagCreate, JournalTagResponse, JournalReactionCreate, JournalReactionResponse, JournalFavoriteCreate, JournalFavoriteResponse, JournalShareCreate, JournalShareResponse, JournalReportCreate, JournalReportResponse
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models.journal import Journal, JournalTags, Tag, JournalReactions, JournalFavorites, JournalShares, JournalReports
+from schemas.journal import JournalCreate, JournalResponse, JournalSummary, JournalUpdate, JournalTagCreate, JournalTagResponse, JournalReactionCreate, JournalReactionResponse, JournalFavoriteCreate, JournalFavoriteResponse, JournalShareCreate, JournalShareResponse, JournalReportCreate, JournalReportResponse
 from security.dependencies import get_current_user
-from db.sqlmodel import get_session
-from schemas.common import APIResponse
+from security.principal_cache import AuthPrincipal
+from db.pagination import paginate_newest_first, split_page
+from db.projection import select_columns
+from db.upsert import BULK_MAX_ITEMS, upsert_rows
+from db.replica import get_read_session
+from db.sqlmodel import get_async_session
+from middleware.http_cache import ConditionalGet, Validators, content_etag, etag_for
+from schemas.common import APIResponse, BulkItemResult
+from services.content_service import apply_content, content_processor
+from services.counter_service import increment_counter
+from services.engagement_buffer import (
+    EngagementBuffer,
+    EngagementEvent,
+    default_idempotency_key,
+    get_engagement_buffer,
+)
+from services.feed_service import fan_out_journal, retract_journal
+from services.search_service import index_journal, search_journals, unindex_journal
+from services.tag_service import get_or_create_tag_id, get_or_create_tag_ids, normalize_tag, record_tag_use
+from services.visibility_service import Viewer, get_viewer, require_visible_journal
+from middleware.json_response import EnvelopeRoute
+
+router = APIRouter(prefix="/journals", tags=["journals"], route_class=EnvelopeRoute)
+
+
+async def _require_journal(session: AsyncSession, journal_id: int) -> None:
+    """404 unless `journal_id` is an existing, undeleted journal.
+
+    Engagement writes check this before accepting, as a buffered event for a
+    missing journal would be acknowledged and then dropped by INSERT IGNORE.
+    """
+    found = (
+        await session.exec(select(Journal.id).where(Journal.id == journal_id, Journal.is_deleted == False))
+    ).first()
+    if found is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Journal not found")
 
-router = APIRouter(prefix="/journals", tags=["journals"])
+
+def _reaction_type(raw: str) -> str:
+    """Stored form of a reaction type, shared by the single and bulk endpoints."""
+    reaction_type = raw.strip()
+    if not reaction_type or len(reaction_type) > 255:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Reaction type must be 1-255 characters")
+    return reaction_type
+
+
+async def _accept_buffered(
+    engagement_buffer: EngagementBuffer, response: Response, event: EngagementEvent, message: str
+) -> APIResponse:
+    await engagement_buffer.submit(event)
+    response.status_code = status.HTTP_202_ACCEPTED
+    return APIResponse(message=message)
 
 
 @router.post("/", response_model=APIResponse[JournalResponse])
 async def create_journal(
     journal_data: JournalCreate,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
+    content = await content_processor.process(journal_data.html_content)
     journal = Journal(**journal_data.model_dump(), user_id=current_user.id)
+    apply_content(journal, content)
     session.add(journal)
-    session.commit()
-    session.refresh(journal)
+    await session.flush()
+    await fan_out_journal(session, journal)
+    await index_journal(session, journal)
+    await session.commit()
+    await session.refresh(journal)
     return APIResponse(
         message="Journal created successfully",
         data=journal,
-        success=True,
-        status="success",
-        code=status.HTTP_201_CREATED,
     )
 
 
-@router.get("/", response_model=APIResponse[List[JournalResponse]])
+@router.get("/", response_model=APIResponse[List[JournalSummary]])
 async def get_all_journals(
-    session: Annotated[Session, Depends(get_session)],
-    skip: int = 0,
-    limit: int = 10,
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    viewer: Annotated[Viewer, Depends(get_viewer)],
+    skip: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=100)] = 10,
+    cursor: Optional[str] = None,
+    fields: Annotated[Optional[str], Query(description="Comma-separated JournalSummary fields")] = None,
 ):
-    journals = session.exec(
-        select(Journal).where(Journal.is_deleted == False).offset(skip).limit(limit)
-    ).all()
+    columns = select_columns(Journal, JournalSummary, fields)
+    statement = paginate_newest_first(
+        select(*columns).where(*viewer.journal_filter()),
+        Journal.created_at,
+        Journal.id,
+        cursor,
+        skip,
+        limit,
+    )
+    journals, next_page = split_page((await session.exec(statement)).all(), limit)
     return APIResponse(
         message="Journals retrieved successfully",
-        data=journals,
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
+        data=[journal._mapping for journal in journals],
+        next_cursor=next_page,
+    )
+
+
+@router.get("/search", response_model=APIResponse[List[JournalSummary]])
+async def search(
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    viewer: Annotated[Viewer, Depends(get_viewer)],
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 10,
+    cursor: Optional[str] = None,
+    fields: Annotated[Optional[str], Query(description="Comma-separated JournalSummary fields")] = None,
+):
+    columns = select_columns(Journal, JournalSummary, fields)
+    journals, next_page = await search_journals(session, q, cursor, limit, columns, viewer.journal_filter())
+    return APIResponse(
+        message="Journals retrieved successfully",
+        data=[journal._mapping for journal in journals],
+        next_cursor=next_page,
+    )
+
+
+@router.get("/by-tag/{tag}", response_model=APIResponse[List[JournalSummary]])
+async def get_journals_by_tag(
+    tag: str,
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    viewer: Annotated[Viewer, Depends(get_viewer)],
+    skip: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=100)] = 10,
+    cursor: Optional[str] = None,
+    fields: Annotated[Optional[str], Query(description="Comma-separated JournalSummary fields")] = None,
+):
+    columns = select_columns(Journal, JournalSummary, fields)
+    tag_id = (await session.exec(select(Tag.id).where(Tag.name == normalize_tag(tag)))).first()
+    if tag_id is None:
+        return APIResponse(message="Journals retrieved successfully", data=[])
+    # Ordered on the link table's copy of created_at so the tag's index drives the scan.
+    statement = paginate_newest_first(
+        select(*columns)
+        .join(JournalTags, JournalTags.journal_id == Journal.id)
+        .where(JournalTags.tag_id == tag_id, *viewer.journal_filter()),
+        JournalTags.journal_created_at,
+        JournalTags.journal_id,
+        cursor,
+        skip,
+        limit,
+    )
+    journals, next_page = split_page((await session.exec(statement)).all(), limit)
+    return APIResponse(
+        message="Journals retrieved successfully",
+        data=[journal._mapping for journal in journals],
+        next_cursor=next_page,
+    )
+
+
+@router.get(
+    "/journal-favorites", response_model=APIResponse[List[JournalFavoriteResponse]]
+)
+async def get_journal_favorites(
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+):
+    journal_favorites = (await session.exec(
+        select(JournalFavorites).where(JournalFavorites.user_id == current_user.id)
+    )).all()
+    return APIResponse(
+        message="Journal favorites retrieved successfully",
+        data=journal_favorites,
     )
 
 
 @router.get("/{journal_id}", response_model=APIResponse[JournalResponse])
 async def get_journal_by_id(
     journal_id: int,
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    viewer: Annotated[Viewer, Depends(get_viewer)],
+    validators: Annotated[Validators, Depends(ConditionalGet("private, no-cache"))],
 ):
-    journal = session.get(Journal, journal_id)
-    if not journal or journal.is_deleted:
+    # Journals the caller may not see are indistinguishable from missing ones.
+    journal = (
+        await session.exec(select(Journal).where(Journal.id == journal_id, *viewer.journal_filter()))
+    ).first()
+    if not journal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Journal not found"
         )
+    # Counters change without touching updated_at, so they are part of the tag.
+    # No Last-Modified: a client revalidating with If-Modified-Since alone
+    # would be told its copy is current while the counts have moved.
+    validators.check(
+        etag=etag_for(
+            journal.id,
+            journal.updated_at,
+            journal.reactions_count,
+            journal.comments_count,
+            journal.favorites_count,
+            journal.shares_count,
+        ),
+    )
     return APIResponse(
         message="Journal retrieved successfully",
         data=journal,
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
 
 
@@ -71,87 +213,192 @@ async def get_journal_by_id(
 async def update_journal(
     journal_id: int,
     journal_data: JournalUpdate,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
-    journal = session.get(Journal, journal_id)
+    journal = await session.get(Journal, journal_id)
     if not journal or journal.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Journal not found"
         )
 
-    for key, value in journal_data.model_dump(exclude_unset=True).items():
+    was_private = journal.is_private
+    changes = journal_data.model_dump(exclude_unset=True)
+    content = None
+    if "html_content" in changes:
+        content = await content_processor.process(changes.pop("html_content"))
+    for key, value in changes.items():
         setattr(journal, key, value)
+    if content is not None:
+        apply_content(journal, content)
+    journal.updated_at = datetime.utcnow()
 
     session.add(journal)
-    session.commit()
-    session.refresh(journal)
+    if journal.is_private and not was_private:
+        await retract_journal(session, journal.id)
+    elif was_private and not journal.is_private:
+        await fan_out_journal(session, journal)
+    await index_journal(session, journal)
+    await session.commit()
+    await session.refresh(journal)
     return APIResponse(
         message="Journal updated successfully",
         data=journal,
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
 
 
 @router.delete("/{journal_id}", response_model=APIResponse)
 async def delete_journal(
     journal_id: int,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
-    journal = session.get(Journal, journal_id)
+    journal = await session.get(Journal, journal_id)
     if not journal or journal.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Journal not found"
         )
 
     journal.is_deleted = True
-    journal.deleted_at = "CURRENT_TIMESTAMP"
+    journal.deleted_at = datetime.utcnow()
     session.add(journal)
-    session.commit()
+    await retract_journal(session, journal.id)
+    await unindex_journal(session, journal.id)
+    await session.commit()
 
     return APIResponse(
         message="Journal deleted successfully",
         data={},
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
 
 @router.post("/journal-tags", response_model=APIResponse[JournalTagResponse])
 async def create_journal_tag(
     journal_tag_data: JournalTagCreate,
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
-    journal_tag = JournalTags(**journal_tag_data.model_dump())
+    journal = await session.get(Journal, journal_tag_data.journal_id)
+    if not journal or journal.is_deleted or journal.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Journal not found"
+        )
+    name = normalize_tag(journal_tag_data.tag)
+    tag_id = await get_or_create_tag_id(session, name)
+    journal_tag = JournalTags(
+        journal_id=journal.id, tag_id=tag_id, journal_created_at=journal.created_at
+    )
     session.add(journal_tag)
-    session.commit()
-    session.refresh(journal_tag)
+    await session.flush()
+    await index_journal(session, journal)
+    await session.commit()
+    record_tag_use(journal, tag_id, name)
     return APIResponse(
         message="Journal tag created successfully",
-        data=journal_tag,
-        success=True,
-        status="success",
-        code=status.HTTP_201_CREATED,
+        data=JournalTagResponse(id=journal_tag.id, journal_id=journal.id, tag=name),
     )
 
 
+@router.post("/journal-tags/bulk", response_model=APIResponse[List[BulkItemResult]])
+async def create_journal_tags_bulk(
+    items: Annotated[List[JournalTagCreate], Body(min_length=1, max_length=BULK_MAX_ITEMS)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+):
+    # Other users' journals are reported exactly like missing ones.
+    journals = {
+        journal.id: journal
+        for journal in (await session.exec(
+            select(Journal).where(
+                Journal.id.in_({item.journal_id for item in items}),
+                Journal.is_deleted == False,
+                Journal.user_id == current_user.id,
+            )
+        )).all()
+    }
+    results: list[Optional[BulkItemResult]] = []
+    wanted: dict[tuple[int, str], int] = {}
+    for index, item in enumerate(items):
+        if item.journal_id not in journals:
+            results.append(BulkItemResult(index=index, status="rejected", detail="Journal not found"))
+            continue
+        try:
+            name = normalize_tag(item.tag)
+        except HTTPException as exc:
+            results.append(BulkItemResult(index=index, status="rejected", detail=exc.detail))
+            continue
+        if (item.journal_id, name) in wanted:
+            results.append(BulkItemResult(
+                index=index, status="duplicate", detail=f"Same as item {wanted[item.journal_id, name]}"
+            ))
+            continue
+        wanted[item.journal_id, name] = index
+        results.append(None)
+
+    tag_ids = await get_or_create_tag_ids(session, {name for _, name in wanted})
+    journal_ids = {journal_id for journal_id, _ in wanted}
+    link_filter = (
+        JournalTags.journal_id.in_(journal_ids),
+        JournalTags.tag_id.in_({tag_ids[name] for _, name in wanted}),
+    )
+    existing = set((await session.exec(select(JournalTags.journal_id, JournalTags.tag_id).where(*link_filter))).all())
+    now = datetime.utcnow()
+    await upsert_rows(
+        session,
+        JournalTags,
+        [
+            {
+                "journal_id": journal_id,
+                "tag_id": tag_ids[name],
+                "journal_created_at": journals[journal_id].created_at,
+                "created_at": now,
+            }
+            for journal_id, name in wanted
+        ],
+        ("journal_id", "tag_id"),
+    )
+    link_ids = {
+        (journal_id, tag_id): link_id
+        for link_id, journal_id, tag_id in (await session.exec(
+            select(JournalTags.id, JournalTags.journal_id, JournalTags.tag_id).where(*link_filter)
+        )).all()
+    }
+    created = []
+    for (journal_id, name), index in wanted.items():
+        key = (journal_id, tag_ids[name])
+        if key not in existing:
+            created.append((journal_id, name))
+        results[index] = BulkItemResult(
+            index=index, status="unchanged" if key in existing else "created", id=link_ids[key]
+        )
+    for journal_id in {journal_id for journal_id, _ in created}:
+        await index_journal(session, journals[journal_id])
+    await session.commit()
+    for journal_id, name in created:
+        record_tag_use(journals[journal_id], tag_ids[name], name)
+    return APIResponse(message=f"Processed {len(items)} journal tags", data=results)
+
+
 @router.get(
     "/journal-tags/{journal_id}", response_model=APIResponse[List[JournalTagResponse]]
 )
 async def get_journal_tags(
     journal_id: int,
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    viewer: Annotated[Viewer, Depends(get_viewer)],
+    # Whether the journal is visible depends on who asks, so shared caches must not keep it.
+    validators: Annotated[Validators, Depends(ConditionalGet("private, no-cache"))],
 )-> APIResponse[List[JournalTagResponse]]:
-    journal_tags = session.exec(
-        select(JournalTags).where(JournalTags.journal_id == journal_id)
-    ).all()
-    return APIResponse[List[JournalTagResponse]](
+    await require_visible_journal(session, viewer, journal_id)
+    journal_tags = (await session.exec(
+        select(JournalTags.id, JournalTags.journal_id, Tag.name.label("tag"))
+        .join(Tag, Tag.id == JournalTags.tag_id)
+        .where(JournalTags.journal_id == journal_id)
+        .order_by(JournalTags.id)
+    )).all()
+    validators.check(etag=content_etag(journal_tags))
+    return APIResponse(
         message="Journal tags retrieved successfully",
-        data=journal_tags,
-        success=True
+        data=[journal_tag._mapping for journal_tag in journal_tags]
     )
 
 
@@ -160,41 +407,126 @@ async def get_journal_tags(
 )
 async def create_journal_reaction(
     journal_reaction_data: JournalReactionCreate,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    response: Response,
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+    engagement_buffer: Annotated[Optional[EngagementBuffer], Depends(get_engagement_buffer)],
 ):
+    reaction_type = _reaction_type(journal_reaction_data.reaction_type)
+    await _require_journal(session, journal_reaction_data.journal_id)
+    if engagement_buffer is not None:
+        event = EngagementEvent(
+            kind="reaction",
+            journal_id=journal_reaction_data.journal_id,
+            user_id=current_user.id,
+            reaction_type=reaction_type,
+            idempotency_key=default_idempotency_key(
+                "reaction", journal_reaction_data.journal_id, current_user.id, reaction_type
+            ),
+        )
+        return await _accept_buffered(engagement_buffer, response, event, "Journal reaction accepted")
+
     journal_reaction = JournalReactions(
-        **journal_reaction_data.model_dump(), user_id=current_user.id
+        journal_id=journal_reaction_data.journal_id, reaction_type=reaction_type, user_id=current_user.id
     )
     session.add(journal_reaction)
-    session.commit()
-    session.refresh(journal_reaction)
+    await increment_counter(session, journal_reaction.journal_id, "reactions_count")
+    await session.commit()
+    await session.refresh(journal_reaction)
     return APIResponse(
         message="Journal reaction created successfully",
         data=journal_reaction,
-        success=True,
-        status="success",
-        code=status.HTTP_201_CREATED,
     )
 
 
+@router.post("/journal-reactions/bulk", response_model=APIResponse[List[BulkItemResult]])
+async def create_journal_reactions_bulk(
+    items: Annotated[List[JournalReactionCreate], Body(min_length=1, max_length=BULK_MAX_ITEMS)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+):
+    # Written directly even when write-behind is enabled: callers get ids
+    # back, and a batch is already a single round-trip.
+    journal_ids = set((await session.exec(
+        select(Journal.id).where(
+            Journal.id.in_({item.journal_id for item in items}), Journal.is_deleted == False
+        )
+    )).all())
+    results: list[Optional[BulkItemResult]] = []
+    wanted: dict[tuple[int, str], int] = {}
+    for index, item in enumerate(items):
+        if item.journal_id not in journal_ids:
+            results.append(BulkItemResult(index=index, status="rejected", detail="Journal not found"))
+            continue
+        try:
+            reaction_type = _reaction_type(item.reaction_type)
+        except HTTPException as exc:
+            results.append(BulkItemResult(index=index, status="rejected", detail=exc.detail))
+            continue
+        if (item.journal_id, reaction_type) in wanted:
+            results.append(BulkItemResult(
+                index=index, status="duplicate", detail=f"Same as item {wanted[item.journal_id, reaction_type]}"
+            ))
+        else:
+            wanted[item.journal_id, reaction_type] = index
+            results.append(None)
+
+    reaction_filter = (
+        JournalReactions.user_id == current_user.id,
+        JournalReactions.journal_id.in_({journal_id for journal_id, _ in wanted}),
+    )
+    existing = set((await session.exec(
+        select(JournalReactions.journal_id, JournalReactions.reaction_type).where(*reaction_filter)
+    )).all())
+    now = datetime.utcnow()
+    rows: dict[int, list[dict]] = {}
+    for journal_id, reaction_type in wanted:
+        rows.setdefault(journal_id, []).append(
+            {"journal_id": journal_id, "user_id": current_user.id, "reaction_type": reaction_type, "created_at": now}
+        )
+    # One INSERT IGNORE per journal: its rowcount is how many reactions were
+    # new, including against a concurrent request, so the counter moves by
+    # exactly that. Journals were checked above, so nothing else is ignored.
+    for journal_id, journal_rows in rows.items():
+        inserted = (await session.exec(
+            insert(JournalReactions)
+            .values(journal_rows)
+            .prefix_with("IGNORE", dialect="mysql")
+            .prefix_with("OR IGNORE", dialect="sqlite")
+        )).rowcount
+        if inserted > 0:
+            await increment_counter(session, journal_id, "reactions_count", inserted)
+    reaction_ids = {
+        (journal_id, reaction_type): reaction_id
+        for reaction_id, journal_id, reaction_type in (await session.exec(
+            select(JournalReactions.id, JournalReactions.journal_id, JournalReactions.reaction_type)
+            .where(*reaction_filter)
+        )).all()
+    }
+    for key, index in wanted.items():
+        results[index] = BulkItemResult(
+            index=index, status="unchanged" if key in existing else "created", id=reaction_ids[key]
+        )
+    await session.commit()
+    return APIResponse(message=f"Processed {len(items)} journal reactions", data=results)
+
+
 @router.get(
     "/journal-reactions/{journal_id}",
     response_model=APIResponse[List[JournalReactionResponse]],
 )
 async def get_journal_reactions(
     journal_id: int,
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    viewer: Annotated[Viewer, Depends(get_viewer)],
 ):
-    journal_reactions = session.exec(
+    await require_visible_journal(session, viewer, journal_id)
+    journal_reactions = (await session.exec(
         select(JournalReactions).where(JournalReactions.journal_id == journal_id)
-    ).all()
+    )).all()
     return APIResponse(
         message="Journal reactions retrieved successfully",
         data=journal_reactions,
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
 
 
@@ -203,80 +535,83 @@ async def get_journal_reactions(
 )
 async def create_journal_favorite(
     journal_favorite_data: JournalFavoriteCreate,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    response: Response,
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+    engagement_buffer: Annotated[Optional[EngagementBuffer], Depends(get_engagement_buffer)],
 ):
+    await _require_journal(session, journal_favorite_data.journal_id)
+    if engagement_buffer is not None:
+        event = EngagementEvent(
+            kind="favorite",
+            journal_id=journal_favorite_data.journal_id,
+            user_id=current_user.id,
+            idempotency_key=default_idempotency_key(
+                "favorite", journal_favorite_data.journal_id, current_user.id, None
+            ),
+        )
+        return await _accept_buffered(engagement_buffer, response, event, "Journal favorite accepted")
+
     journal_favorite = JournalFavorites(
         **journal_favorite_data.model_dump(), user_id=current_user.id
     )
     session.add(journal_favorite)
-    session.commit()
-    session.refresh(journal_favorite)
+    await increment_counter(session, journal_favorite.journal_id, "favorites_count")
+    await session.commit()
+    await session.refresh(journal_favorite)
     return APIResponse(
         message="Journal favorite created successfully",
         data=journal_favorite,
-        success=True,
-        status="success",
-        code=status.HTTP_201_CREATED,
-    )
-
-
-@router.get(
-    "/journal-favorites", response_model=APIResponse[List[JournalFavoriteResponse]]
-)
-async def get_journal_favorites(
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
-):
-    journal_favorites = session.exec(
-        select(JournalFavorites).where(JournalFavorites.user_id == current_user.id)
-    ).all()
-    return APIResponse(
-        message="Journal favorites retrieved successfully",
-        data=journal_favorites,
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
 
 
 @router.post("/journal-shares", response_model=APIResponse[JournalShareResponse])
 async def create_journal_share(
     journal_share_data: JournalShareCreate,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    response: Response,
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+    engagement_buffer: Annotated[Optional[EngagementBuffer], Depends(get_engagement_buffer)],
+    idempotency_key: Annotated[Optional[str], Header(alias="Idempotency-Key", max_length=100)] = None,
 ):
+    await _require_journal(session, journal_share_data.journal_id)
+    if engagement_buffer is not None:
+        event = EngagementEvent(
+            kind="share",
+            journal_id=journal_share_data.journal_id,
+            user_id=current_user.id,
+            share_type=journal_share_data.share_type,
+            idempotency_key=idempotency_key
+            or default_idempotency_key("share", journal_share_data.journal_id, current_user.id, None),
+        )
+        return await _accept_buffered(engagement_buffer, response, event, "Journal share accepted")
+
     journal_share = JournalShares(
-        **journal_share_data.model_dump(), user_id=current_user.id
+        **journal_share_data.model_dump(), user_id=current_user.id, idempotency_key=idempotency_key
     )
     session.add(journal_share)
-    session.commit()
-    session.refresh(journal_share)
+    await increment_counter(session, journal_share.journal_id, "shares_count")
+    await session.commit()
+    await session.refresh(journal_share)
     return APIResponse(
         message="Journal share created successfully",
         data=journal_share,
-        success=True,
-        status="success",
-        code=status.HTTP_201_CREATED,
     )
 
 
 @router.post("/journal-reports", response_model=APIResponse[JournalReportResponse])
 async def create_journal_report(
     journal_report_data: JournalReportCreate,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
     journal_report = JournalReports(
         **journal_report_data.model_dump(), reporter_id=current_user.id
     )
     session.add(journal_report)
-    session.commit()
-    session.refresh(journal_report)
+    await session.commit()
+    await session.refresh(journal_report)
     return APIResponse(
         message="Journal report created successfully",
         data=journal_report,
-        success=True,
-        status="success",
-        code=status.HTTP_201_CREATED,
     )
\ No newline at end of file
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from db.pool import render_pool_metrics
+from middleware.metrics import http_metrics
+from middleware.json_response import EnvelopeRoute
+
+router = APIRouter(tags=["metrics"], route_class=EnvelopeRoute)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics(request: Request):
+    pools = {"primary": request.app.state.async_engine.pool}
+    if request.app.state.replica_engine is not None:
+        pools["replica"] = request.app.state.replica_engine.pool
+    body = http_metrics.render() + render_pool_metrics(pools)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
@@ -1,12 +1,14 @@
 from typing import Annotated, List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.user import User
 from models.user import UserReports
 from schemas.user import UserReportCreate, UserReportResponse
 from security.dependencies import get_current_user
-from db.sqlmodel import get_session
+from db.sqlmodel import get_async_session
 from schemas.common import APIResponse
+from middleware.json_response import EnvelopeRoute
 
-router = APIRouter(prefix="/misc", tags=["miscellaneous"])
+router = APIRouter(prefix="/misc", tags=["miscellaneous"], route_class=EnvelopeRoute)
 
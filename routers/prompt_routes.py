@@ -1,7 +1,7 @@
 from typing import Annotated, List
 from fastapi import APIRouter, Depends, status
-from sqlmodel import Session, select
-from models.user import User
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.prompt import Prompts, UserPrompts
 from schemas.prompt import (
     PromptCreate,
@@ -10,79 +10,73 @@ from schemas.prompt import (
     UserPromptResponse,
 )
 from security.dependencies import get_current_user
-from db.sqlmodel import get_session
+from security.principal_cache import AuthPrincipal
+from db.replica import get_read_session
+from db.sqlmodel import get_async_session
+from middleware.http_cache import ConditionalGet, Validators, content_etag
 from schemas.common import APIResponse
+from middleware.json_response import EnvelopeRoute
 
-router = APIRouter(prefix="/prompts", tags=["prompts"])
+router = APIRouter(prefix="/prompts", tags=["prompts"], route_class=EnvelopeRoute)
 
 
 @router.post("/", response_model=APIResponse[PromptResponse])
 async def create_prompt(
     prompt_data: PromptCreate,
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
 ):
     prompt = Prompts(**prompt_data.model_dump())
     session.add(prompt)
-    session.commit()
-    session.refresh(prompt)
+    await session.commit()
+    await session.refresh(prompt)
     return APIResponse(
         message="Prompt created successfully",
         data=prompt,
-        success=True,
-        status="success",
-        code=status.HTTP_201_CREATED,
     )
 
 
 @router.get("/", response_model=APIResponse[List[PromptResponse]])
 async def get_prompts(
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    validators: Annotated[Validators, Depends(ConditionalGet("public, max-age=300"))],
 ):
-    prompts = session.exec(select(Prompts).where(Prompts.is_active == True)).all()
+    prompts = (await session.exec(select(Prompts).where(Prompts.is_active == True).order_by(Prompts.id))).all()
+    validators.check(etag=content_etag(prompts))
     return APIResponse(
         message="Prompts retrieved successfully",
         data=prompts,
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
 
 
 @router.post("/user-prompts", response_model=APIResponse[UserPromptResponse])
 async def create_user_prompt(
     user_prompt_data: UserPromptCreate,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
     user_prompt = UserPrompts(
         **user_prompt_data.model_dump(), user_id=current_user.id
     )
     session.add(user_prompt)
-    session.commit()
-    session.refresh(user_prompt)
+    await session.commit()
+    await session.refresh(user_prompt)
     return APIResponse(
         message="User prompt created successfully",
         data=user_prompt,
-        success=True,
-        status="success",
-        code=status.HTTP_201_CREATED,
     )
 
 
 @router.get("/user-prompts", response_model=APIResponse[List[UserPromptResponse]])
 async def get_user_prompts(
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
-    user_prompts = session.exec(
+    user_prompts = (await session.exec(
         select(UserPrompts).where(
             UserPrompts.user_id == current_user.id, UserPrompts.is_active == True
         )
-    ).all()
+    )).all()
     return APIResponse(
         message="User prompts retrieved successfully",
         data=user_prompts,
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
\ No newline at end of file
@@ -1,7 +1,7 @@
 from typing import Annotated, List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from models.user import User
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.social import UserFollows, UserBlocks
 from schemas.social import (
     UserFollowRequest,
@@ -10,31 +10,37 @@ from schemas.social import (
     UserBlockResponse,
 )
 from security.dependencies import get_current_user
-from db.sqlmodel import get_session
+from security.principal_cache import AuthPrincipal
+from db.sqlmodel import get_async_session
 from schemas.common import APIResponse
+from services.feed_service import on_follow, on_unfollow
+from services.visibility_service import Viewer, get_viewer, invalidate_blocks, require_visible_user
+from middleware.json_response import EnvelopeRoute
 
-router = APIRouter(prefix="/social", tags=["social"])
+router = APIRouter(prefix="/social", tags=["social"], route_class=EnvelopeRoute)
 
 
 @router.post("/follow", response_model=APIResponse[UserFollowResponse])
 async def follow_user(
     follow_request: UserFollowRequest,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+    viewer: Annotated[Viewer, Depends(get_viewer)],
 ):
     if follow_request.following_id == current_user.id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You cannot follow yourself",
         )
+    await require_visible_user(session, viewer, follow_request.following_id)
 
-    existing_follow = session.exec(
+    existing_follow = (await session.exec(
         select(UserFollows)
         .where(
             UserFollows.follower_id == current_user.id,
             UserFollows.following_id == follow_request.following_id,
         )
-    ).first()
+    )).first()
 
     if existing_follow:
         raise HTTPException(
@@ -46,29 +52,27 @@ async def follow_user(
         follower_id=current_user.id, following_id=follow_request.following_id
     )
     session.add(follow)
-    session.commit()
-    session.refresh(follow)
+    await on_follow(session, current_user.id, follow_request.following_id)
+    await session.commit()
+    await session.refresh(follow)
     return APIResponse(
         message="User followed successfully",
         data=follow,
-        success=True,
-        status="success",
-        code=status.HTTP_201_CREATED,
     )
 
 
 @router.delete("/unfollow/{following_id}", response_model=APIResponse)
 async def unfollow_user(
     following_id: int,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
-    follow = session.exec(
+    follow = (await session.exec(
         select(UserFollows).where(
             UserFollows.follower_id == current_user.id,
             UserFollows.following_id == following_id,
         )
-    ).first()
+    )).first()
 
     if not follow:
         raise HTTPException(
@@ -76,22 +80,20 @@ async def unfollow_user(
             detail="You are not following this user",
         )
 
-    session.delete(follow)
-    session.commit()
+    await session.delete(follow)
+    await on_unfollow(session, current_user.id, following_id)
+    await session.commit()
     return APIResponse(
         message="User unfollowed successfully",
         data={},
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
 
 
 @router.post("/block", response_model=APIResponse[UserBlockResponse])
 async def block_user(
     block_request: UserBlockRequest,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
     if block_request.blocked_id == current_user.id:
         raise HTTPException(
@@ -99,13 +101,13 @@ async def block_user(
             detail="You cannot block yourself",
         )
 
-    existing_block = session.exec(
+    existing_block = (await session.exec(
         select(UserBlocks)
         .where(
             UserBlocks.blocker_id == current_user.id,
             UserBlocks.blocked_id == block_request.blocked_id,
         )
-    ).first()
+    )).first()
 
     if existing_block:
         raise HTTPException(
@@ -117,29 +119,27 @@ async def block_user(
         blocker_id=current_user.id, blocked_id=block_request.blocked_id
     )
     session.add(block)
-    session.commit()
-    session.refresh(block)
+    await session.commit()
+    invalidate_blocks(current_user.id, block_request.blocked_id)
+    await session.refresh(block)
     return APIResponse(
         message="User blocked successfully",
         data=block,
-        success=True,
-        status="success",
-        code=status.HTTP_201_CREATED,
     )
 
 
 @router.delete("/unblock/{blocked_id}", response_model=APIResponse)
 async def unblock_user(
     blocked_id: int,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
-    block = session.exec(
+    block = (await session.exec(
         select(UserBlocks).where(
             UserBlocks.blocker_id == current_user.id,
             UserBlocks.blocked_id == blocked_id,
         )
-    ).first()
+    )).first()
 
     if not block:
         raise HTTPException(
@@ -147,12 +147,10 @@ async def unblock_user(
             detail="You have not blocked this user",
         )
 
-    session.delete(block)
-    session.commit()
+    await session.delete(block)
+    await session.commit()
+    invalidate_blocks(current_user.id, blocked_id)
     return APIResponse(
         message="User unblocked successfully",
         data={},
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
\ No newline at end of file
@@ -1,7 +1,7 @@
 from typing import Annotated, List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from models.user import User
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models.subscription import UserSubscriptions, UserPaymentMethods
 from schemas.subscription import (
     UserSubscriptionCreate,
@@ -10,47 +10,43 @@ from schemas.subscription import (
     UserPaymentMethodResponse,
 )
 from security.dependencies import get_current_user
-from db.sqlmodel import get_session
+from security.principal_cache import AuthPrincipal
+from db.sqlmodel import get_async_session
 from schemas.common import APIResponse
+from middleware.json_response import EnvelopeRoute
 
-router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
+router = APIRouter(prefix="/subscriptions", tags=["subscriptions"], route_class=EnvelopeRoute)
 
 
 @router.post("/", response_model=APIResponse[UserSubscriptionResponse])
 async def create_subscription(
     subscription_data: UserSubscriptionCreate,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
     subscription = UserSubscriptions(
         **subscription_data.model_dump(), user_id=current_user.id
     )
     session.add(subscription)
-    session.commit()
-    session.refresh(subscription)
+    await session.commit()
+    await session.refresh(subscription)
     return APIResponse(
         message="Subscription created successfully",
         data=subscription,
-        success=True,
-        status="success",
-        code=status.HTTP_201_CREATED,
     )
 
 
 @router.get("/", response_model=APIResponse[List[UserSubscriptionResponse]])
 async def get_subscriptions(
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
-    subscriptions = session.exec(
+    subscriptions = (await session.exec(
         select(UserSubscriptions).where(UserSubscriptions.user_id == current_user.id)
-    ).all()
+    )).all()
     return APIResponse(
         message="Subscriptions retrieved successfully",
         data=subscriptions,
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
 
 
@@ -59,8 +55,8 @@ async def get_subscriptions(
 )
 async def create_payment_method(
     payment_method_data: UserPaymentMethodCreate,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
     payment_method = UserPaymentMethods(
         user_id=current_user.id,
@@ -71,14 +67,11 @@ async def create_payment_method(
         is_default=payment_method_data.is_default,
     )
     session.add(payment_method)
-    session.commit()
-    session.refresh(payment_method)
+    await session.commit()
+    await session.refresh(payment_method)
     return APIResponse(
         message="Payment method created successfully",
         data=payment_method,
-        success=True,
-        status="success",
-        code=status.HTTP_201_CREATED,
     )
 
 
@@ -86,16 +79,13 @@ async def create_payment_method(
     "/payment-methods", response_model=APIResponse[List[UserPaymentMethodResponse]]
 )
 async def get_payment_methods(
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
-    payment_methods = session.exec(
+    payment_methods = (await session.exec(
         select(UserPaymentMethods).where(UserPaymentMethods.user_id == current_user.id)
-    ).all()
+    )).all()
     return APIResponse(
         message="Payment methods retrieved successfully",
         data=payment_methods,
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
\ No newline at end of file
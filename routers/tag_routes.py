@@ -0,0 +1,19 @@
+from typing import Annotated, List
+from fastapi import APIRouter, Query
+from schemas.common import APIResponse
+from schemas.journal import TrendingTagResponse
+from services.tag_service import trending_tags
+from middleware.json_response import EnvelopeRoute
+
+router = APIRouter(prefix="/tags", tags=["tags"], route_class=EnvelopeRoute)
+
+
+@router.get("/trending", response_model=APIResponse[List[TrendingTagResponse]])
+async def get_trending_tags(
+    limit: Annotated[int, Query(ge=1, le=100)] = 10,
+):
+    # Served from the in-process sliding window; no per-request query.
+    return APIResponse(
+        message="Trending tags retrieved successfully",
+        data=[TrendingTagResponse(tag=name, count=count) for name, count in trending_tags.top(limit)],
+    )
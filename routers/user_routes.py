@@ -1,61 +1,53 @@
-from datetime import datetime, timedelta, timezone
-from random import choices, random
-import string
-from typing import Annotated, List
+from datetime import datetime
+from typing import Annotated, List, Optional
 
 from fastapi import APIRouter, Body, Depends,  HTTPException, status
-from passlib.context import CryptContext
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from db.sqlmodel import get_session
-from models.user import ForgetPassword, User, UserNotifications, UserReports, UserSocialLinks
-from schemas.common import APIResponse
+from db.sqlmodel import get_async_session
+from db.upsert import BULK_MAX_ITEMS, upsert_rows
+from models.user import User, UserNotifications, UserReports, UserSocialLinks
+from schemas.common import APIResponse, BulkItemResult
 from schemas.user import ForgetPasswordReset, SignupRequest, LoginRequest, SignupResponse, UserNotificationResponse, UserNotificationUpdate, UserReportCreate, UserReportResponse, UserResponse, LoginResponse, ForgetPasswordRequest, UserSocialLinkCreate, UserSocialLinkResponse
+from security.otp_store import OTP_TTL_SECONDS, generate_otp, otp_store
 from security.jwt import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 from security.dependencies import get_current_user
-from services.mail_service import send_mail
-
-router = APIRouter(prefix="/user", tags=["user"])
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-
-def verify_password(password: str, password_hash: str) -> bool:
-    return pwd_context.verify(password, password_hash)
+from security.passwords import hash_password, verify_password
+from security.principal_cache import AuthPrincipal, invalidate_user
+from services.mail_service import enqueue_mail, otp_message
+from middleware.json_response import EnvelopeRoute
 
+router = APIRouter(prefix="/user", tags=["user"], route_class=EnvelopeRoute)
 
 def user_to_response(user: User) -> APIResponse[SignupResponse]:
     payload = SignupResponse(id=user.id, email=user.email, name=user.name)
     return APIResponse[SignupResponse](message="User created successfully", data=payload)
 
 
-async def _signup_user(data: SignupRequest, session: Session) -> APIResponse[SignupResponse]:
-    existing = session.exec(select(User).where(User.email == data.email)).first()
+async def _signup_user(data: SignupRequest, session: AsyncSession) -> APIResponse[SignupResponse]:
+    existing = (await session.exec(select(User).where(User.email == data.email))).first()
     if existing:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered")
 
-    user = User(email=data.email, name=data.full_name, password_hash=hash_password(data.password))
+    user = User(email=data.email, name=data.full_name, password_hash=await hash_password(data.password))
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
     return user_to_response(user)
 
 
 @router.post("/signup", response_model=APIResponse[SignupResponse])
-async def signup(payload: Annotated[SignupRequest,...], session: Annotated[Session, Depends(get_session)]):
+async def signup(payload: Annotated[SignupRequest,...], session: Annotated[AsyncSession, Depends(get_async_session)]):
     return await _signup_user(payload, session)
 
 
 @router.post("/login", response_model=APIResponse[UserResponse])
-async def login(payload: Annotated[LoginRequest, ...], session: Annotated[Session, Depends(get_session)]):
-    user = session.exec(select(User).where(User.email == payload.email)).first()
+async def login(payload: Annotated[LoginRequest, ...], session: Annotated[AsyncSession, Depends(get_async_session)]):
+    user = (await session.exec(select(User).where(User.email == payload.email))).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User not found")
-    if not verify_password(payload.password, user.password_hash):
+    if not await verify_password(payload.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
     token = create_access_token(subject=str(user.id))
@@ -66,31 +58,28 @@ async def login(payload: Annotated[LoginRequest, ...], session: Annotated[Sessio
 @router.post("/forget-password", response_model=APIResponse, response_model_exclude_none=True)
 async def forget_password(
     request: ForgetPasswordRequest,
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
 ):
-    user = session.exec(select(User).where(User.email == request.email)).first()
+    if not await otp_store.allow_request(request.email):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many reset requests, please try again later",
+            headers={"Retry-After": str(otp_store.rate_window_seconds)},
+        )
+    user = (await session.exec(select(User).where(User.email == request.email))).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
-    otp = "".join(choices(string.digits, k=6))
-    expire_time = datetime.now(timezone.utc) + timedelta(minutes=10)
+    otp = generate_otp()
+    # Delivered by the mail outbox worker once this transaction commits; the
+    # code only becomes valid after that, so a failed commit leaves no live
+    # code that was never sent.
+    enqueue_mail(session, otp_message(otp, user.name, user.email, OTP_TTL_SECONDS // 60))
+    await session.commit()
+    await otp_store.issue(request.email, otp)
 
-    forget_password_entry = session.get(ForgetPassword, request.email)
-    if forget_password_entry:
-        forget_password_entry.otp = otp
-        forget_password_entry.expiretime = expire_time
-    else:
-        forget_password_entry = ForgetPassword(
-            email=request.email, otp=otp, expiretime=expire_time
-        )
-    session.add(forget_password_entry)
-    session.commit()
-    await send_mail(otp, user.name, user.email)
-
-    # Here you would send the OTP to the user's email.
-    # For this example, we will just return it in the response.
     return APIResponse(
         message="OTP sent to your email",
     )
@@ -98,93 +87,141 @@ async def forget_password(
 @router.post("/reset-password", response_model=APIResponse, response_model_exclude_none=True)
 async def reset_password(
     request: ForgetPasswordReset,
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
 ):
-    forget_password_entry = session.get(ForgetPassword, request.email)
-    user = session.exec(select(User).where(User.email == request.email)).first()
-    if not user:
+    # The OTP is checked before touching the database at all.
+    outcome = await otp_store.verify(request.email, request.otp)
+    if outcome == "locked":
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many wrong codes, request a new OTP",
         )
-
-    if not forget_password_entry:
+    if outcome != "ok":
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Invalid request"
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired OTP"
         )
 
-    if (
-        forget_password_entry.otp != request.otp
-        or forget_password_entry.expiretime < datetime.utcnow()
-    ):
+    user = (await session.exec(select(User).where(User.email == request.email))).first()
+    if not user:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired OTP"
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
-    user.password_hash = hash_password(request.new_password)
+    user.password_hash = await hash_password(request.new_password)
     session.add(user)
-    session.delete(forget_password_entry)
-    session.commit()
+    await session.commit()
+    invalidate_user(user.id)
     return APIResponse(message="Password reset successfully")
 
 
 @router.post("/social-links", response_model=APIResponse[UserSocialLinkResponse])
 async def create_social_link(
     social_link_data: UserSocialLinkCreate,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
+    # Stripped like the bulk endpoint, so both store the same key for a platform.
+    if not social_link_data.platform.strip():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Platform must be 1-255 characters")
     social_link = UserSocialLinks(
-        **social_link_data.model_dump(), user_id=current_user.id
+        platform=social_link_data.platform.strip(), url=social_link_data.url.strip(), user_id=current_user.id
     )
     session.add(social_link)
-    session.commit()
-    session.refresh(social_link)
+    await session.commit()
+    await session.refresh(social_link)
     return APIResponse(
         message="Social link created successfully",
         data=social_link,
-        success=True,
-        status="success",
-        code=status.HTTP_201_CREATED,
     )
 
 
+@router.post("/social-links/bulk", response_model=APIResponse[List[BulkItemResult]])
+async def upsert_social_links(
+    items: Annotated[List[UserSocialLinkCreate], Body(min_length=1, max_length=BULK_MAX_ITEMS)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+):
+    """Create or update the caller's links, keyed by platform."""
+    results: list[Optional[BulkItemResult]] = []
+    wanted: dict[str, tuple[int, str]] = {}
+    for index, item in enumerate(items):
+        platform, url = item.platform.strip(), item.url.strip()
+        if not platform or len(platform) > 255:
+            results.append(BulkItemResult(index=index, status="rejected", detail="Platform must be 1-255 characters"))
+        elif not url:
+            results.append(BulkItemResult(index=index, status="rejected", detail="URL is required"))
+        elif platform in wanted:
+            results.append(BulkItemResult(
+                index=index, status="duplicate", detail=f"Same as item {wanted[platform][0]}"
+            ))
+        else:
+            wanted[platform] = (index, url)
+            results.append(None)
+
+    link_filter = (
+        UserSocialLinks.user_id == current_user.id,
+        UserSocialLinks.platform.in_(wanted),
+    )
+    existing = dict((await session.exec(
+        select(UserSocialLinks.platform, UserSocialLinks.url).where(*link_filter)
+    )).all())
+    now = datetime.utcnow()
+    await upsert_rows(
+        session,
+        UserSocialLinks,
+        [
+            {"user_id": current_user.id, "platform": platform, "url": url, "created_at": now}
+            for platform, (_, url) in wanted.items()
+        ],
+        ("user_id", "platform"),
+        update_columns=("url",),
+    )
+    link_ids = dict((await session.exec(
+        select(UserSocialLinks.platform, UserSocialLinks.id).where(*link_filter)
+    )).all())
+    await session.commit()
+    for platform, (index, url) in wanted.items():
+        if platform not in existing:
+            outcome = "created"
+        elif existing[platform] != url:
+            outcome = "updated"
+        else:
+            outcome = "unchanged"
+        results[index] = BulkItemResult(index=index, status=outcome, id=link_ids[platform])
+    return APIResponse(message=f"Processed {len(items)} social links", data=results)
+
+
 @router.get("/social-links", response_model=APIResponse[List[UserSocialLinkResponse]])
 async def get_social_links(
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
-    social_links = session.exec(
+    social_links = (await session.exec(
         select(UserSocialLinks).where(UserSocialLinks.user_id == current_user.id)
-    ).all()
+    )).all()
     return APIResponse(
         message="Social links retrieved successfully",
         data=social_links,
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
 
 
 @router.delete("/social-links/{social_link_id}", response_model=APIResponse)
 async def delete_social_link(
     social_link_id: int,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
-    social_link = session.get(UserSocialLinks, social_link_id)
+    social_link = await session.get(UserSocialLinks, social_link_id)
     if not social_link or social_link.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Social link not found"
         )
 
-    session.delete(social_link)
-    session.commit()
+    await session.delete(social_link)
+    await session.commit()
     return APIResponse(
         message="Social link deleted successfully",
         data={},
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
 
 
@@ -193,12 +230,12 @@ async def delete_social_link(
 )
 async def update_notifications(
     notification_data: UserNotificationUpdate,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
-    notification_settings = session.exec(
+    notification_settings = (await session.exec(
         select(UserNotifications).where(UserNotifications.user_id == current_user.id)
-    ).first()
+    )).first()
 
     if not notification_settings:
         notification_settings = UserNotifications(user_id=current_user.id)
@@ -207,14 +244,11 @@ async def update_notifications(
         setattr(notification_settings, key, value)
 
     session.add(notification_settings)
-    session.commit()
-    session.refresh(notification_settings)
+    await session.commit()
+    await session.refresh(notification_settings)
     return APIResponse(
         message="Notification settings updated successfully",
         data=notification_settings,
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
 
 
@@ -222,43 +256,37 @@ async def update_notifications(
     "/notifications", response_model=APIResponse[UserNotificationResponse]
 )
 async def get_notifications(
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
-    notification_settings = session.exec(
+    notification_settings = (await session.exec(
         select(UserNotifications).where(UserNotifications.user_id == current_user.id)
-    ).first()
+    )).first()
 
     if not notification_settings:
         notification_settings = UserNotifications(user_id=current_user.id)
         session.add(notification_settings)
-        session.commit()
-        session.refresh(notification_settings)
+        await session.commit()
+        await session.refresh(notification_settings)
 
     return APIResponse(
         message="Notification settings retrieved successfully",
         data=notification_settings,
-        success=True,
-        status="success",
-        code=status.HTTP_200_OK,
     )
 
 @router.post("/user-reports", response_model=APIResponse[UserReportResponse])
 async def create_user_report(
     user_report_data: UserReportCreate,
-    session: Annotated[Session, Depends(get_session)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
 ):
     user_report = UserReports(
         **user_report_data.model_dump(), reporter_id=current_user.id
     )
     session.add(user_report)
-    session.commit()
-    session.refresh(user_report)
+    await session.commit()
+    await session.refresh(user_report)
     return APIResponse(
         message="User report created successfully",
         data=user_report,
-        success=True,
-        status="success",
-        code=status.HTTP_201_CREATED,
     )
\ No newline at end of file
@@ -9,4 +9,18 @@ T = TypeVar("T")
 class APIResponse(BaseModel, Generic[T]):
     status: bool = True
     message: str = "OK"
-    data: Optional[T] = None
\ No newline at end of file
+    data: Optional[T] = None
+    next_cursor: Optional[str] = None
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of one item of a bulk request, in request order.
+
+    `status` is `created`, `updated`, `unchanged`, `duplicate` (repeats an
+    earlier item of the same request) or `rejected` (see `detail`).
+    """
+
+    index: int
+    status: str
+    id: Optional[int] = None
+    detail: Optional[str] = None
@@ -1,11 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_serializer
 from typing import Optional, Annotated
 from datetime import datetime
 
 
 class JournalCreate(BaseModel):
     title: Annotated[str, "The title of the journal"]
-    body_snippet: Optional[str] = None
     html_content: Optional[str] = None
     is_private: bool = False
     image_url: Optional[str] = None
@@ -13,7 +12,6 @@ class JournalCreate(BaseModel):
 
 class JournalUpdate(BaseModel):
     title: Optional[str] = None
-    body_snippet: Optional[str] = None
     html_content: Optional[str] = None
     is_private: Optional[bool] = None
     image_url: Optional[str] = None
@@ -25,13 +23,52 @@ class JournalResponse(BaseModel):
     title: str
     body_snippet: Optional[str] = None
     html_content: Optional[str] = None
+    word_count: int = 0
+    reading_time_minutes: int = 0
     is_private: bool
     image_url: Optional[str] = None
     is_deleted: bool
     deleted_at: Optional[datetime] = None
+    reactions_count: int = 0
+    comments_count: int = 0
+    favorites_count: int = 0
+    shares_count: int = 0
     created_at: datetime
     updated_at: datetime
 
+
+class JournalSummary(BaseModel):
+    """List-view projection of a journal: every column except `html_content`.
+
+    List endpoints also accept a `fields=` sparse fieldset, so only the
+    attributes that were actually selected are serialized.
+    """
+
+    id: int
+    created_at: datetime
+    user_id: Optional[int] = None
+    title: Optional[str] = None
+    body_snippet: Optional[str] = None
+    word_count: Optional[int] = None
+    reading_time_minutes: Optional[int] = None
+    is_private: Optional[bool] = None
+    image_url: Optional[str] = None
+    is_deleted: Optional[bool] = None
+    deleted_at: Optional[datetime] = None
+    reactions_count: Optional[int] = None
+    comments_count: Optional[int] = None
+    favorites_count: Optional[int] = None
+    shares_count: Optional[int] = None
+    updated_at: Optional[datetime] = None
+
+    @model_serializer(mode="plain")
+    def _selected_fields_only(self):
+        # A plain serializer skips serializing every column only to drop the
+        # unselected ones, which halves the cost of encoding a list page.
+        fields_set = self.model_fields_set
+        return {name: getattr(self, name) for name in type(self).model_fields if name in fields_set}
+
+
 class JournalTagCreate(BaseModel):
     journal_id: int
     tag: str
@@ -43,6 +80,11 @@ class JournalTagResponse(BaseModel):
     tag: str
 
 
+class TrendingTagResponse(BaseModel):
+    tag: str
+    count: int
+
+
 class JournalReactionCreate(BaseModel):
     journal_id: int
     reaction_type: str
@@ -1,11 +1,13 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
 from fastapi import Depends, Header, HTTPException, status
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from db.sqlmodel import get_session
+from db.sqlmodel import get_async_session
 from models.user import User
 from security.jwt import decode_access_token
+from security.principal_cache import AuthPrincipal, principal_cache
 
 
 def get_bearer_token(authorization: Annotated[str | None, Header(alias="Authorization")]) -> str:
@@ -19,17 +21,35 @@ def get_bearer_token(authorization: Annotated[str | None, Header(alias="Authoriz
 
 async def get_current_user(
     token: Annotated[str, Depends(get_bearer_token)],
-    session: Annotated[Session, Depends(get_session)],
-) -> User:
-    claims = decode_access_token(token)
-    subject = claims.get("sub")
-    if not subject:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token subject")
-    try:
-        user_id = int(subject)
-    except ValueError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token subject")
-    user = session.exec(select(User).where(User.id == user_id)).first()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
\ No newline at end of file
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+) -> AuthPrincipal:
+    user_id = principal_cache.get_user_id(token)
+    if user_id is None:
+        claims = decode_access_token(token)
+        subject = claims.get("sub")
+        if not subject:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token subject")
+        try:
+            user_id = int(subject)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token subject")
+        principal_cache.set_user_id(token, user_id, claims.get("exp"))
+
+    principal = principal_cache.get_principal(user_id)
+    if principal is None:
+        user = (await session.exec(select(User).where(User.id == user_id))).first()
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        principal = AuthPrincipal.from_user(user)
+        principal_cache.set_principal(principal)
+    return principal
+
+
+async def get_optional_user(
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    authorization: Annotated[str | None, Header(alias="Authorization")] = None,
+) -> Optional[AuthPrincipal]:
+    """The caller when a token is sent, else None; a malformed or invalid token is still a 401."""
+    if not authorization:
+        return None
+    return await get_current_user(get_bearer_token(authorization), session)
@@ -0,0 +1,264 @@
+import asyncio
+import hashlib
+import os
+import secrets
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+from urllib.parse import urlparse
+
+
+def _get_int_env(name: str, default_value: int) -> int:
+    try:
+        return int(os.getenv(name, str(default_value)))
+    except ValueError:
+        return default_value
+
+
+OTP_STORE_URL = os.getenv("OTP_STORE_URL", "")
+OTP_TTL_SECONDS = _get_int_env("OTP_TTL_SECONDS", 600)
+# Wrong guesses allowed before the code is burned.
+OTP_MAX_ATTEMPTS = _get_int_env("OTP_MAX_ATTEMPTS", 5)
+# Codes that may be requested per email per window.
+OTP_RATE_LIMIT = _get_int_env("OTP_RATE_LIMIT", 3)
+OTP_RATE_WINDOW_SECONDS = _get_int_env("OTP_RATE_WINDOW_SECONDS", 900)
+
+
+def _digest(otp: str) -> str:
+    # Only a hash is stored, so a dump of the store does not leak live codes.
+    return hashlib.sha256(otp.encode()).hexdigest()
+
+
+class OTPStore(ABC):
+    """Ephemeral one-time codes keyed by email, with TTL, attempt limits and request rate limits.
+
+    `verify` returns "ok", "invalid" or "locked"; a code is deleted when it
+    is used or when `max_attempts` wrong guesses have been made.
+    """
+
+    def __init__(self, ttl_seconds: int, max_attempts: int, rate_limit: int, rate_window_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.rate_limit = max(1, rate_limit)
+        self.rate_window_seconds = max(1, rate_window_seconds)
+
+    @abstractmethod
+    async def allow_request(self, email: str) -> bool:
+        """Count a code request for `email`; False once the window's limit is used up."""
+
+    @abstractmethod
+    async def issue(self, email: str, otp: str) -> None:
+        """Store `otp` as the live code for `email`, replacing any previous one."""
+
+    @abstractmethod
+    async def verify(self, email: str, otp: str) -> str:
+        """Check a guess, returning "ok", "invalid" or "locked"."""
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryOTPStore(OTPStore):
+    """Per-process store; fine for a single worker and for development."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # key -> (value, expires_at)
+        self._data: dict[str, tuple[object, float]] = {}
+        self._next_sweep = 0.0
+
+    def _get(self, key: str):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry[0]
+
+    def _sweep(self) -> None:
+        now = time.monotonic()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + 60
+        for key in [key for key, (_, expires_at) in self._data.items() if expires_at <= now]:
+            del self._data[key]
+
+    async def allow_request(self, email: str) -> bool:
+        self._sweep()
+        key = f"otp:rate:{email}"
+        count = self._get(key)
+        if count is None:
+            self._data[key] = (1, time.monotonic() + self.rate_window_seconds)
+            return True
+        if count >= self.rate_limit:
+            return False
+        self._data[key] = (count + 1, self._data[key][1])
+        return True
+
+    async def issue(self, email: str, otp: str) -> None:
+        self._data[f"otp:code:{email}"] = ({"digest": _digest(otp), "attempts": 0}, time.monotonic() + self.ttl_seconds)
+
+    async def verify(self, email: str, otp: str) -> str:
+        key = f"otp:code:{email}"
+        entry = self._get(key)
+        if entry is None:
+            return "invalid"
+        if secrets.compare_digest(entry["digest"], _digest(otp)):
+            del self._data[key]
+            return "ok"
+        entry["attempts"] += 1
+        if entry["attempts"] >= self.max_attempts:
+            del self._data[key]
+            return "locked"
+        return "invalid"
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisConnection:
+    """Minimal RESP2 client: one connection, pipelined commands, reconnect on failure."""
+
+    def __init__(self, url: str):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _encode(args: tuple) -> bytes:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    async def _read_reply(self):
+        line = await self._reader.readuntil(b"\r\n")
+        prefix, body = line[:1], line[1:-2]
+        if prefix == b"+":
+            return body.decode()
+        if prefix == b"-":
+            return RedisError(body.decode())
+        if prefix == b":":
+            return int(body)
+        if prefix == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            return (await self._reader.readexactly(length + 2))[:-2].decode()
+        if prefix == b"*":
+            length = int(body)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise RedisError(f"unexpected reply {line!r}")
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            await self._send(setup)
+
+    async def _send(self, commands: list[tuple]) -> list:
+        self._writer.write(b"".join(self._encode(command) for command in commands))
+        await self._writer.drain()
+        replies = [await self._read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    async def pipeline(self, *commands: tuple) -> list:
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    await self._connect()
+                return await self._send(list(commands))
+            except BaseException:
+                # Any interruption (including cancellation mid-read) can leave
+                # replies unread on the socket, and a failed AUTH or SELECT
+                # leaves it half set up; start over on the next call.
+                await self._close()
+                raise
+
+    async def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+        self._reader = self._writer = None
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._close()
+
+
+class RedisOTPStore(OTPStore):
+    """Shared store for multi-worker deployments; expiry is Redis's own key TTL."""
+
+    def __init__(self, url: str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.redis = RedisConnection(url)
+
+    async def allow_request(self, email: str) -> bool:
+        key = f"otp:rate:{email}"
+        # SET NX starts the window with its TTL; INCR keeps the TTL.
+        _, count = await self.redis.pipeline(
+            ("SET", key, 0, "EX", self.rate_window_seconds, "NX"),
+            ("INCR", key),
+        )
+        return count <= self.rate_limit
+
+    async def issue(self, email: str, otp: str) -> None:
+        await self.redis.pipeline(
+            ("SET", f"otp:code:{email}", _digest(otp), "EX", self.ttl_seconds),
+            ("DEL", f"otp:attempts:{email}"),
+        )
+
+    async def verify(self, email: str, otp: str) -> str:
+        code_key, attempts_key = f"otp:code:{email}", f"otp:attempts:{email}"
+        (digest,) = await self.redis.pipeline(("GET", code_key))
+        if digest is None:
+            return "invalid"
+        if secrets.compare_digest(digest, _digest(otp)):
+            # Only the caller whose DEL removed the key wins a concurrent race.
+            deleted, _ = await self.redis.pipeline(("DEL", code_key), ("DEL", attempts_key))
+            return "ok" if deleted else "invalid"
+        attempts, _ = await self.redis.pipeline(
+            ("INCR", attempts_key),
+            ("EXPIRE", attempts_key, self.ttl_seconds),
+        )
+        if attempts >= self.max_attempts:
+            await self.redis.pipeline(("DEL", code_key), ("DEL", attempts_key))
+            return "locked"
+        return "invalid"
+
+    async def close(self) -> None:
+        await self.redis.close()
+
+
+def create_otp_store_from_env() -> OTPStore:
+    settings = (OTP_TTL_SECONDS, OTP_MAX_ATTEMPTS, OTP_RATE_LIMIT, OTP_RATE_WINDOW_SECONDS)
+    if OTP_STORE_URL.startswith("redis://"):
+        return RedisOTPStore(OTP_STORE_URL, *settings)
+    return InMemoryOTPStore(*settings)
+
+
+otp_store = create_otp_store_from_env()
+
+
+def generate_otp(length: int = 6) -> str:
+    return "".join(secrets.choice("0123456789") for _ in range(length))
@@ -0,0 +1,109 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException, status
+
+R = TypeVar("R")
+
+
+@lru_cache(maxsize=1)
+def pwd_context():
+    # passlib and its bcrypt backend load on the first hash instead of at boot.
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _hash(password: str) -> str:
+    return pwd_context().hash(password)
+
+
+def _verify(password: str, password_hash: str) -> bool:
+    return pwd_context().verify(password, password_hash)
+
+
+def _get_int_env(name: str, default_value: int) -> int:
+    try:
+        return int(os.getenv(name, str(default_value)))
+    except ValueError:
+        return default_value
+
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop on a small, bounded thread pool.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism.
+    `max_pending` caps running plus queued jobs; beyond it callers get a 503
+    instead of piling up behind a login storm.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(self.max_workers, max_pending)
+        self._executor = self._new_executor()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+
+    def _new_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+
+    async def _run(self, func: Callable[..., R], *args) -> R:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+            self.total_seconds += time.perf_counter() - start
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run(_verify, password, password_hash)
+
+    def shutdown(self) -> None:
+        # Swapped for a fresh pool so an app started again in the same
+        # process (tests, embedded servers) can still hash.
+        executor, self._executor = self._executor, self._new_executor()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": min(self.pending, self.max_workers),
+            "queued": max(0, self.pending - self.max_workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "total_seconds": round(self.total_seconds, 6),
+        }
+
+
+password_hasher = PasswordHasher(
+    max_workers=_get_int_env("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)),
+    max_pending=_get_int_env("PASSWORD_HASH_MAX_PENDING", 64),
+)
+
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password(password: str, password_hash: str) -> bool:
+    return await password_hasher.verify(password, password_hash)
@@ -0,0 +1,142 @@
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Hashable, Optional, TypeVar
+
+from models.user import User
+
+V = TypeVar("V")
+
+
+def _get_int_env(name: str, default_value: int) -> int:
+    try:
+        return int(os.getenv(name, str(default_value)))
+    except ValueError:
+        return default_value
+
+
+@dataclass(frozen=True, slots=True)
+class AuthPrincipal:
+    """The slice of a `User` row that authenticated handlers actually need."""
+
+    id: int
+    email: str
+    name: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthPrincipal":
+        return cls(id=user.id, email=user.email, name=user.name, is_active=user.is_active)
+
+
+class TTLCache(Generic[V]):
+    """Bounded LRU mapping whose entries also expire after `ttl_seconds`."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PrincipalCache:
+    """Caches token -> user id and user id -> principal lookups in-process.
+
+    Claims are keyed by the raw token so a repeated bearer token skips JWT
+    verification; principals are keyed by user id so that a single
+    `invalidate_user` call drops every token's view of that user.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.claims: TTLCache[int] = TTLCache(maxsize, ttl_seconds)
+        self.principals: TTLCache[AuthPrincipal] = TTLCache(maxsize, ttl_seconds)
+        self.claims_hits = 0
+        self.claims_misses = 0
+        self.principal_hits = 0
+        self.principal_misses = 0
+        self.invalidations = 0
+
+    def get_user_id(self, token: str) -> Optional[int]:
+        user_id = self.claims.get(token)
+        if user_id is None:
+            self.claims_misses += 1
+        else:
+            self.claims_hits += 1
+        return user_id
+
+    def set_user_id(self, token: str, user_id: int, expires_at: Optional[int] = None) -> None:
+        ttl = None
+        if expires_at is not None:
+            # Never keep a token cached past its own expiry.
+            ttl = expires_at - time.time()
+        self.claims.set(token, user_id, ttl)
+
+    def get_principal(self, user_id: int) -> Optional[AuthPrincipal]:
+        principal = self.principals.get(user_id)
+        if principal is None:
+            self.principal_misses += 1
+        else:
+            self.principal_hits += 1
+        return principal
+
+    def set_principal(self, principal: AuthPrincipal) -> None:
+        self.principals.set(principal.id, principal)
+
+    def invalidate_user(self, user_id: int) -> None:
+        self.principals.pop(user_id)
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        self.claims.clear()
+        self.principals.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "claims_hits": self.claims_hits,
+            "claims_misses": self.claims_misses,
+            "principal_hits": self.principal_hits,
+            "principal_misses": self.principal_misses,
+            "invalidations": self.invalidations,
+            "claims_size": len(self.claims),
+            "principals_size": len(self.principals),
+        }
+
+
+principal_cache = PrincipalCache(
+    maxsize=_get_int_env("AUTH_CACHE_MAXSIZE", 10000),
+    ttl_seconds=_get_int_env("AUTH_CACHE_TTL_SECONDS", 60),
+)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop the cached principal for `user_id`; call after any change to the user row."""
+    principal_cache.invalidate_user(user_id)
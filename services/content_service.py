@@ -0,0 +1,273 @@
+import asyncio
+import math
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from html import escape
+from html.parser import HTMLParser
+from typing import Optional
+from urllib.parse import urlsplit
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models.journal import Journal
+
+
+def _get_int_env(name: str, default_value: int) -> int:
+    try:
+        return int(os.getenv(name, str(default_value)))
+    except ValueError:
+        return default_value
+
+
+# Largest html_content accepted, in UTF-8 bytes; the column is MEDIUMTEXT.
+CONTENT_MAX_BYTES = _get_int_env("CONTENT_MAX_BYTES", 512 * 1024)
+# Documents at least this large are processed in the worker pool. Below it
+# the round-trip to another process costs about as much as parsing in place.
+CONTENT_POOL_MIN_BYTES = _get_int_env("CONTENT_POOL_MIN_BYTES", 16 * 1024)
+CONTENT_PROCESS_WORKERS = _get_int_env("CONTENT_PROCESS_WORKERS", min(2, os.cpu_count() or 1))
+SNIPPET_LENGTH = 200
+REPROCESS_BATCH_SIZE = 200
+WORDS_PER_MINUTE = 200
+
+_ALLOWED_TAGS = frozenset(
+    "a b blockquote br code del em h1 h2 h3 h4 h5 h6 hr i img li ol p pre s span strong sub sup u ul".split()
+)
+_VOID_TAGS = frozenset({"br", "hr", "img"})
+# Elements dropped together with everything inside them.
+_DROPPED_TAGS = frozenset({"script", "style", "iframe", "object", "template", "noscript", "svg", "math"})
+_ALLOWED_ATTRIBUTES = {"a": ("href", "title"), "img": ("src", "alt", "title")}
+_URL_SCHEMES = {"href": ("http", "https", "mailto"), "src": ("http", "https")}
+# Block-level elements end a word even when the markup has no whitespace.
+_BREAKING_TAGS = frozenset("blockquote br div h1 h2 h3 h4 h5 h6 hr li ol p pre td th tr ul".split())
+_WORD = re.compile(r"\w+(?:['’]\w+)*", re.UNICODE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class ProcessedContent:
+    html: Optional[str]
+    snippet: Optional[str]
+    word_count: int
+    reading_time_minutes: int
+
+
+def _safe_url(attribute: str, value: str) -> bool:
+    scheme = urlsplit(value.strip()).scheme.lower()
+    return scheme in _URL_SCHEMES[attribute]
+
+
+class _Sanitizer(HTMLParser):
+    """Single pass that rewrites HTML to an allowlist and collects its text."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out: list[str] = []
+        self.text: list[str] = []
+        self._open: list[str] = []
+        self._dropping = 0
+
+    def _attributes(self, tag: str, attrs) -> str:
+        rendered = []
+        for name, value in attrs:
+            if name not in _ALLOWED_ATTRIBUTES.get(tag, ()) or value is None:
+                continue
+            if name in _URL_SCHEMES and not _safe_url(name, value):
+                continue
+            rendered.append(f' {name}="{escape(value, quote=True)}"')
+        if tag == "a":
+            rendered.append(' rel="nofollow noopener noreferrer"')
+        return "".join(rendered)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _DROPPED_TAGS:
+            self._dropping += 1
+            return
+        if self._dropping:
+            return
+        if tag in _BREAKING_TAGS:
+            self.text.append(" ")
+        if tag not in _ALLOWED_TAGS:
+            return
+        self.out.append(f"<{tag}{self._attributes(tag, attrs)}>")
+        if tag not in _VOID_TAGS:
+            self._open.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in _DROPPED_TAGS:
+            return
+        self.handle_starttag(tag, attrs)
+        if tag in self._open and tag not in _VOID_TAGS and self._open[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in _DROPPED_TAGS:
+            self._dropping = max(0, self._dropping - 1)
+            return
+        if self._dropping:
+            return
+        if tag in _BREAKING_TAGS:
+            self.text.append(" ")
+        if tag not in self._open:
+            return  # stray end tag
+        # Close anything left open inside it so the output stays well nested.
+        while self._open:
+            open_tag = self._open.pop()
+            self.out.append(f"</{open_tag}>")
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._dropping:
+            return
+        self.out.append(escape(data, quote=False))
+        self.text.append(data)
+
+    def finish(self) -> tuple[str, str]:
+        self.close()
+        while self._open:
+            self.out.append(f"</{self._open.pop()}>")
+        return "".join(self.out), "".join(self.text)
+
+
+def _snippet(text: str) -> Optional[str]:
+    text = _WHITESPACE.sub(" ", text).strip()
+    if not text:
+        return None
+    if len(text) <= SNIPPET_LENGTH:
+        return text
+    cut = text[: SNIPPET_LENGTH - 1]
+    if " " in cut:
+        cut = cut[: cut.rindex(" ")]
+    return cut.rstrip(" ,.;:") + "…"
+
+
+def process_content(html: Optional[str]) -> ProcessedContent:
+    """Sanitize journal HTML and derive its snippet, word count and reading time."""
+    if not html:
+        return ProcessedContent(html=html, snippet=None, word_count=0, reading_time_minutes=0)
+    sanitizer = _Sanitizer()
+    sanitizer.feed(html)
+    clean_html, text = sanitizer.finish()
+    word_count = sum(1 for _ in _WORD.finditer(text))
+    return ProcessedContent(
+        html=clean_html,
+        snippet=_snippet(text),
+        word_count=word_count,
+        reading_time_minutes=math.ceil(word_count / WORDS_PER_MINUTE),
+    )
+
+
+class ContentProcessor:
+    """Runs `process_content` inline for small documents and in a process pool for large ones.
+
+    HTMLParser is pure Python and holds the GIL, so a thread would still
+    stall the event loop; a separate process does not. The pool is started
+    on first use.
+    """
+
+    def __init__(self, max_workers: int, pool_min_bytes: int, max_bytes: int):
+        self.max_workers = max(1, max_workers)
+        self.pool_min_bytes = pool_min_bytes
+        self.max_bytes = max_bytes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.inline = 0
+        self.pooled = 0
+
+    async def process(self, html: Optional[str]) -> ProcessedContent:
+        size = len(html.encode()) if html else 0
+        if size > self.max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"html_content exceeds {self.max_bytes} bytes",
+            )
+        if size < self.pool_min_bytes:
+            self.inline += 1
+            return process_content(html)
+        if self._executor is None:
+            # Forking a process that already runs threads (the password hasher,
+            # database drivers) can copy a lock another thread was holding; a
+            # forkserver starts workers from a clean single-threaded process.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("forkserver")
+            )
+        self.pooled += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, process_content, html)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "max_workers": self.max_workers,
+            "pool_min_bytes": self.pool_min_bytes,
+            "inline": self.inline,
+            "pooled": self.pooled,
+        }
+
+
+content_processor = ContentProcessor(CONTENT_PROCESS_WORKERS, CONTENT_POOL_MIN_BYTES, CONTENT_MAX_BYTES)
+
+
+def apply_content(journal: Journal, content: ProcessedContent) -> bool:
+    """Store `content` on `journal`; returns whether any stored field changed."""
+    before = (journal.html_content, journal.body_snippet, journal.word_count, journal.reading_time_minutes)
+    journal.html_content = content.html
+    journal.body_snippet = content.snippet
+    journal.word_count = content.word_count
+    journal.reading_time_minutes = content.reading_time_minutes
+    return before != (content.html, content.snippet, content.word_count, content.reading_time_minutes)
+
+
+async def reprocess_all(session_factory: async_sessionmaker[AsyncSession]) -> int:
+    """Re-sanitize every journal and refresh its derived fields, one batch per transaction.
+
+    Only journals whose stored output changes are written, and those get a new
+    `updated_at` so clients and caches holding the old version revalidate.
+    """
+    last_id = 0
+    processed = 0
+    while True:
+        async with session_factory() as session:
+            journals = (
+                await session.exec(
+                    select(Journal).where(Journal.id > last_id).order_by(Journal.id).limit(REPROCESS_BATCH_SIZE)
+                )
+            ).all()
+            if not journals:
+                return processed
+            for journal in journals:
+                # Stored content may predate CONTENT_MAX_BYTES, so skip the size check.
+                if apply_content(journal, process_content(journal.html_content)):
+                    # ETags and cached compressed bodies are derived from updated_at.
+                    journal.updated_at = datetime.utcnow()
+                    session.add(journal)
+            await session.commit()
+        processed += len(journals)
+        last_id = journals[-1].id
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    from db.sqlmodel import create_async_engine_from_env, create_async_session_factory, dispose_async_engine
+
+    async def _main() -> None:
+        load_dotenv()
+        engine = create_async_engine_from_env()
+        try:
+            processed = await reprocess_all(create_async_session_factory(engine))
+            print(f"Processed {processed} journals")
+        finally:
+            await dispose_async_engine(engine)
+
+    asyncio.run(_main())
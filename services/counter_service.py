@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import os
+from typing import Iterable, Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models.comment import Comment
+from models.journal import Journal, JournalFavorites, JournalReactions, JournalShares
+
+logger = logging.getLogger("app.counters")
+
+
+def _get_int_env(name: str, default_value: int) -> int:
+    try:
+        return int(os.getenv(name, str(default_value)))
+    except ValueError:
+        return default_value
+
+
+RECONCILE_INTERVAL_SECONDS = _get_int_env("COUNTER_RECONCILE_INTERVAL_SECONDS", 3600)
+RECONCILE_BATCH_SIZE = _get_int_env("COUNTER_RECONCILE_BATCH_SIZE", 1000)
+
+
+def _counter_sources():
+    """Journal counter column -> correlated COUNT(*) that is its source of truth."""
+    return {
+        "reactions_count": select(func.count())
+        .select_from(JournalReactions)
+        .where(JournalReactions.journal_id == Journal.id)
+        .scalar_subquery(),
+        "comments_count": select(func.count())
+        .select_from(Comment)
+        .where(Comment.journal_id == Journal.id, Comment.is_deleted == False)
+        .scalar_subquery(),
+        "favorites_count": select(func.count())
+        .select_from(JournalFavorites)
+        .where(JournalFavorites.journal_id == Journal.id)
+        .scalar_subquery(),
+        "shares_count": select(func.count())
+        .select_from(JournalShares)
+        .where(JournalShares.journal_id == Journal.id)
+        .scalar_subquery(),
+    }
+
+
+async def increment_counter(session: AsyncSession, journal_id: int, column: str, delta: int = 1) -> None:
+    """Atomically add `delta` to one counter; runs in the caller's transaction."""
+    counter = getattr(Journal, column)
+    await session.exec(
+        update(Journal)
+        .where(Journal.id == journal_id)
+        .values({column: counter + delta})
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def reconcile_counters(session: AsyncSession, journal_ids: Iterable[int]) -> None:
+    """Recompute every counter of the given journals from the source tables."""
+    journal_ids = list(journal_ids)
+    if not journal_ids:
+        return
+    await session.exec(
+        update(Journal)
+        .where(Journal.id.in_(journal_ids))
+        .values(_counter_sources())
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def reconcile_all_counters(session_factory: async_sessionmaker[AsyncSession]) -> int:
+    """Walk every journal in id order and repair drifted counters, one batch per transaction."""
+    last_id = 0
+    checked = 0
+    while True:
+        async with session_factory() as session:
+            journal_ids = (
+                await session.exec(
+                    select(Journal.id)
+                    .where(Journal.id > last_id)
+                    .order_by(Journal.id)
+                    .limit(RECONCILE_BATCH_SIZE)
+                )
+            ).all()
+            if not journal_ids:
+                return checked
+            await reconcile_counters(session, journal_ids)
+            await session.commit()
+        checked += len(journal_ids)
+        last_id = journal_ids[-1]
+
+
+class CounterReconciler:
+    """Background task that periodically runs `reconcile_all_counters`."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], interval_seconds: int):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.interval_seconds > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                checked = await reconcile_all_counters(self.session_factory)
+                logger.info("journal counters reconciled", extra={"journals": checked})
+            except Exception:
+                logger.exception("journal counter reconciliation failed")
@@ -0,0 +1,303 @@
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import time
+import uuid
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Optional
+
+from fastapi import Request
+from sqlalchemy import case, insert, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models.journal import Journal, JournalFavorites, JournalReactions, JournalShares
+
+logger = logging.getLogger("app.engagement")
+
+
+def _get_int_env(name: str, default_value: int) -> int:
+    try:
+        return int(os.getenv(name, str(default_value)))
+    except ValueError:
+        return default_value
+
+
+WRITE_BEHIND_ENABLED = os.getenv("ENGAGEMENT_WRITE_BEHIND", "").lower() in ("1", "true", "yes")
+WAL_DIR = os.getenv("ENGAGEMENT_WAL_DIR", "var/engagement-wal")
+FLUSH_MAX_EVENTS = _get_int_env("ENGAGEMENT_FLUSH_MAX_EVENTS", 500)
+FLUSH_INTERVAL_MS = _get_int_env("ENGAGEMENT_FLUSH_INTERVAL_MS", 200)
+# Recently accepted idempotency keys remembered in memory to drop client retries early.
+SEEN_KEYS_MAX = 100_000
+
+_MODELS = {
+    "reaction": JournalReactions,
+    "favorite": JournalFavorites,
+    "share": JournalShares,
+}
+_COUNTERS = {
+    "reaction": "reactions_count",
+    "favorite": "favorites_count",
+    "share": "shares_count",
+}
+
+
+@dataclass
+class EngagementEvent:
+    kind: str
+    journal_id: int
+    user_id: int
+    idempotency_key: str
+    reaction_type: Optional[str] = None
+    share_type: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+    def to_row(self) -> dict:
+        row = {"journal_id": self.journal_id, "user_id": self.user_id}
+        created_at = datetime.fromisoformat(self.created_at)
+        if self.kind == "reaction":
+            row.update(reaction_type=self.reaction_type, created_at=created_at)
+        elif self.kind == "favorite":
+            row.update(created_at=created_at)
+        else:
+            row.update(
+                share_type=self.share_type,
+                idempotency_key=self.idempotency_key,
+                shared_at=created_at,
+            )
+        return row
+
+
+def default_idempotency_key(kind: str, journal_id: int, user_id: int, value: Optional[str]) -> str:
+    # Reactions and favorites are naturally unique per user; shares are not,
+    # so without a client key every share gets its own.
+    if kind == "share":
+        return f"share:{uuid.uuid4().hex}"
+    return f"{kind}:{journal_id}:{user_id}:{value or ''}"
+
+
+class EngagementBuffer:
+    """Write-behind buffer for reactions, favorites and shares.
+
+    Each accepted event is appended to a local write-ahead log segment and
+    fsynced (group-committed across concurrent callers) before the request
+    is acknowledged. A background loop flushes pending events as multi-row
+    INSERT IGNOREs when `max_events` accumulate or every `flush_interval_ms`,
+    then deletes the sealed segments. Segments left behind by a crashed
+    process are replayed on start; replays are harmless because every row
+    is protected by a unique key (reaction/favorite natural keys, share
+    idempotency keys) and counters only move by the rows actually inserted.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        wal_dir: str,
+        max_events: int,
+        flush_interval_ms: int,
+    ):
+        self.session_factory = session_factory
+        self.wal_dir = Path(wal_dir)
+        self.max_events = max(1, max_events)
+        self.flush_interval = max(1, flush_interval_ms) / 1000
+        self._pending: list[EngagementEvent] = []
+        self._seen_keys: OrderedDict[str, None] = OrderedDict()
+        self._segment: Optional[IO[str]] = None
+        self._sealed: list[IO[str]] = []
+        self._written = 0
+        self._synced = 0
+        self._sync_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_wanted = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.accepted = 0
+        self.duplicates = 0
+        self.flushed = 0
+        self.flush_failures = 0
+
+    # -- lifecycle -----------------------------------------------------
+
+    async def start(self) -> None:
+        self.wal_dir.mkdir(parents=True, exist_ok=True)
+        self._recover_orphaned_segments()
+        self._segment = self._open_segment()
+        self._task = asyncio.create_task(self._run())
+        if self._pending:
+            self._flush_wanted.set()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            # The loop is asked to exit rather than cancelled: a flush cut off
+            # mid-write would drop its batch from memory, and on Python 3.11
+            # wait_for can swallow a cancel that races with the wake-up event.
+            self._stopping = True
+            self._flush_wanted.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        for handle in (*self._sealed, self._segment):
+            if handle is not None:
+                handle.close()
+        if self._segment is not None and not self._pending:
+            os.unlink(self._segment.name)
+        self._segment = None
+        self._sealed = []
+
+    # -- write-ahead log -------------------------------------------------
+
+    def _open_segment(self) -> IO[str]:
+        name = f"{os.getpid()}-{time.time_ns()}.wal"
+        handle = open(self.wal_dir / name, "a", encoding="utf-8")
+        # Held for as long as the segment belongs to this process.
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return handle
+
+    def _recover_orphaned_segments(self) -> None:
+        for path in sorted(self.wal_dir.glob("*.wal")):
+            handle = open(path, "r+", encoding="utf-8")
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                handle.close()  # owned by a live worker
+                continue
+            for line in handle:
+                try:
+                    event = EngagementEvent(**json.loads(line))
+                except (ValueError, TypeError):
+                    continue  # torn write of an event that was never acknowledged
+                self._pending.append(event)
+                self._remember(event.idempotency_key)
+            self._sealed.append(handle)
+        if self._pending:
+            logger.warning("recovered engagement events", extra={"events": len(self._pending)})
+
+    async def _make_durable(self, sequence: int) -> None:
+        while self._synced < sequence:
+            if self._sync_task is None:
+                self._sync_task = asyncio.create_task(self._fsync(self._segment, self._written))
+            await asyncio.shield(self._sync_task)
+
+    async def _fsync(self, segment: IO[str], target: int) -> None:
+        try:
+            segment.flush()
+            await asyncio.to_thread(os.fsync, segment.fileno())
+            self._synced = max(self._synced, target)
+        finally:
+            self._sync_task = None
+
+    def _remember(self, key: str) -> None:
+        self._seen_keys[key] = None
+        while len(self._seen_keys) > SEEN_KEYS_MAX:
+            self._seen_keys.popitem(last=False)
+
+    # -- public API ------------------------------------------------------
+
+    async def submit(self, event: EngagementEvent) -> bool:
+        """Durably accept `event`; returns False if its idempotency key was already seen."""
+        if event.idempotency_key in self._seen_keys:
+            self.duplicates += 1
+            return False
+        self._remember(event.idempotency_key)
+        self._segment.write(json.dumps(asdict(event), separators=(",", ":")) + "\n")
+        self._written += 1
+        sequence = self._written
+        # Queued before the fsync completes so a concurrent flush that seals
+        # this segment also writes the event; the caller is only acknowledged
+        # once the line is on disk.
+        self._pending.append(event)
+        if len(self._pending) >= self.max_events:
+            self._flush_wanted.set()
+        await self._make_durable(sequence)
+        self.accepted += 1
+        return True
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            # Wait out an in-flight fsync so the segment is not swapped underneath it.
+            while self._sync_task is not None:
+                await asyncio.shield(self._sync_task)
+            events, self._pending = self._pending, []
+            if self._segment is not None:
+                sealed = self._segment
+                self._sealed.append(sealed)
+                self._segment = self._open_segment()
+                # Writers still waiting on lines in the sealed segment wait on this sync.
+                self._sync_task = asyncio.create_task(self._fsync(sealed, self._written))
+                await asyncio.shield(self._sync_task)
+            try:
+                await self._write(events)
+            except Exception:
+                self.flush_failures += 1
+                self._pending[:0] = events
+                logger.exception("engagement flush failed", extra={"events": len(events)})
+                return
+            self.flushed += len(events)
+            for handle in self._sealed:
+                handle.close()
+                os.unlink(handle.name)
+            self._sealed = []
+
+    async def _write(self, events: list[EngagementEvent]) -> None:
+        rows: dict[tuple[str, int], list[dict]] = defaultdict(list)
+        for event in events:
+            rows[event.kind, event.journal_id].append(event.to_row())
+        deltas: dict[str, Counter] = {column: Counter() for column in _COUNTERS.values()}
+        async with self.session_factory() as session:
+            # One multi-row INSERT IGNORE per journal and kind: its rowcount is
+            # exactly how many rows were new, so duplicates and replays do not
+            # move the counters.
+            for (kind, journal_id), journal_rows in rows.items():
+                statement = (
+                    insert(_MODELS[kind])
+                    .values(journal_rows)
+                    .prefix_with("IGNORE", dialect="mysql")
+                    .prefix_with("OR IGNORE", dialect="sqlite")
+                )
+                inserted = (await session.exec(statement)).rowcount
+                if inserted > 0:
+                    deltas[_COUNTERS[kind]][journal_id] += inserted
+            journal_ids = set().union(*deltas.values())
+            if journal_ids:
+                await session.exec(
+                    update(Journal)
+                    .where(Journal.id.in_(journal_ids))
+                    .values(
+                        {
+                            column: getattr(Journal, column) + case(counts, value=Journal.id, else_=0)
+                            for column, counts in deltas.items()
+                            if counts
+                        }
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            await session.commit()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_wanted.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wanted.clear()
+            await self.flush()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "accepted": self.accepted,
+            "duplicates": self.duplicates,
+            "flushed": self.flushed,
+            "flush_failures": self.flush_failures,
+        }
+
+
+def get_engagement_buffer(request: Request) -> Optional[EngagementBuffer]:
+    return getattr(request.app.state, "engagement_buffer", None)
@@ -0,0 +1,192 @@
+import os
+from typing import Optional, Sequence
+
+from sqlalchemy import Row, delete, exists, insert, literal, true, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db.pagination import paginate_newest_first, split_page
+from models.feed import UserTimeline
+from models.journal import Journal
+from models.social import UserFollows
+from models.user import User
+from services.visibility_service import Viewer
+
+
+def _get_int_env(name: str, default_value: int) -> int:
+    try:
+        return int(os.getenv(name, str(default_value)))
+    except ValueError:
+        return default_value
+
+
+# Authors with more followers than this are not fanned out on write; their
+# followers pull their journals at read time instead.
+FANOUT_MAX_FOLLOWERS = _get_int_env("FEED_FANOUT_MAX_FOLLOWERS", 1000)
+# How many of an author's recent journals are copied into a new follower's timeline.
+BACKFILL_LIMIT = _get_int_env("FEED_BACKFILL_LIMIT", 50)
+
+
+async def _followers_count(session: AsyncSession, user_id: int) -> int:
+    count = (await session.exec(select(User.followers_count).where(User.id == user_id))).first()
+    return count or 0
+
+
+async def fan_out_journal(session: AsyncSession, journal: Journal) -> None:
+    """Copy a public journal into every follower's timeline in one INSERT ... SELECT.
+
+    The caller owns the transaction; `journal` must already have an id.
+    """
+    if journal.is_private or journal.is_deleted:
+        return
+    if await _followers_count(session, journal.user_id) > FANOUT_MAX_FOLLOWERS:
+        return
+    followers = select(
+        UserFollows.follower_id,
+        literal(journal.id),
+        literal(journal.user_id),
+        literal(journal.created_at),
+    ).where(UserFollows.following_id == journal.user_id)
+    await session.exec(
+        insert(UserTimeline).from_select(
+            ["user_id", "journal_id", "author_id", "created_at"], followers
+        )
+    )
+
+
+async def retract_journal(session: AsyncSession, journal_id: int) -> None:
+    await session.exec(delete(UserTimeline).where(UserTimeline.journal_id == journal_id))
+
+
+async def on_follow(session: AsyncSession, follower_id: int, author_id: int) -> None:
+    await session.exec(
+        update(User)
+        .where(User.id == author_id)
+        .values(followers_count=User.followers_count + 1)
+    )
+    if await _followers_count(session, author_id) > FANOUT_MAX_FOLLOWERS:
+        return
+    recent = (
+        select(
+            literal(follower_id),
+            Journal.id,
+            Journal.user_id,
+            Journal.created_at,
+        )
+        .where(
+            Journal.user_id == author_id,
+            Journal.is_deleted == False,
+            Journal.is_private == False,
+        )
+        .order_by(Journal.created_at.desc(), Journal.id.desc())
+        .limit(BACKFILL_LIMIT)
+    )
+    await session.exec(
+        insert(UserTimeline).from_select(
+            ["user_id", "journal_id", "author_id", "created_at"], recent
+        )
+    )
+
+
+async def _backfill_followers(session: AsyncSession, author_id: int) -> None:
+    """Copy an author's recent journals into every follower's timeline.
+
+    Run when the author drops back to fan-out: journals written while they
+    were pulled at read time were never pushed, and they stop being pulled
+    now. Rows already in a timeline (pushed before the author crossed the
+    threshold) are skipped.
+    """
+    recent = (
+        select(Journal.id, Journal.created_at)
+        .where(
+            Journal.user_id == author_id,
+            Journal.is_deleted == False,
+            Journal.is_private == False,
+        )
+        .order_by(Journal.created_at.desc(), Journal.id.desc())
+        .limit(BACKFILL_LIMIT)
+        .subquery()
+    )
+    rows = (
+        select(UserFollows.follower_id, recent.c.id, literal(author_id), recent.c.created_at)
+        .join(recent, true())
+        .where(
+            UserFollows.following_id == author_id,
+            ~exists().where(
+                UserTimeline.user_id == UserFollows.follower_id,
+                UserTimeline.journal_id == recent.c.id,
+            ),
+        )
+    )
+    await session.exec(
+        insert(UserTimeline).from_select(
+            ["user_id", "journal_id", "author_id", "created_at"], rows
+        )
+    )
+
+
+async def on_unfollow(session: AsyncSession, follower_id: int, author_id: int) -> None:
+    await session.exec(
+        update(User)
+        .where(User.id == author_id, User.followers_count > 0)
+        .values(followers_count=User.followers_count - 1)
+    )
+    # Switching from pull back to push: refill timelines with what was only pulled.
+    # Going the other way needs nothing, as pulling reads the author's whole history.
+    if await _followers_count(session, author_id) == FANOUT_MAX_FOLLOWERS:
+        await _backfill_followers(session, author_id)
+    await session.exec(
+        delete(UserTimeline).where(
+            UserTimeline.user_id == follower_id,
+            UserTimeline.author_id == author_id,
+        )
+    )
+
+
+async def read_feed(
+    session: AsyncSession, viewer: Viewer, cursor: Optional[str], limit: int, columns: Sequence
+) -> tuple[Sequence[Row], Optional[str]]:
+    """Merge `viewer`'s pushed timeline with journals pulled from followed high-follower authors.
+
+    Both sources are filtered with `viewer.journal_filter()`, like every other
+    journal listing. `columns` are the Journal columns to select; they must
+    include `id` and `created_at`.
+    """
+    user_id = viewer.user_id
+    visible = viewer.journal_filter()
+
+    pushed_statement = paginate_newest_first(
+        select(*columns)
+        .join(UserTimeline, UserTimeline.journal_id == Journal.id)
+        .where(UserTimeline.user_id == user_id, *visible),
+        UserTimeline.created_at,
+        UserTimeline.journal_id,
+        cursor,
+        0,
+        limit,
+    )
+    pushed = (await session.exec(pushed_statement)).all()
+
+    pulled_authors = (
+        select(UserFollows.following_id)
+        .join(User, User.id == UserFollows.following_id)
+        .where(
+            UserFollows.follower_id == user_id,
+            User.followers_count > FANOUT_MAX_FOLLOWERS,
+        )
+    )
+    pulled_statement = paginate_newest_first(
+        select(*columns).where(Journal.user_id.in_(pulled_authors), *visible),
+        Journal.created_at,
+        Journal.id,
+        cursor,
+        0,
+        limit,
+    )
+    pulled = (await session.exec(pulled_statement)).all()
+
+    # An author who crossed the threshold can appear in both sources.
+    merged = {journal.id: journal for journal in (*pushed, *pulled)}
+    # Each source fetched one row past `limit`, so more than `limit` merged
+    # rows means another page exists.
+    return split_page(sorted(merged.values(), key=lambda j: (j.created_at, j.id), reverse=True), limit)
@@ -1,17 +1,65 @@
+import asyncio
+import json
+import logging
 import os
-import mailtrap as mt
+import random
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Protocol
+
 from dotenv import load_dotenv
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models.mail import MailOutbox
 
 load_dotenv()
 
-# welcome_image = Path(__file__).parent.joinpath("welcome.png").read_bytes()
-async def send_mail(otp,name,email):
-    mail = mt.Mail(
-        sender=mt.Address(email="hello@demomailtrap.com", name="Mailtrap Test"),
-        to=[mt.Address(email=email, name=name)],
-    subject="You are awesome!",
-    text=f"Congrats for sending test email with Mailtrap! Your OTP is {otp} and it will expire in 10 minutes. Do not share this OTP with anyone.",
-    html="""
+logger = logging.getLogger("app.mail")
+
+
+def _get_int_env(name: str, default_value: int) -> int:
+    try:
+        return int(os.getenv(name, str(default_value)))
+    except ValueError:
+        return default_value
+
+
+# "mailtrap" (MAILTRAP_API_KEY) or "file" (one JSON file per message in MAIL_FILE_DIR).
+MAIL_TRANSPORT = os.getenv("MAIL_TRANSPORT", "mailtrap").lower()
+MAIL_FILE_DIR = os.getenv("MAIL_FILE_DIR", "var/mail")
+MAIL_WORKERS = _get_int_env("MAIL_WORKERS", 4)
+MAIL_BATCH_SIZE = _get_int_env("MAIL_BATCH_SIZE", 50)
+MAIL_POLL_INTERVAL_MS = _get_int_env("MAIL_POLL_INTERVAL_MS", 1000)
+MAIL_MAX_ATTEMPTS = _get_int_env("MAIL_MAX_ATTEMPTS", 6)
+MAIL_BACKOFF_SECONDS = _get_int_env("MAIL_BACKOFF_SECONDS", 10)
+MAIL_BACKOFF_MAX_SECONDS = _get_int_env("MAIL_BACKOFF_MAX_SECONDS", 900)
+# How long a claimed message stays invisible to other workers before it is retried.
+MAIL_LEASE_SECONDS = _get_int_env("MAIL_LEASE_SECONDS", 120)
+
+
+@dataclass
+class MailMessage:
+    to_email: str
+    to_name: str
+    subject: str
+    text_body: str
+    html_body: Optional[str] = None
+
+
+def otp_message(otp: str, name: str, email: str, expires_minutes: int) -> MailMessage:
+    return MailMessage(
+        to_email=email,
+        to_name=name,
+        subject="Your password reset code",
+        text_body=(
+            f"Your OTP is {otp} and it will expire in {expires_minutes} minutes. "
+            "Do not share this OTP with anyone."
+        ),
+        html_body=f"""
     <!doctype html>
     <html>
       <head>
@@ -20,31 +68,204 @@ async def send_mail(otp,name,email):
       <body style="font-family: sans-serif;">
         <div style="display: block; margin: auto; max-width: 600px;" class="main">
           <h1 style="font-size: 18px; font-weight: bold; margin-top: 20px">
-            Congrats for sending test email with Mailtrap!
+            Your password reset code
           </h1>
-          <p>Inspect it using the tabs you see above and learn how this email can be improved.</p>
-          <img alt="Inspect with Tabs" src="cid:welcome.png" style="width: 100%;">
-          <p>Now send your email using our fake SMTP server and integration of your choice!</p>
-          <p>Good luck! Hope it works.</p>
+          <p>Your OTP is <strong>{otp}</strong> and it will expire in {expires_minutes} minutes.</p>
+          <p>Do not share this OTP with anyone.</p>
         </div>
-        <!-- Example of invalid for email html/css, will be detected by Mailtrap: -->
-        <style>
-          .main { background-color: white; }
-          a:hover { border-left-width: 1em; min-height: 2em; }
-        </style>
       </body>
     </html>
     """,
-    category="Test",
-    headers={"X-MT-Header": "Custom header"},
-    custom_variables={"year": 2023},
     )
-    client = mt.MailtrapClient(token=os.getenv("MAILTRAP_API_KEY"))
-    try:
-        client.send(mail)
-    except Exception as e:
-        print(e)
 
-if __name__ == "__main__":
-    send_mail("123456", "Sudip Mandal", "krishg@zluck.in")
 
+class MailTransport(Protocol):
+    async def send(self, message: MailMessage) -> None: ...
+
+
+class MailtrapTransport:
+    def __init__(self, token: Optional[str]):
+        self.token = token
+        self._client = None
+
+    def _send(self, message: MailMessage) -> None:
+        # mailtrap pulls in requests; it is imported on the first send rather
+        # than when a worker boots.
+        import mailtrap as mt
+
+        if self._client is None:
+            self._client = mt.MailtrapClient(token=self.token)
+        mail = mt.Mail(
+            sender=mt.Address(email="hello@demomailtrap.com", name="Mailtrap Test"),
+            to=[mt.Address(email=message.to_email, name=message.to_name)],
+            subject=message.subject,
+            text=message.text_body,
+            html=message.html_body,
+            category="OTP",
+        )
+        self._client.send(mail)
+
+    async def send(self, message: MailMessage) -> None:
+        # The client is blocking HTTPS; keep it off the event loop.
+        await asyncio.to_thread(self._send, message)
+
+
+class FileTransport:
+    """Writes each message as JSON into a directory; for local development and tests."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _write(self, message: MailMessage) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{random.getrandbits(32):08x}.json"
+        temporary = self.directory / f".{name}"
+        temporary.write_text(json.dumps(asdict(message)), encoding="utf-8")
+        temporary.rename(self.directory / name)
+
+    async def send(self, message: MailMessage) -> None:
+        await asyncio.to_thread(self._write, message)
+
+
+def create_transport_from_env() -> MailTransport:
+    if MAIL_TRANSPORT == "file":
+        return FileTransport(MAIL_FILE_DIR)
+    return MailtrapTransport(os.getenv("MAILTRAP_API_KEY"))
+
+
+def enqueue_mail(session: AsyncSession, message: MailMessage) -> None:
+    """Queue `message`; it is only delivered if the caller's transaction commits."""
+    session.add(MailOutbox(**asdict(message)))
+
+
+# Bodies carry one-time codes; they are cleared once a row is done with.
+_REDACTED_BODY = {"text_body": "", "html_body": None}
+
+
+def _backoff(attempts: int) -> timedelta:
+    delay = min(MAIL_BACKOFF_MAX_SECONDS, MAIL_BACKOFF_SECONDS * 2 ** (attempts - 1))
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+class MailOutboxWorker:
+    """Background task that drains `mail_outbox`.
+
+    Each tick claims up to `batch_size` due rows by pushing their
+    `next_attempt_at` past a lease, then delivers them with at most
+    `workers` concurrent sends. Failures are retried with exponential
+    backoff until `max_attempts`, after which the row is marked failed.
+    Rows that are sent or failed keep their metadata but lose their body.
+    A worker that dies mid-batch leaves its rows to be retried once the
+    lease expires.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        transport: MailTransport,
+        workers: int = MAIL_WORKERS,
+        batch_size: int = MAIL_BATCH_SIZE,
+        poll_interval_ms: int = MAIL_POLL_INTERVAL_MS,
+        max_attempts: int = MAIL_MAX_ATTEMPTS,
+    ):
+        self.session_factory = session_factory
+        self.transport = transport
+        self.batch_size = max(1, batch_size)
+        self.poll_interval = max(1, poll_interval_ms) / 1000
+        self.max_attempts = max(1, max_attempts)
+        self._semaphore = asyncio.Semaphore(max(1, workers))
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _claim(self) -> list[MailOutbox]:
+        now = datetime.utcnow()
+        async with self.session_factory() as session:
+            rows = (
+                await session.exec(
+                    select(MailOutbox)
+                    .where(MailOutbox.status == "pending", MailOutbox.next_attempt_at <= now)
+                    .order_by(MailOutbox.next_attempt_at)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+            ).all()
+            if rows:
+                await session.exec(
+                    update(MailOutbox)
+                    .where(MailOutbox.id.in_([row.id for row in rows]))
+                    .values(next_attempt_at=now + timedelta(seconds=MAIL_LEASE_SECONDS))
+                    .execution_options(synchronize_session=False)
+                )
+            await session.commit()
+            return list(rows)
+
+    async def _deliver(self, row: MailOutbox) -> dict:
+        message = MailMessage(row.to_email, row.to_name, row.subject, row.text_body, row.html_body)
+        attempts = row.attempts + 1
+        async with self._semaphore:
+            try:
+                await self.transport.send(message)
+            except Exception as exc:
+                logger.warning("mail delivery failed", extra={"outbox_id": row.id, "attempts": attempts})
+                if attempts >= self.max_attempts:
+                    self.failed += 1
+                    return {"status": "failed", "attempts": attempts, "last_error": repr(exc)[:255], **_REDACTED_BODY}
+                self.retried += 1
+                return {
+                    "attempts": attempts,
+                    "last_error": repr(exc)[:255],
+                    "next_attempt_at": datetime.utcnow() + _backoff(attempts),
+                }
+        self.sent += 1
+        return {
+            "status": "sent",
+            "attempts": attempts,
+            "sent_at": datetime.utcnow(),
+            "last_error": None,
+            **_REDACTED_BODY,
+        }
+
+    async def drain_once(self) -> int:
+        rows = await self._claim()
+        if not rows:
+            return 0
+        outcomes = await asyncio.gather(*(self._deliver(row) for row in rows))
+        async with self.session_factory() as session:
+            for row, values in zip(rows, outcomes):
+                await session.exec(
+                    update(MailOutbox)
+                    .where(MailOutbox.id == row.id)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+            await session.commit()
+        return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # A full batch means there is probably more waiting.
+                if await self.drain_once() >= self.batch_size:
+                    continue
+            except Exception:
+                logger.exception("mail outbox drain failed")
+            await asyncio.sleep(self.poll_interval)
+
+    def stats(self) -> dict[str, int]:
+        return {"sent": self.sent, "retried": self.retried, "failed": self.failed}
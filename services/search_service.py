@@ -0,0 +1,290 @@
+import base64
+import json
+import math
+import os
+import re
+import time
+from collections import Counter
+from html.parser import HTMLParser
+from typing import Iterable, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, case, delete, func, insert, literal, or_
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models.journal import Journal, JournalTags, Tag
+from models.search import JournalSearchDocument, JournalSearchTerm
+
+
+def _get_int_env(name: str, default_value: int) -> int:
+    try:
+        return int(os.getenv(name, str(default_value)))
+    except ValueError:
+        return default_value
+
+
+# Corpus size and average length change slowly; they are re-read at most this often.
+STATS_TTL_SECONDS = _get_int_env("SEARCH_STATS_TTL_SECONDS", 60)
+MAX_QUERY_TERMS = 10
+# Terms found in more than this share of documents carry almost no IDF weight
+# but have huge posting lists; they are skipped when the query has rarer terms.
+COMMON_TERM_RATIO = 0.5
+REINDEX_BATCH_SIZE = 500
+
+# Standard BM25 parameters.
+K1 = 1.2
+B = 0.75
+# Title and tag matches count as this many body occurrences.
+FIELD_WEIGHTS = {"title": 3, "tags": 2, "body": 1}
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i if in into is it its me my of on or so "
+    "that the their them then there these they this to was we were what when which who will with you your".split()
+)
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style") and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(html: Optional[str]) -> str:
+    if not html:
+        return ""
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return " ".join(extractor.parts)
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    if not text:
+        return []
+    return [
+        token[:64]
+        for token in _TOKEN.findall(text.lower())
+        if len(token) > 1 and token not in _STOPWORDS
+    ]
+
+
+def _document_terms(journal: Journal, tags: Iterable[str]) -> Counter[str]:
+    terms: Counter[str] = Counter()
+    for field, text in (
+        ("title", journal.title),
+        ("tags", " ".join(tags)),
+        ("body", html_to_text(journal.html_content)),
+    ):
+        for token in tokenize(text):
+            terms[token] += FIELD_WEIGHTS[field]
+    return terms
+
+
+async def unindex_journal(session: AsyncSession, journal_id: int) -> None:
+    await session.exec(delete(JournalSearchTerm).where(JournalSearchTerm.journal_id == journal_id))
+    await session.exec(delete(JournalSearchDocument).where(JournalSearchDocument.journal_id == journal_id))
+
+
+async def index_journal(session: AsyncSession, journal: Journal) -> None:
+    """Replace the postings of `journal`; private and deleted journals are dropped from the index.
+
+    The caller owns the transaction; `journal` must already have an id.
+    """
+    await unindex_journal(session, journal.id)
+    if journal.is_private or journal.is_deleted:
+        return
+    tags = (
+        await session.exec(
+            select(Tag.name)
+            .join(JournalTags, JournalTags.tag_id == Tag.id)
+            .where(JournalTags.journal_id == journal.id)
+        )
+    ).all()
+    terms = _document_terms(journal, tags)
+    if not terms:
+        return
+    await session.exec(
+        insert(JournalSearchDocument).values(journal_id=journal.id, length=sum(terms.values()))
+    )
+    await session.exec(
+        insert(JournalSearchTerm),
+        params=[{"term": term, "journal_id": journal.id, "tf": tf} for term, tf in terms.items()],
+    )
+
+
+async def reindex_all(session_factory: async_sessionmaker[AsyncSession]) -> int:
+    """Rebuild the index for every journal in id order, one batch per transaction."""
+    last_id = 0
+    indexed = 0
+    while True:
+        async with session_factory() as session:
+            journals = (
+                await session.exec(
+                    select(Journal).where(Journal.id > last_id).order_by(Journal.id).limit(REINDEX_BATCH_SIZE)
+                )
+            ).all()
+            if not journals:
+                return indexed
+            for journal in journals:
+                await index_journal(session, journal)
+            await session.commit()
+        indexed += len(journals)
+        last_id = journals[-1].id
+
+
+class _CorpusStats:
+    def __init__(self):
+        self.documents = 0
+        self.average_length = 0.0
+        self._expires_at = 0.0
+
+    async def get(self, session: AsyncSession) -> tuple[int, float]:
+        if time.monotonic() >= self._expires_at:
+            count, average = (
+                await session.exec(
+                    select(func.count(), func.avg(JournalSearchDocument.length))
+                )
+            ).one()
+            self.documents, self.average_length = count or 0, float(average or 0.0)
+            self._expires_at = time.monotonic() + STATS_TTL_SECONDS
+        return self.documents, self.average_length
+
+
+corpus_stats = _CorpusStats()
+
+
+def _encode_cursor(score: float, journal_id: int, average_length: float, idf: dict[str, float]) -> str:
+    raw = json.dumps([score, journal_id, average_length, idf], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[float, int, float, dict[str, float]]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, journal_id, average_length, idf = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        idf = {str(term): float(weight) for term, weight in idf.items()}
+        if not idf:
+            raise ValueError("empty idf")
+        return float(score), int(journal_id), float(average_length), idf
+    except (ValueError, TypeError, AttributeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+async def _term_weights(session: AsyncSession, terms: list[str], documents: int) -> dict[str, float]:
+    document_frequencies = dict(
+        (
+            await session.exec(
+                select(JournalSearchTerm.term, func.count())
+                .where(JournalSearchTerm.term.in_(terms))
+                .group_by(JournalSearchTerm.term)
+            )
+        ).all()
+    )
+    rare = {term: df for term, df in document_frequencies.items() if df <= documents * COMMON_TERM_RATIO}
+    if rare:
+        document_frequencies = rare
+    return {
+        term: math.log(1 + (documents - df + 0.5) / (df + 0.5))
+        for term, df in document_frequencies.items()
+    }
+
+
+async def search_journals(
+    session: AsyncSession,
+    query: str,
+    cursor: Optional[str],
+    limit: int,
+    columns: Sequence,
+    visibility: Sequence,
+) -> tuple[list, Optional[str]]:
+    """BM25-ranked journals matching any term of `query`, best first.
+
+    `visibility` is the reader's `Viewer.journal_filter()`; it is applied in
+    the ranking query itself so hidden journals never take a slot on a page.
+
+    Cursors carry the average document length and term weights of the first
+    page so later pages are scored identically even if the index changes in
+    between.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    if not terms:
+        return [], None
+
+    if cursor:
+        after_score, after_id, average_length, idf = _decode_cursor(cursor)
+        idf = {term: weight for term, weight in idf.items() if term in terms}
+        if not idf:
+            return [], None
+    else:
+        documents, average_length = await corpus_stats.get(session)
+        if not documents:
+            return [], None
+        idf = await _term_weights(session, terms, documents)
+        if not idf:
+            return [], None
+
+    tf = JournalSearchTerm.tf
+    length_norm = K1 * (1 - B + B * JournalSearchDocument.length / literal(max(average_length, 1.0)))
+    score = func.sum(
+        case(idf, value=JournalSearchTerm.term, else_=0.0) * tf * (K1 + 1) / (tf + length_norm)
+    ).label("score")
+    ranked = (
+        select(JournalSearchTerm.journal_id, score)
+        .join(JournalSearchDocument, JournalSearchDocument.journal_id == JournalSearchTerm.journal_id)
+        .join(Journal, Journal.id == JournalSearchTerm.journal_id)
+        .where(JournalSearchTerm.term.in_(list(idf)), *visibility)
+        .group_by(JournalSearchTerm.journal_id)
+        .order_by(score.desc(), JournalSearchTerm.journal_id.desc())
+        .limit(limit)
+    )
+    if cursor:
+        ranked = ranked.having(
+            or_(score < after_score, and_(score == after_score, JournalSearchTerm.journal_id < after_id))
+        )
+    hits = (await session.exec(ranked)).all()
+    if not hits:
+        return [], None
+
+    rows = (await session.exec(select(*columns).where(Journal.id.in_([hit.journal_id for hit in hits])))).all()
+    by_id = {row.id: row for row in rows}
+    page = [by_id[hit.journal_id] for hit in hits if hit.journal_id in by_id]
+    next_page = None
+    if len(hits) == limit:
+        last = hits[-1]
+        next_page = _encode_cursor(float(last.score), last.journal_id, average_length, idf)
+    return page, next_page
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    from dotenv import load_dotenv
+
+    from db.sqlmodel import create_async_engine_from_env, create_async_session_factory, dispose_async_engine
+
+    async def _main() -> None:
+        load_dotenv()
+        engine = create_async_engine_from_env()
+        try:
+            indexed = await reindex_all(create_async_session_factory(engine))
+            print(f"Indexed {indexed} journals")
+        finally:
+            await dispose_async_engine(engine)
+
+    asyncio.run(_main())
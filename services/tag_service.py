@@ -0,0 +1,201 @@
+import asyncio
+import heapq
+import logging
+import os
+import re
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db.upsert import upsert_rows
+from models.journal import Journal, JournalTags, Tag
+
+logger = logging.getLogger("app.tags")
+
+
+def _get_int_env(name: str, default_value: int) -> int:
+    try:
+        return int(os.getenv(name, str(default_value)))
+    except ValueError:
+        return default_value
+
+
+TRENDING_WINDOW_SECONDS = _get_int_env("TRENDING_WINDOW_SECONDS", 86400)
+TRENDING_BUCKET_SECONDS = _get_int_env("TRENDING_BUCKET_SECONDS", 300)
+# Each worker keeps its own window; a periodic resync from the database folds
+# in tags recorded by other workers and drops journals since hidden or deleted.
+TRENDING_RESYNC_SECONDS = _get_int_env("TRENDING_RESYNC_SECONDS", 300)
+
+_WHITESPACE = re.compile(r"\s+")
+TAG_MAX_LENGTH = 100
+
+
+def normalize_tag(raw: str) -> str:
+    """Canonical dictionary form of a tag: trimmed, without a leading '#', lowercased."""
+    name = _WHITESPACE.sub(" ", raw.strip().lstrip("#").strip()).lower()
+    if not name or len(name) > TAG_MAX_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tag must be 1-{TAG_MAX_LENGTH} characters",
+        )
+    return name
+
+
+async def get_or_create_tag_ids(session: AsyncSession, names: Iterable[str]) -> dict[str, int]:
+    """Ids of the dictionary rows for already normalized `names`, inserting the new ones."""
+    names = set(names)
+    if not names:
+        return {}
+    known = dict((await session.exec(select(Tag.name, Tag.id).where(Tag.name.in_(names)))).all())
+    missing = names - known.keys()
+    if not missing:
+        return known
+    # Concurrent creators race on uq_tags_name; the loser's row is left as it was.
+    now = datetime.utcnow()
+    await upsert_rows(session, Tag, [{"name": name, "created_at": now} for name in sorted(missing)], ("name",))
+    known.update((await session.exec(select(Tag.name, Tag.id).where(Tag.name.in_(missing)))).all())
+    return known
+
+
+async def get_or_create_tag_id(session: AsyncSession, name: str) -> int:
+    """Id of the dictionary row for an already normalized `name`, inserting it if new."""
+    return (await get_or_create_tag_ids(session, [name]))[name]
+
+
+class TrendingTags:
+    """Tag-use counts over a sliding time window, maintained incrementally.
+
+    Uses are counted into fixed-width buckets; a running total per tag is
+    kept alongside, so recording is O(1) and expiring a bucket only touches
+    the tags used during it. `top` selects from the running totals, which
+    hold only tags used inside the window.
+    """
+
+    def __init__(self, window_seconds: int, bucket_seconds: int):
+        self.bucket_seconds = max(1, bucket_seconds)
+        self.bucket_count = max(1, window_seconds // self.bucket_seconds)
+        self._buckets: deque[tuple[int, Counter]] = deque()
+        self._totals: Counter = Counter()
+        self._names: dict[int, str] = {}
+
+    def _bucket(self, at: float) -> int:
+        return int(at // self.bucket_seconds)
+
+    def _expire(self, now_bucket: int) -> None:
+        oldest = now_bucket - self.bucket_count + 1
+        while self._buckets and self._buckets[0][0] < oldest:
+            _, counts = self._buckets.popleft()
+            for tag_id, count in counts.items():
+                remaining = self._totals[tag_id] - count
+                if remaining > 0:
+                    self._totals[tag_id] = remaining
+                else:
+                    del self._totals[tag_id]
+                    self._names.pop(tag_id, None)
+
+    def record(self, tag_id: int, name: str, at: Optional[float] = None) -> None:
+        bucket = self._bucket(time.time() if at is None else at)
+        self._expire(bucket)
+        if not self._buckets or self._buckets[-1][0] < bucket:
+            self._buckets.append((bucket, Counter()))
+        self._buckets[-1][1][tag_id] += 1
+        self._totals[tag_id] += 1
+        self._names[tag_id] = name
+
+    def top(self, limit: int) -> list[tuple[str, int]]:
+        self._expire(self._bucket(time.time()))
+        ranked = heapq.nlargest(limit, self._totals.items(), key=lambda item: (item[1], -item[0]))
+        return [(self._names[tag_id], count) for tag_id, count in ranked]
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        """Replace the window with counts aggregated from the database."""
+        since = datetime.utcnow() - timedelta(seconds=self.bucket_count * self.bucket_seconds)
+        rows = (
+            await session.exec(
+                select(JournalTags.tag_id, Tag.name, JournalTags.created_at)
+                .join(Tag, Tag.id == JournalTags.tag_id)
+                .join(Journal, Journal.id == JournalTags.journal_id)
+                .where(
+                    JournalTags.created_at >= since,
+                    Journal.is_private == False,
+                    Journal.is_deleted == False,
+                )
+                .order_by(JournalTags.created_at)
+            )
+        ).all()
+        buckets: dict[int, Counter] = {}
+        names: dict[int, str] = {}
+        for tag_id, name, created_at in rows:
+            # created_at is naive UTC like every timestamp in the schema.
+            at = (created_at - datetime(1970, 1, 1)).total_seconds()
+            buckets.setdefault(self._bucket(at), Counter())[tag_id] += 1
+            names[tag_id] = name
+        totals: Counter = Counter()
+        for counts in buckets.values():
+            totals.update(counts)
+        self._buckets = deque(sorted(buckets.items()))
+        self._totals = totals
+        self._names = names
+        self._expire(self._bucket(time.time()))
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "window_seconds": self.bucket_count * self.bucket_seconds,
+            "bucket_seconds": self.bucket_seconds,
+            "buckets": len(self._buckets),
+            "tags": len(self._totals),
+        }
+
+
+trending_tags = TrendingTags(TRENDING_WINDOW_SECONDS, TRENDING_BUCKET_SECONDS)
+
+
+def record_tag_use(journal: Journal, tag_id: int, name: str) -> None:
+    if journal.is_private or journal.is_deleted:
+        return
+    trending_tags.record(tag_id, name)
+
+
+class TrendingTagsResync:
+    """Background task that seeds `trending_tags` and periodically rebuilds it."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], interval_seconds: int):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def resync(self) -> None:
+        async with self.session_factory() as session:
+            await trending_tags.rebuild(session)
+
+    async def start(self) -> None:
+        try:
+            await self.resync()
+        except Exception:
+            logger.exception("trending tags seeding failed")
+        if self.interval_seconds > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.resync()
+            except Exception:
+                logger.exception("trending tags resync failed")
@@ -0,0 +1,134 @@
+import os
+from dataclasses import dataclass
+from typing import Annotated, Optional
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import or_, union
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db.sqlmodel import get_async_session
+from models.journal import Journal
+from models.social import UserBlocks
+from models.user import User
+from security.dependencies import get_optional_user
+from security.principal_cache import AuthPrincipal, TTLCache
+
+
+def _get_int_env(name: str, default_value: int) -> int:
+    try:
+        return int(os.getenv(name, str(default_value)))
+    except ValueError:
+        return default_value
+
+
+# Block sets are cached per worker; block and unblock invalidate the local copy
+# immediately, other workers pick the change up within the TTL.
+VISIBILITY_CACHE_MAXSIZE = _get_int_env("VISIBILITY_CACHE_MAXSIZE", 10000)
+VISIBILITY_CACHE_TTL_SECONDS = _get_int_env("VISIBILITY_CACHE_TTL_SECONDS", 60)
+
+
+async def load_block_set(session: AsyncSession, user_id: int) -> frozenset[int]:
+    """Users `user_id` has blocked or been blocked by, in one query over both block indexes."""
+    blocked = select(UserBlocks.blocked_id).where(UserBlocks.blocker_id == user_id)
+    blocked_by = select(UserBlocks.blocker_id).where(UserBlocks.blocked_id == user_id)
+    return frozenset((await session.exec(union(blocked, blocked_by))).scalars().all())
+
+
+class BlockSetCache:
+    """In-process cache of `load_block_set` results keyed by user id."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.entries: TTLCache[frozenset[int]] = TTLCache(maxsize, ttl_seconds)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get(self, session: AsyncSession, user_id: int) -> frozenset[int]:
+        block_set = self.entries.get(user_id)
+        if block_set is not None:
+            self.hits += 1
+            return block_set
+        self.misses += 1
+        block_set = await load_block_set(session, user_id)
+        self.entries.set(user_id, block_set)
+        return block_set
+
+    def invalidate(self, *user_ids: int) -> None:
+        for user_id in user_ids:
+            self.entries.pop(user_id)
+        self.invalidations += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "size": len(self.entries),
+        }
+
+
+block_sets = BlockSetCache(VISIBILITY_CACHE_MAXSIZE, VISIBILITY_CACHE_TTL_SECONDS)
+
+
+def invalidate_blocks(blocker_id: int, blocked_id: int) -> None:
+    """Drop both users' cached block sets; call after a block or unblock is committed."""
+    block_sets.invalidate(blocker_id, blocked_id)
+
+
+@dataclass(frozen=True, slots=True)
+class Viewer:
+    """Who is reading: an authenticated user with their block set, or anonymous."""
+
+    user_id: Optional[int] = None
+    hidden_authors: frozenset[int] = frozenset()
+
+    def journal_filter(self) -> tuple:
+        """WHERE clauses limiting journals to those this viewer may read.
+
+        Deleted journals are hidden, private ones are visible only to their
+        author, and authors on either side of a block with the viewer are
+        hidden. The block set is inlined as an IN list, so the check costs
+        nothing per row beyond the comparison.
+        """
+        if self.user_id is None:
+            return (Journal.is_deleted == False, Journal.is_private == False)
+        clauses = [
+            Journal.is_deleted == False,
+            or_(Journal.is_private == False, Journal.user_id == self.user_id),
+        ]
+        if self.hidden_authors:
+            clauses.append(Journal.user_id.not_in(self.hidden_authors))
+        return tuple(clauses)
+
+
+async def get_viewer(
+    current_user: Annotated[Optional[AuthPrincipal], Depends(get_optional_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+) -> Viewer:
+    # Block sets are read from the primary: a lagging replica could otherwise
+    # re-cache a block set from before the block was made.
+    if current_user is None:
+        return Viewer()
+    return Viewer(current_user.id, await block_sets.get(session, current_user.id))
+
+
+async def require_visible_journal(session: AsyncSession, viewer: Viewer, journal_id: int) -> None:
+    """404 unless `viewer` may read `journal_id`; for routes serving a journal's sub-resources.
+
+    Journals the caller may not see are indistinguishable from missing ones.
+    """
+    found = (
+        await session.exec(select(Journal.id).where(Journal.id == journal_id, *viewer.journal_filter()))
+    ).first()
+    if found is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Journal not found")
+
+
+async def require_visible_user(session: AsyncSession, viewer: Viewer, user_id: int) -> None:
+    """404 unless `user_id` exists and is not on either side of a block with `viewer`."""
+    found = None
+    if user_id not in viewer.hidden_authors:
+        found = (await session.exec(select(User.id).where(User.id == user_id))).first()
+    if found is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
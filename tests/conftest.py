@@ -0,0 +1,100 @@
+import asyncio
+import itertools
+import os
+import tempfile
+
+# Settings are read at import time, so the test environment is set up before
+# any application module is imported.
+_scratch = tempfile.mkdtemp(prefix="grateful-heart-tests-")
+os.environ.setdefault("JWT_SECRET", "test-secret-" + "x" * 32)
+os.environ.setdefault("MAIL_TRANSPORT", "file")
+os.environ.setdefault("MAIL_FILE_DIR", os.path.join(_scratch, "mail"))
+os.environ.setdefault("ENGAGEMENT_WAL_DIR", os.path.join(_scratch, "wal"))
+os.environ.setdefault("OTP_STORE_URL", "")
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from db.migrate import create_all_and_stamp
+from db.profiler import install_query_profiler, profile_queries
+from db.sqlmodel import create_async_engine_from_env, dispose_async_engine
+from middleware.compression import response_compressor
+from models.user import User
+from security.jwt import create_access_token
+from security.principal_cache import principal_cache
+from services.search_service import corpus_stats
+from services.visibility_service import block_sets
+
+
+async def _create_schema() -> None:
+    engine = create_async_engine_from_env()
+    try:
+        await create_all_and_stamp(engine)
+    finally:
+        await dispose_async_engine(engine)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """The application against a fresh SQLite database created from the models."""
+    monkeypatch.setenv("DB_ASYNC_URL", f"sqlite+aiosqlite:///{tmp_path / 'test.sqlite'}")
+    asyncio.run(_create_schema())
+    principal_cache.clear()
+    block_sets.entries.clear()
+    monkeypatch.setattr(corpus_stats, "_expires_at", 0.0)
+    response_compressor.cache = type(response_compressor.cache)(response_compressor.cache.max_bytes)
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def run_db(client):
+    """Call `fn(session)` on the app's event loop with a primary session and return its result."""
+
+    async def _call(fn):
+        async with client.app.state.async_session_factory() as session:
+            return await fn(session)
+
+    return lambda fn: client.portal.call(_call, fn)
+
+
+@pytest.fixture
+def make_user(run_db):
+    """Insert a user directly (skipping bcrypt) and return `(user_id, auth_headers)`."""
+    numbers = itertools.count(1)
+
+    def _make(name: str = "") -> tuple[int, dict[str, str]]:
+        number = next(numbers)
+
+        async def insert(session):
+            user = User(email=f"user{number}@example.com", name=name or f"User {number}", password_hash="!")
+            session.add(user)
+            await session.commit()
+            return user.id
+
+        user_id = run_db(insert)
+        return user_id, {"Authorization": f"Bearer {create_access_token(str(user_id))}"}
+
+    return _make
+
+
+@pytest.fixture
+def profiled_request(client):
+    """`profiled_request(method, url, **kwargs) -> (response, QueryProfile)` for per-route query budgets.
+
+    The request is sent from a task on the app's loop so the profile's
+    context variable is visible to the queries the handler runs. The profile
+    keeps each statement with its parameters in `statements`.
+    """
+    install_query_profiler(client.app.state.async_engine.sync_engine)
+
+    async def _request(method, url, kwargs):
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+            with profile_queries(f"{method} {url}", capture=True) as profile:
+                response = await async_client.request(method, url, **kwargs)
+        return response, profile
+
+    return lambda method, url, **kwargs: client.portal.call(_request, method, url, kwargs)
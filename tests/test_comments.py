@@ -0,0 +1,76 @@
+import asyncio
+import sqlite3
+
+import httpx
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from middleware.exception_handlers import is_unique_violation
+
+
+def _journal(client, headers):
+    response = client.post("/journals/", json={"title": "t", "html_content": "<p>x</p>"}, headers=headers)
+    return response.json()["data"]["id"]
+
+
+def _comments_count(client, headers, journal_id):
+    return client.get(f"/journals/{journal_id}", headers=headers).json()["data"]["comments_count"]
+
+
+def test_concurrent_deletes_decrement_counter_once(client, make_user):
+    _, headers = make_user()
+    journal_id = _journal(client, headers)
+    for text in ("first", "second"):
+        client.post("/comments/", json={"journal_id": journal_id, "text": text}, headers=headers)
+    comment_id = client.get(f"/comments/{journal_id}").json()["data"][0]["id"]
+    assert _comments_count(client, headers, journal_id) == 2
+
+    async def delete_twice():
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            return await asyncio.gather(
+                *(async_client.delete(f"/comments/{comment_id}", headers=headers) for _ in range(2))
+            )
+
+    responses = client.portal.call(delete_twice)
+    assert [response.status_code for response in responses] == [200, 200]
+    assert _comments_count(client, headers, journal_id) == 1
+
+
+def _integrity_error(statement: str) -> IntegrityError:
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)")
+    connection.execute("INSERT INTO t (id, name) VALUES (1, 'a')")
+    with pytest.raises(sqlite3.IntegrityError) as error:
+        connection.execute(statement)
+    return IntegrityError(statement, {}, error.value)
+
+
+def test_only_unique_violations_are_conflicts():
+    assert is_unique_violation(_integrity_error("INSERT INTO t (id, name) VALUES (2, 'a')"))
+    assert is_unique_violation(_integrity_error("INSERT INTO t (id, name) VALUES (1, 'b')"))
+    assert not is_unique_violation(_integrity_error("INSERT INTO t (id, name) VALUES (3, NULL)"))
+
+
+
+def test_comments_need_a_journal_the_author_can_read(client, make_user):
+    owner_id, owner = make_user()
+    reader_id, reader = make_user()
+    public = _journal(client, owner)
+    private = client.post(
+        "/journals/", json={"title": "p", "html_content": "<p>x</p>", "is_private": True}, headers=owner
+    ).json()["data"]["id"]
+    deleted = _journal(client, owner)
+    client.delete(f"/journals/{deleted}", headers=owner)
+
+    def comment(journal_id, headers):
+        return client.post("/comments/", json={"journal_id": journal_id, "text": "hi"}, headers=headers).status_code
+
+    assert comment(999, reader) == 404
+    assert comment(deleted, reader) == 404
+    assert comment(private, reader) == 404
+    assert comment(private, owner) == 200
+    client.post("/social/block", json={"blocked_id": reader_id}, headers=owner)
+    assert comment(public, reader) == 404
+    assert comment(public, owner) == 200
+    assert _comments_count(client, owner, public) == 1
@@ -0,0 +1,105 @@
+from typing import Annotated
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from middleware.compression import CompressionMiddleware, ResponseCompressor
+from middleware.http_cache import ConditionalGet, NotModified, Validators, etag_for, not_modified_handler
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def _app() -> tuple[FastAPI, ResponseCompressor]:
+    app = FastAPI()
+    app.add_exception_handler(NotModified, not_modified_handler)
+    compressor = ResponseCompressor(cache_bytes=1024 * 1024)
+    app.add_middleware(CompressionMiddleware, min_bytes=100, compressor=compressor)
+
+    @app.get("/doc")
+    def doc(validators: Annotated[Validators, Depends(ConditionalGet("private, no-cache"))], fields: str = "all"):
+        # The ETag only tracks the row, like the journal routes; `fields` picks the body.
+        validators.check(etag=etag_for("row", 1))
+        return {"fields": fields, "text": fields * 200}
+
+    @app.get("/small")
+    def small(validators: Annotated[Validators, Depends(ConditionalGet("private, no-cache"))]):
+        validators.check(etag=etag_for("small"))
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((b"chunk " * 100 for _ in range(3)), media_type="text/plain")
+
+    @app.get("/text")
+    def text():
+        return PlainTextResponse("hello " * 100)
+
+    return app, compressor
+
+
+def test_compressed_body_is_reused_for_the_same_request():
+    app, compressor = _app()
+    client = TestClient(app)
+    first = client.get("/doc", headers=GZIP)
+    second = client.get("/doc", headers=GZIP)
+    assert first.headers["content-encoding"] == "gzip"
+    assert second.json() == first.json()
+    assert compressor.stats()["compressed"] == 1 and compressor.stats()["cache_hits"] == 1
+
+
+def test_query_string_is_part_of_the_cache_key():
+    app, compressor = _app()
+    client = TestClient(app)
+    first = client.get("/doc", params={"fields": "a"}, headers=GZIP)
+    second = client.get("/doc", params={"fields": "b"}, headers=GZIP)
+    assert first.headers["etag"] == second.headers["etag"]
+    assert first.json()["fields"] == "a" and second.json()["fields"] == "b"
+    assert compressor.stats()["cache_hits"] == 0
+
+
+def test_not_modified_repeats_the_weak_etag():
+    app, _ = _app()
+    client = TestClient(app)
+    for path in ("/doc", "/small"):
+        etag = client.get(path, headers=GZIP).headers["etag"]
+        assert etag.startswith("W/")
+        response = client.get(path, headers={**GZIP, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+
+
+def test_identity_clients_keep_the_strong_etag():
+    app, _ = _app()
+    client = TestClient(app)
+    response = client.get("/doc", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert not response.headers["etag"].startswith("W/")
+
+
+def test_streaming_responses_pass_through():
+    app, compressor = _app()
+    client = TestClient(app)
+    response = client.get("/stream", headers=GZIP)
+    assert "content-encoding" not in response.headers
+    assert response.content == b"chunk " * 300
+    assert compressor.stats()["compressed"] == 0
+
+
+def test_bodies_below_the_threshold_are_sent_as_is():
+    app, compressor = _app()
+    client = TestClient(app)
+    response = client.get("/small", headers=GZIP)
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == {"ok": True}
+    assert compressor.stats()["skipped_small"] == 1
+
+
+def test_text_is_gzipped():
+    app, _ = _app()
+    client = TestClient(app)
+    response = client.get("/text", headers=GZIP)
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len("hello " * 100)
+    assert response.text == "hello " * 100
@@ -0,0 +1,99 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from models.journal import Journal
+from services.content_service import ContentProcessor, process_content, reprocess_all
+
+LONG_AGO = datetime(2020, 1, 1)
+
+
+def _journal(client, headers, html):
+    response = client.post("/journals/", json={"title": "t", "html_content": html}, headers=headers)
+    return response.json()["data"]["id"]
+
+
+def test_reprocessing_bumps_updated_at_only_when_output_changes(client, run_db, make_user):
+    _, headers = make_user()
+    clean = _journal(client, headers, "<p>already clean</p>")
+    stale = _journal(client, headers, "<p>placeholder</p>")
+
+    async def age(session):
+        # Content stored before sanitizing existed.
+        await session.exec(
+            update(Journal).where(Journal.id == stale).values(html_content="<p>hi</p><script>x</script>")
+        )
+        await session.exec(update(Journal).values(updated_at=LONG_AGO))
+        await session.commit()
+
+    run_db(age)
+    etag = client.get(f"/journals/{stale}").headers["ETag"]
+
+    assert client.portal.call(reprocess_all, client.app.state.async_session_factory) == 2
+
+    async def updated_at(session):
+        return {journal.id: journal.updated_at for journal in (await session.exec(Journal.__table__.select())).all()}
+
+    stamps = run_db(updated_at)
+    assert stamps[clean] == LONG_AGO
+    assert stamps[stale] > LONG_AGO
+    response = client.get(f"/journals/{stale}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "<script>" not in response.json()["data"]["html_content"]
+
+
+BARE_LINK = '<a rel="nofollow noopener noreferrer">x</a>'
+
+
+@pytest.mark.parametrize(
+    "html, expected",
+    [
+        # Unsafe URL schemes, however they are spelled, lose the attribute.
+        ('<a href="javascript:alert(1)">x</a>', BARE_LINK),
+        ('<a href=" JAVASCRIPT:alert(1)">x</a>', BARE_LINK),
+        ('<a href="&#106;avascript:alert(1)">x</a>', BARE_LINK),
+        ('<a href="java&#x09;script:alert(1)">x</a>', BARE_LINK),
+        ('<a href="javascript&colon;alert(1)">x</a>', BARE_LINK),
+        ('<a href="data:text/html,x">x</a>', BARE_LINK),
+        ('<img src="data:image/svg+xml;base64,AAAA">', "<img>"),
+        # Event handlers and other attributes outside the allowlist.
+        ('<p onclick="alert(1)" onmouseover=x style="color:red">hi</p>', "<p>hi</p>"),
+        ("<img src=x onerror=alert(1)>", "<img>"),
+        # Dropped elements take their content with them.
+        ("<script>alert(1)</script>ok", "ok"),
+        ("<style>body{display:none}</style>ok", "ok"),
+        ("<svg><script>alert(1)</script></svg>ok", "ok"),
+        ("<svg/onload=alert(1)>after", ""),
+        ('<iframe src="https://example.com"></iframe>ok', "ok"),
+        ("<script>never closed", ""),
+        ("<!-- <script>alert(1)</script> -->ok", "ok"),
+        # Output stays well nested.
+        ("<b><i>x</b> y", "<b><i>x</i></b> y"),
+        ("<p>unclosed <b>bold", "<p>unclosed <b>bold</b></p>"),
+        ("</p>stray", "stray"),
+        # Escaped markup stays escaped, and attribute values cannot break out.
+        ("&lt;script&gt;alert(1)&lt;/script&gt;", "&lt;script&gt;alert(1)&lt;/script&gt;"),
+        (
+            """<a href="https://x.example" title='"><script>'>x</a>""",
+            '<a href="https://x.example" title="&quot;&gt;&lt;script&gt;" rel="nofollow noopener noreferrer">x</a>',
+        ),
+        (
+            '<a href="https://x.example/a?b=1&amp;c=2">l</a>',
+            '<a href="https://x.example/a?b=1&amp;c=2" rel="nofollow noopener noreferrer">l</a>',
+        ),
+    ],
+)
+def test_sanitizer(html, expected):
+    assert process_content(html).html == expected
+
+
+def test_large_documents_are_sanitized_in_the_worker_pool():
+    processor = ContentProcessor(max_workers=1, pool_min_bytes=0, max_bytes=1024)
+    try:
+        content = asyncio.run(processor.process("<p onclick=x>two words</p><script>x</script>"))
+    finally:
+        processor.shutdown()
+    assert processor.stats()["pooled"] == 1
+    assert (content.html, content.word_count) == ("<p>two words</p>", 2)
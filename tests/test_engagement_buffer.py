@@ -0,0 +1,118 @@
+import json
+
+from sqlmodel import select
+
+from models.journal import Journal, JournalFavorites, JournalReactions
+from services.engagement_buffer import EngagementBuffer, EngagementEvent, default_idempotency_key
+
+
+def _journal(client, headers):
+    response = client.post("/journals/", json={"title": "t", "html_content": "<p>x</p>"}, headers=headers)
+    return response.json()["data"]["id"]
+
+
+def _reaction(journal_id, user_id, reaction_type="heart"):
+    return EngagementEvent(
+        kind="reaction",
+        journal_id=journal_id,
+        user_id=user_id,
+        reaction_type=reaction_type,
+        idempotency_key=default_idempotency_key("reaction", journal_id, user_id, reaction_type),
+    )
+
+
+def _counts(run_db, journal_id):
+    async def read(session):
+        journal = (await session.exec(select(Journal).where(Journal.id == journal_id))).one()
+        reactions = (await session.exec(select(JournalReactions).where(JournalReactions.journal_id == journal_id))).all()
+        return journal.reactions_count, journal.favorites_count, len(reactions)
+
+    return run_db(read)
+
+
+def _buffer(client, wal_dir):
+    return EngagementBuffer(client.app.state.async_session_factory, str(wal_dir), 1000, 60_000)
+
+
+def test_acknowledged_events_survive_a_crash(client, run_db, make_user, tmp_path):
+    user_id, headers = make_user()
+    journal_id = _journal(client, headers)
+    crashed = _buffer(client, tmp_path)
+    client.portal.call(crashed.start)
+    for reaction_type in ("heart", "smile"):
+        assert client.portal.call(crashed.submit, _reaction(journal_id, user_id, reaction_type))
+    # The process dies before flushing: its task stops and its file locks are released.
+    client.portal.call(crashed._task.cancel)
+    crashed._segment.close()
+    assert _counts(run_db, journal_id) == (0, 0, 0)
+
+    recovered = _buffer(client, tmp_path)
+    client.portal.call(recovered.start)
+    client.portal.call(recovered.stop)
+    assert _counts(run_db, journal_id) == (2, 0, 2)
+    assert list(tmp_path.glob("*.wal")) == []
+
+
+def test_replaying_already_written_events_does_not_double_count(client, run_db, make_user, tmp_path):
+    user_id, headers = make_user()
+    journal_id = _journal(client, headers)
+    events = [_reaction(journal_id, user_id, "heart"), _reaction(journal_id, user_id, "smile")]
+    buffer = _buffer(client, tmp_path)
+    client.portal.call(buffer.start)
+    for event in events:
+        client.portal.call(buffer.submit, event)
+    client.portal.call(buffer.stop)
+    assert _counts(run_db, journal_id) == (2, 0, 2)
+
+    # A worker that committed a flush but died before deleting its segment.
+    segment = tmp_path / "0-0.wal"
+    segment.write_text("".join(json.dumps(event.__dict__) + "\n" for event in events))
+    replay = _buffer(client, tmp_path)
+    client.portal.call(replay.start)
+    client.portal.call(replay.submit, _reaction(journal_id, user_id, "clap"))
+    client.portal.call(replay.stop)
+    assert _counts(run_db, journal_id) == (3, 0, 3)
+
+
+def test_flush_applies_deltas_per_journal_and_kind(client, run_db, make_user, tmp_path):
+    user_id, headers = make_user()
+    other_id, _ = make_user()
+    first, second = _journal(client, headers), _journal(client, headers)
+    buffer = _buffer(client, tmp_path)
+    client.portal.call(buffer.start)
+    for event in (
+        _reaction(first, user_id),
+        _reaction(first, other_id),
+        _reaction(second, user_id),
+        EngagementEvent(kind="favorite", journal_id=second, user_id=other_id, idempotency_key="favorite:x"),
+    ):
+        client.portal.call(buffer.submit, event)
+    client.portal.call(buffer.stop)
+    assert _counts(run_db, first) == (2, 0, 2)
+    assert _counts(run_db, second) == (1, 1, 1)
+
+    async def favorites(session):
+        return len((await session.exec(select(JournalFavorites))).all())
+
+    assert run_db(favorites) == 1
+
+
+def test_buffered_write_to_missing_journal_is_rejected(client, make_user, tmp_path):
+    _, headers = make_user()
+    buffer = _buffer(client, tmp_path)
+    client.portal.call(buffer.start)
+    client.app.state.engagement_buffer = buffer
+    try:
+        response = client.post(
+            "/journals/journal-reactions", json={"journal_id": 999, "reaction_type": "heart"}, headers=headers
+        )
+        assert response.status_code == 404
+        journal_id = _journal(client, headers)
+        response = client.post(
+            "/journals/journal-reactions", json={"journal_id": journal_id, "reaction_type": "heart"}, headers=headers
+        )
+        assert response.status_code == 202
+    finally:
+        client.app.state.engagement_buffer = None
+        client.portal.call(buffer.stop)
+    assert buffer.stats()["pending"] == 0
@@ -0,0 +1,57 @@
+import services.feed_service as feed_service
+
+
+def _feed_ids(client, headers):
+    response = client.get("/feed/", headers=headers)
+    assert response.status_code == 200, response.text
+    return [journal["id"] for journal in response.json()["data"]]
+
+
+def _create_journal(client, headers, title):
+    response = client.post("/journals/", json={"title": title, "html_content": "<p>x</p>"}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["data"]["id"]
+
+
+def test_pushed_journals_reach_followers(client, make_user):
+    author_id, author = make_user()
+    _, follower = make_user()
+    assert client.post("/social/follow", json={"following_id": author_id}, headers=follower).status_code == 200
+    journal_id = _create_journal(client, author, "pushed")
+    assert _feed_ids(client, follower) == [journal_id]
+
+
+def test_journals_written_in_pull_mode_survive_switch_back_to_push(client, make_user, monkeypatch):
+    monkeypatch.setattr(feed_service, "FANOUT_MAX_FOLLOWERS", 1)
+    author_id, author = make_user()
+    _, follower = make_user()
+    _, other = make_user()
+    before = _create_journal(client, author, "before")
+    client.post("/social/follow", json={"following_id": author_id}, headers=follower)
+    client.post("/social/follow", json={"following_id": author_id}, headers=other)
+    # Two followers is over the threshold: this journal is pulled, not pushed.
+    during = _create_journal(client, author, "during")
+    assert _feed_ids(client, follower) == [during, before]
+
+    # Back at the threshold the author is no longer pulled.
+    assert client.delete(f"/social/unfollow/{author_id}", headers=other).status_code == 200
+    after = _create_journal(client, author, "after")
+    assert _feed_ids(client, follower) == [after, during, before]
+    assert _feed_ids(client, other) == []
+
+
+def test_feed_applies_the_viewer_filter_in_push_and_pull_modes(client, make_user, monkeypatch):
+    author_id, author = make_user()
+    follower_id, follower = make_user()
+    client.post("/social/follow", json={"following_id": author_id}, headers=follower)
+    pushed = _create_journal(client, author, "pushed")
+    client.post("/journals/", json={"title": "private", "is_private": True}, headers=author)
+    monkeypatch.setattr(feed_service, "FANOUT_MAX_FOLLOWERS", 0)
+    pulled = _create_journal(client, author, "pulled")
+    assert _feed_ids(client, follower) == [pulled, pushed]
+
+    # The author blocks the follower: both sources disappear at once.
+    assert client.post("/social/block", json={"blocked_id": follower_id}, headers=author).status_code == 200
+    assert _feed_ids(client, follower) == []
+    assert client.delete(f"/social/unblock/{follower_id}", headers=author).status_code == 200
+    assert _feed_ids(client, follower) == [pulled, pushed]
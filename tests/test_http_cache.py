@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Annotated
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from middleware.http_cache import ConditionalGet, NotModified, Validators, etag_for, not_modified_handler
+
+MODIFIED = datetime(2024, 5, 1, 12, 0, 0)
+
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_exception_handler(NotModified, not_modified_handler)
+
+    @app.get("/resource")
+    def resource(validators: Annotated[Validators, Depends(ConditionalGet("private, no-cache"))]):
+        validators.check(etag=etag_for("resource", MODIFIED), last_modified=MODIFIED)
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def _journal(client, headers) -> int:
+    response = client.post("/journals/", json={"title": "t", "html_content": "<p>x</p>"}, headers=headers)
+    return response.json()["data"]["id"]
+
+
+def test_if_none_match_turns_a_200_into_a_304():
+    client = _client()
+    first = client.get("/resource")
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+    second = client.get("/resource", headers={"If-None-Match": f'"other", W/{first.headers["etag"]}'})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.headers["last-modified"] == first.headers["last-modified"]
+
+
+def test_if_modified_since():
+    client = _client()
+    assert client.get("/resource", headers={"If-Modified-Since": _http_date(MODIFIED)}).status_code == 304
+    earlier = _http_date(MODIFIED - timedelta(seconds=1))
+    assert client.get("/resource", headers={"If-Modified-Since": earlier}).status_code == 200
+    assert client.get("/resource", headers={"If-Modified-Since": "not a date"}).status_code == 200
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    client = _client()
+    headers = {"If-None-Match": '"stale"', "If-Modified-Since": _http_date(MODIFIED)}
+    assert client.get("/resource", headers=headers).status_code == 200
+
+
+def test_journal_etag_changes_with_its_counters(client, make_user):
+    _, headers = make_user()
+    journal_id = _journal(client, headers)
+    first = client.get(f"/journals/{journal_id}", headers=headers)
+    etag = first.headers["etag"]
+    assert client.get(f"/journals/{journal_id}", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    reaction = {"journal_id": journal_id, "reaction_type": "heart"}
+    assert client.post("/journals/journal-reactions", json=reaction, headers=headers).status_code == 200
+    changed = client.get(f"/journals/{journal_id}", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["data"]["reactions_count"] == 1
+
+
+def test_journal_is_not_revalidated_by_date_alone(client, make_user):
+    _, headers = make_user()
+    journal_id = _journal(client, headers)
+    response = client.get(f"/journals/{journal_id}", headers=headers)
+    assert "last-modified" not in response.headers
+    since = _http_date(datetime.utcnow() + timedelta(days=1))
+    assert client.get(f"/journals/{journal_id}", headers={**headers, "If-Modified-Since": since}).status_code == 200
@@ -0,0 +1,42 @@
+"""Worker boot must not pay for dependencies that are only needed later.
+
+`import main` runs in a fresh interpreter (this process has already imported
+everything) under `-X importtime`, which reports per-module cumulative times.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+# Loaded on first use: migrations, the Mailtrap client, password hashing, br compression.
+DEFERRED_MODULES = ("alembic", "mailtrap", "requests", "passlib", "brotli")
+# Generous next to the ~1.2 s measured locally, so only a new eager heavy import trips it.
+IMPORT_BUDGET_MS = int(os.getenv("IMPORT_TIME_BUDGET_MS", "3000"))
+
+
+def _import_main() -> tuple[list[str], dict[str, int]]:
+    """(deferred modules that got imported, cumulative microseconds per module)."""
+    script = f"import sys, main; print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=ROOT,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, micros, name = line.removeprefix("import time:").split("|")
+        cumulative[name.strip()] = int(micros)
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    return loaded, cumulative
+
+
+def test_main_defers_heavy_imports_and_stays_in_budget():
+    loaded, cumulative = _import_main()
+    assert loaded == []
+    assert cumulative["main"] / 1000 < IMPORT_BUDGET_MS, sorted(cumulative.items(), key=lambda item: -item[1])[:15]
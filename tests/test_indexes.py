@@ -0,0 +1,98 @@
+"""Queries the read routes actually send must be served by an index.
+
+Each route is called through `profiled_request`, and every SELECT it ran is
+explained with its own parameters on the test database (built from the same
+model metadata the MySQL migrations mirror). A table read in full shows up
+in the plan as a bare `SCAN <table>`; index scans say `USING ... INDEX`.
+"""
+import re
+
+import pytest
+
+from models.prompt import Prompts
+
+# `SCAN journals`, but not `SCAN journals USING INDEX ...` or `SCAN CONSTANT ROW`.
+_FULL_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)(\S+)$")
+# Whole-table reads that are intended, by table and a fragment of the statement.
+_EXPECTED_SCANS = {
+    # BM25 corpus size and average length; cached by `corpus_stats`, not run per request.
+    "journal_search_documents": "avg(journal_search_documents.length)",
+}
+
+ROUTES = [
+    "/journals/",
+    "/journals/?limit=2&cursor={cursor}",
+    "/journals/{journal_id}",
+    "/journals/search?q=garden",
+    "/journals/by-tag/calm",
+    "/journals/journal-tags/{journal_id}",
+    "/journals/journal-reactions/{journal_id}",
+    "/journals/journal-favorites",
+    "/comments/{journal_id}",
+    "/feed/",
+    "/prompts/",
+    "/prompts/user-prompts",
+]
+
+
+@pytest.fixture
+def seeded(client, run_db, make_user):
+    """(reader headers, values for the route templates) over a small social graph."""
+    author_id, author = make_user()
+    blocked_id, blocked = make_user()
+    _, reader = make_user()
+    assert client.post("/social/follow", json={"following_id": author_id}, headers=reader).status_code == 200
+    assert client.post("/social/block", json={"blocked_id": blocked_id}, headers=reader).status_code == 200
+    journal_ids = []
+    for number, headers in enumerate([author, author, author, blocked]):
+        journal = {"title": f"garden {number}", "html_content": "<p>secret garden notes</p>"}
+        journal_ids.append(client.post("/journals/", json=journal, headers=headers).json()["data"]["id"])
+    journal_id = journal_ids[0]
+    client.post("/journals/journal-tags", json={"journal_id": journal_id, "tag": "calm"}, headers=author)
+    client.post("/journals/journal-reactions", json={"journal_id": journal_id, "reaction_type": "heart"}, headers=reader)
+    client.post("/journals/journal-favorites", json={"journal_id": journal_id}, headers=reader)
+    client.post("/comments/", json={"journal_id": journal_id, "text": "lovely"}, headers=reader)
+    client.post("/prompts/user-prompts", json={"prompt_text": "what went well?"}, headers=reader)
+
+    async def add_prompt(session):
+        session.add(Prompts(text="three good things"))
+        await session.commit()
+
+    run_db(add_prompt)
+    cursor = client.get("/journals/", params={"limit": 2}, headers=reader).json()["next_cursor"]
+    assert cursor
+    return reader, {"journal_id": journal_id, "cursor": cursor}
+
+
+def _unexpected_scan(statement: str, plan_line: str) -> bool:
+    match = _FULL_SCAN.match(plan_line)
+    if match is None:
+        return False
+    expected = _EXPECTED_SCANS.get(match.group(1))
+    return expected is None or expected not in statement
+
+
+def _plans(client, statements) -> list[tuple[str, list[str]]]:
+    async def explain():
+        plans = []
+        async with client.app.state.async_engine.connect() as connection:
+            for statement, parameters in statements:
+                if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                    continue
+                rows = (await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)).all()
+                plans.append((statement, [row[-1] for row in rows]))
+        return plans
+
+    return client.portal.call(explain)
+
+
+@pytest.mark.parametrize("route", ROUTES)
+def test_route_queries_use_indexes(client, profiled_request, seeded, route):
+    headers, values = seeded
+    response, profile = profiled_request("GET", route.format(**values), headers=headers)
+    assert response.status_code == 200, response.text
+    plans = _plans(client, profile.statements)
+    assert plans, "route ran no SELECT"
+    for statement, plan in plans:
+        scans = [line for line in plan if _unexpected_scan(statement, line)]
+        assert not scans, f"{scans} in\n{statement}\n" + "\n".join(plan)
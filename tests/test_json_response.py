@@ -0,0 +1,38 @@
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from middleware.json_response import EnvelopeRoute, PreEncodedJSON
+from schemas.common import APIResponse
+
+
+class Item(BaseModel):
+    id: int
+    note: str | None = None
+
+
+class Row(Item):
+    secret: str
+
+
+def _app():
+    router = APIRouter(route_class=EnvelopeRoute)
+
+    @router.get("/item", response_model=APIResponse[Item], response_model_exclude_none=True)
+    async def item():
+        return APIResponse(message="ok", data=Row(id=1, secret="hidden"))
+
+    app = FastAPI()
+    app.include_router(router)
+    return app, router.routes[0]
+
+
+def test_response_model_is_encoded_by_its_type_adapter():
+    app, route = _app()
+    body = route.secure_cloned_response_field.serialize(APIResponse(message="ok", data=Item(id=1)), mode="json")
+    assert isinstance(body, PreEncodedJSON)
+
+    response = TestClient(app).get("/item")
+    assert response.status_code == 200
+    # Fields outside the response model are dropped and exclude_none is honoured.
+    assert response.json() == {"status": True, "message": "ok", "data": {"id": 1}}
@@ -0,0 +1,35 @@
+import json
+
+from sqlmodel import select
+
+from models.mail import MailOutbox
+from services.mail_service import FileTransport, MailOutboxWorker
+
+
+def _outbox(run_db):
+    async def read(session):
+        return (await session.exec(select(MailOutbox))).all()
+
+    return run_db(read)
+
+
+def test_otp_body_is_cleared_after_delivery(client, run_db, make_user, tmp_path):
+    make_user("Reset Me")
+    email = "user1@example.com"
+    response = client.post("/user/forget-password", json={"email": email})
+    assert response.status_code == 200
+    (queued,) = _outbox(run_db)
+    assert queued.status == "pending" and queued.text_body
+
+    worker = MailOutboxWorker(client.app.state.async_session_factory, FileTransport(str(tmp_path)))
+    assert client.portal.call(worker.drain_once) == 1
+
+    (delivered,) = _outbox(run_db)
+    assert delivered.status == "sent"
+    assert delivered.text_body == "" and delivered.html_body is None
+    (mail,) = tmp_path.glob("*.json")
+    otp = json.loads(mail.read_text())["text_body"].split("Your OTP is ")[1].split()[0]
+    response = client.post(
+        "/user/reset-password", json={"email": email, "otp": otp, "new_password": "a-new-password-1"}
+    )
+    assert response.status_code == 200, response.json()
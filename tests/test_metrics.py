@@ -0,0 +1,71 @@
+from collections import defaultdict
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from middleware.metrics import HttpMetrics, http_metrics
+from middleware.timing import TimingMiddleware
+
+
+@pytest.fixture
+def metrics(client, monkeypatch):
+    """The app's `http_metrics`, emptied for this test."""
+    monkeypatch.setattr(http_metrics, "requests", defaultdict(int))
+    monkeypatch.setattr(http_metrics, "durations", {})
+    return http_metrics
+
+
+def test_requests_are_labelled_by_route_template(client, metrics, make_user):
+    _, headers = make_user()
+    for journal_id in (123, 456):
+        assert client.get(f"/journals/{journal_id}", headers=headers).status_code == 404
+    assert metrics.requests == {("GET", "/journals/{journal_id}", "404"): 2}
+    assert sum(metrics.durations[("GET", "/journals/{journal_id}")].counts) == 2
+
+
+def test_unmatched_paths_share_one_series(client, metrics):
+    for path in ("/nope", "/nope/123", "/journals/1/unknown"):
+        assert client.get(path).status_code == 404
+    assert metrics.requests == {("GET", "unmatched", "404"): 3}
+
+
+def test_metrics_endpoint_renders_prometheus_text(client, metrics, make_user):
+    _, headers = make_user()
+    client.get("/journals/123", headers=headers)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/journals/{journal_id}",status="404"} 1' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/journals/{journal_id}"} 1' in body
+    assert "/journals/123" not in body
+    assert "# TYPE http_requests_in_flight gauge" in body
+    assert 'role="primary"' in body
+
+
+def test_unhandled_exceptions_are_recorded_as_500():
+    app = FastAPI()
+    metrics = HttpMetrics()
+    app.add_middleware(TimingMiddleware, metrics=metrics)
+
+    @app.get("/boom/{item_id}")
+    def boom(item_id: int):
+        raise RuntimeError("boom")
+
+    client = TestClient(app, raise_server_exceptions=False)
+    assert client.get("/boom/1").status_code == 500
+    assert metrics.requests == {("GET", "/boom/{item_id}", "500"): 1}
+    assert metrics.in_flight == 0
+
+
+def test_process_time_header_is_set():
+    app = FastAPI()
+    app.add_middleware(TimingMiddleware, metrics=HttpMetrics())
+
+    @app.get("/ok")
+    def ok():
+        return {"ok": True}
+
+    response = TestClient(app).get("/ok")
+    assert int(response.headers["x-process-time"]) >= 0
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import db.migrate
+import main
+from db.migrate import SchemaVersionError, alembic_config, check_schema_version, create_all_and_stamp, head_revision
+from db.sqlmodel import create_async_engine_from_env, dispose_async_engine
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+async def _with_engine(fn):
+    engine = create_async_engine_from_env()
+    try:
+        return await fn(engine)
+    finally:
+        await dispose_async_engine(engine)
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch) -> Path:
+    """Path of an empty SQLite database the app is configured to use."""
+    path = tmp_path / "schema.sqlite"
+    monkeypatch.setenv("DB_ASYNC_URL", f"sqlite+aiosqlite:///{path}")
+    return path
+
+
+@pytest.fixture
+def stale_database(database) -> Path:
+    """A database whose tables exist but whose recorded revision is one behind head."""
+    asyncio.run(_with_engine(create_all_and_stamp))
+    with sqlite3.connect(database) as connection:
+        connection.execute("UPDATE alembic_version SET version_num = 'a1d4e6f8b203'")
+    return database
+
+
+def _start_app() -> None:
+    with TestClient(main.app):
+        pass
+
+
+def test_head_revision_matches_alembic():
+    from alembic.script import ScriptDirectory
+
+    assert head_revision() == ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+@pytest.mark.parametrize("fixture", ["database", "stale_database"])
+def test_strict_check_refuses_to_start(request, monkeypatch, fixture):
+    request.getfixturevalue(fixture)
+    monkeypatch.setattr(db.migrate, "SCHEMA_CHECK", "strict")
+    expected = "none" if fixture == "database" else "a1d4e6f8b203"
+    with pytest.raises(SchemaVersionError, match=f"at revision {expected}, expected {head_revision()}"):
+        _start_app()
+
+
+def test_warn_check_logs_and_starts(stale_database, monkeypatch, caplog):
+    monkeypatch.setattr(db.migrate, "SCHEMA_CHECK", "warn")
+    with caplog.at_level(logging.WARNING, logger="app.schema"):
+        _start_app()
+    assert any("run `python -m db.migrate`" in record.getMessage() for record in caplog.records)
+
+
+def test_check_can_be_turned_off(stale_database, monkeypatch):
+    monkeypatch.setattr(db.migrate, "SCHEMA_CHECK", "off")
+    asyncio.run(_with_engine(check_schema_version))
+    _start_app()
+
+
+def _migrate_command(*args: str, **env: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", "db.migrate", *args],
+        cwd=ROOT,
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_create_all_command_leaves_a_database_that_passes_the_check(database, monkeypatch):
+    result = _migrate_command("--create-all")
+    assert result.stdout.strip() == f"Created tables at revision {head_revision()}"
+    monkeypatch.setattr(db.migrate, "SCHEMA_CHECK", "strict")
+    asyncio.run(_with_engine(check_schema_version))
+    _start_app()
+
+
+def test_migrate_command_renders_every_migration_for_mysql():
+    result = _migrate_command("--sql", DB_NAME="grateful_heart")
+    assert "CREATE TABLE alembic_version" in result.stdout
+    assert f"UPDATE alembic_version SET version_num='{head_revision()}'" in result.stdout
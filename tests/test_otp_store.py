@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from security.otp_store import InMemoryOTPStore, OTPStore, RedisConnection, RedisError
+
+
+async def _server(handler):
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_otp_store_requires_the_full_interface():
+    class Partial(OTPStore):
+        async def issue(self, email, otp):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial(60, 3, 3, 60)
+    InMemoryOTPStore(60, 3, 3, 60)
+
+
+def test_failed_auth_drops_the_connection():
+    async def scenario():
+        async def reject(reader, writer):
+            await reader.read(1024)
+            writer.write(b"-WRONGPASS invalid password\r\n")
+            await writer.drain()
+
+        server, port = await _server(reject)
+        async with server:
+            connection = RedisConnection(f"redis://:secret@127.0.0.1:{port}/0")
+            with pytest.raises(RedisError):
+                await connection.pipeline(("GET", "key"))
+            assert connection._writer is None
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_pipeline_drops_the_connection():
+    async def scenario():
+        async def silent(reader, writer):
+            await reader.read(1024)
+            await asyncio.sleep(10)
+
+        server, port = await _server(silent)
+        async with server:
+            connection = RedisConnection(f"redis://127.0.0.1:{port}")
+            call = asyncio.create_task(connection.pipeline(("GET", "key")))
+            await asyncio.sleep(0.05)
+            call.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await call
+            # A late reply to the cancelled GET must not be read by the next caller.
+            assert connection._writer is None
+
+    asyncio.run(scenario())
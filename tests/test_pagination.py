@@ -0,0 +1,105 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from db.pagination import encode_cursor
+from models.comment import Comment
+from models.journal import Journal
+
+SAME_TIME = datetime(2024, 5, 1, 12, 0, 0)
+
+
+def _b64(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+@pytest.fixture
+def tied_journals(run_db, make_user):
+    """(ids newest first, author id, author headers) for 6 journals sharing one created_at and an older one."""
+    user_id, headers = make_user()
+
+    async def insert(session):
+        journals = [Journal(user_id=user_id, title=f"j{n}", created_at=SAME_TIME, updated_at=SAME_TIME) for n in range(6)]
+        journals.append(Journal(user_id=user_id, title="old", created_at=datetime(2024, 1, 1), updated_at=SAME_TIME))
+        session.add_all(journals)
+        await session.commit()
+        return [journal.id for journal in journals]
+
+    ids = run_db(insert)
+    return sorted(ids[:6], reverse=True) + ids[6:], user_id, headers
+
+
+def _pages(client, path, limit, headers=None):
+    pages, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        body = client.get(path, params=params, headers=headers).json()
+        pages.append([item["id"] for item in body["data"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+        assert len(pages) < 10, "cursor does not advance"
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 10])
+def test_cursor_pages_are_stable_across_created_at_ties(client, tied_journals, limit):
+    ids, _, _ = tied_journals
+    pages = _pages(client, "/journals/", limit)
+    assert [journal_id for page in pages for journal_id in page] == ids
+    # The last page ends the listing even when it is exactly full.
+    assert all(pages) and len(pages) == -(-len(ids) // limit)
+
+
+def test_offset_and_cursor_agree(client, tied_journals):
+    ids, _, _ = tied_journals
+    first = client.get("/journals/", params={"limit": 3}).json()
+    by_cursor = client.get("/journals/", params={"limit": 3, "cursor": first["next_cursor"]}).json()
+    by_offset = client.get("/journals/", params={"limit": 3, "skip": 3}).json()
+    assert [j["id"] for j in by_cursor["data"]] == [j["id"] for j in by_offset["data"]] == ids[3:6]
+
+
+def test_comment_pages_break_ties_by_id(client, run_db, tied_journals):
+    ids, user_id, headers = tied_journals
+
+    async def insert(session):
+        comments = [Comment(journal_id=ids[0], user_id=user_id, text=str(n), created_at=SAME_TIME) for n in range(5)]
+        session.add_all(comments)
+        await session.commit()
+        return sorted((comment.id for comment in comments), reverse=True)
+
+    comment_ids = run_db(insert)
+    pages = _pages(client, f"/comments/{ids[0]}", 2, headers)
+    assert pages == [comment_ids[:2], comment_ids[2:4], comment_ids[4:]]
+
+
+def test_feed_pages_end_on_an_exactly_full_page(client, make_user):
+    author_id, author = make_user()
+    _, follower = make_user()
+    client.post("/social/follow", json={"following_id": author_id}, headers=follower)
+    ids = [client.post("/journals/", json={"title": str(n)}, headers=author).json()["data"]["id"] for n in range(4)]
+    assert _pages(client, "/feed/", 2, follower) == [ids[:1:-1], ids[1::-1]]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        encode_cursor(SAME_TIME, 5)[:-3],  # truncated
+        _b64({"created_at": "2024-05-01", "id": 1}),
+        _b64(["2024-05-01T12:00:00", 1, 2]),
+        _b64(["yesterday", 1]),
+        _b64(["2024-05-01T12:00:00", "one"]),
+        _b64([None, 1]),
+        base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    ],
+)
+def test_invalid_cursor_is_a_400(client, make_user, cursor):
+    _, headers = make_user()
+    journal_id = client.post("/journals/", json={"title": "t"}, headers=headers).json()["data"]["id"]
+    client.post("/journals/journal-tags", json={"journal_id": journal_id, "tag": "calm"}, headers=headers)
+    for path in ("/journals/", "/journals/by-tag/calm", f"/comments/{journal_id}", "/feed/"):
+        response = client.get(path, params={"cursor": cursor}, headers=headers)
+        assert response.status_code == 400, (path, response.text)
+        assert response.json()["message"] == "Invalid cursor"
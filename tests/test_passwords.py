@@ -0,0 +1,91 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+import security.passwords
+from security.passwords import PasswordHasher, password_hasher
+
+
+def test_saturated_hasher_rejects_with_retry_after():
+    hasher = PasswordHasher(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.create_task(hasher._run(release.wait))
+        await asyncio.sleep(0)  # let it take the only slot
+        try:
+            with pytest.raises(HTTPException) as rejected:
+                await hasher.hash("secret")
+        finally:
+            release.set()
+            await running
+        return rejected.value
+
+    error = asyncio.run(scenario())
+    hasher.shutdown()
+    assert error.status_code == 503
+    assert error.headers == {"Retry-After": "1"}
+    assert hasher.stats()["rejected"] == 1 and hasher.stats()["completed"] == 1
+
+
+def test_hash_and_verify_run_off_the_event_loop(monkeypatch):
+    hasher = PasswordHasher(max_workers=2, max_pending=4)
+    calls = []
+
+    def record(kind):
+        def _call(*args):
+            try:
+                asyncio.get_running_loop()
+                on_loop = True
+            except RuntimeError:
+                on_loop = False
+            calls.append((kind, threading.current_thread().name, on_loop))
+            return kind == "verify" or "hashed"
+
+        return _call
+
+    monkeypatch.setattr(security.passwords, "_hash", record("hash"))
+    monkeypatch.setattr(security.passwords, "_verify", record("verify"))
+
+    async def scenario():
+        return await hasher.hash("secret"), await hasher.verify("secret", "hashed")
+
+    assert asyncio.run(scenario()) == ("hashed", True)
+    hasher.shutdown()
+    assert [kind for kind, _, _ in calls] == ["hash", "verify"]
+    for _, thread_name, on_loop in calls:
+        assert thread_name.startswith("password-hash") and not on_loop
+
+
+def test_event_loop_keeps_running_while_a_hash_is_in_progress():
+    hasher = PasswordHasher(max_workers=1, max_pending=2)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.create_task(hasher._run(release.wait, 5))
+        ticks = 0
+        for _ in range(3):
+            await asyncio.sleep(0.01)
+            ticks += 1
+        assert not running.done()
+        release.set()
+        await running
+        return ticks
+
+    assert asyncio.run(scenario()) == 3
+    hasher.shutdown()
+
+
+def test_login_returns_503_while_the_hasher_is_saturated(client, monkeypatch):
+    credentials = {"email": "busy@example.com", "password": "abc123"}
+    signup = client.post("/user/signup", json={**credentials, "full_name": "Busy"})
+    assert signup.status_code == 200, signup.text
+    assert client.post("/user/login", json=credentials).status_code == 200
+
+    monkeypatch.setattr(password_hasher, "pending", password_hasher.max_pending)
+    response = client.post("/user/login", json=credentials)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert response.json()["status"] is False
@@ -0,0 +1,101 @@
+import time
+
+from sqlmodel import select
+
+from models.user import User
+from security.otp_store import otp_store
+from security.principal_cache import AuthPrincipal, PrincipalCache, TTLCache, principal_cache
+
+PRINCIPAL = AuthPrincipal(id=7, email="a@example.com", name="A", is_active=True)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    cache: TTLCache[str] = TTLCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"  # now most recently used
+    cache.set("c", "3")
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == ("1", None, "3")
+
+    cache.set("short", "4", ttl_seconds=5)
+    clock.now += 10
+    assert cache.get("short") is None
+    assert cache.get("c") == "3"
+    clock.now += 60
+    assert cache.get("c") is None and len(cache) == 0
+
+
+def test_claims_and_principals_are_cached(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    cache = PrincipalCache(maxsize=10, ttl_seconds=60)
+    assert cache.get_user_id("token") is None
+    cache.set_user_id("token", 7)
+    cache.set_principal(PRINCIPAL)
+    assert cache.get_user_id("token") == 7
+    assert cache.get_principal(7) == PRINCIPAL
+    assert cache.stats()["claims_hits"] == 1 and cache.stats()["claims_misses"] == 1
+
+    # Never kept past the token's own expiry.
+    cache.set_user_id("expired", 8, expires_at=int(time.time()) - 1)
+    assert cache.get_user_id("expired") is None
+
+    clock.now += 61
+    assert cache.get_user_id("token") is None
+    assert cache.get_principal(7) is None
+
+
+def test_invalidate_user_drops_the_principal_for_every_token():
+    cache = PrincipalCache(maxsize=10, ttl_seconds=60)
+    cache.set_user_id("first", 7)
+    cache.set_user_id("second", 7)
+    cache.set_principal(PRINCIPAL)
+    cache.invalidate_user(7)
+    assert cache.get_principal(7) is None
+    assert cache.get_user_id("first") == 7  # the claims are still valid
+    assert cache.stats()["invalidations"] == 1
+
+
+def _loads_user(profile) -> bool:
+    return any("FROM users" in statement for statement, _ in profile.statements)
+
+
+def test_repeated_requests_skip_the_user_lookup(profiled_request, make_user):
+    _, headers = make_user()
+    first, profile = profiled_request("GET", "/journals/journal-favorites", headers=headers)
+    assert first.status_code == 200 and _loads_user(profile)
+    second, profile = profiled_request("GET", "/journals/journal-favorites", headers=headers)
+    assert second.status_code == 200 and not _loads_user(profile)
+
+
+def test_reset_password_invalidates_the_cached_principal(client, run_db, make_user, profiled_request):
+    user_id, headers = make_user("Before")
+    client.get("/journals/journal-favorites", headers=headers)
+    assert principal_cache.principals.get(user_id).name == "Before"
+
+    async def rename(session):
+        user = (await session.exec(select(User).where(User.id == user_id))).one()
+        user.name = "After"
+        session.add(user)
+        await session.commit()
+        return user.email
+
+    email = run_db(rename)
+    client.portal.call(otp_store.issue, email, "123456")
+    response = client.post("/user/reset-password", json={"email": email, "otp": "123456", "new_password": "abc123"})
+    assert response.status_code == 200, response.text
+    assert principal_cache.principals.get(user_id) is None
+
+    _, profile = profiled_request("GET", "/journals/journal-favorites", headers=headers)
+    assert _loads_user(profile)
+    assert principal_cache.principals.get(user_id).name == "After"
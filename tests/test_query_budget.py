@@ -0,0 +1,70 @@
+import pytest
+
+from db.profiler import QueryProfile, assert_query_budget
+from security.principal_cache import principal_cache
+from services.visibility_service import block_sets
+
+
+def _journals(client, headers, count):
+    for number in range(count):
+        response = client.post("/journals/", json={"title": f"j{number}", "html_content": "<p>x</p>"}, headers=headers)
+        assert response.status_code == 200
+
+
+@pytest.fixture
+def author_and_follower(client, make_user):
+    author_id, author = make_user()
+    _, follower = make_user()
+    client.post("/social/follow", json={"following_id": author_id}, headers=follower)
+    return author, follower
+
+
+@pytest.mark.parametrize("journal_count", [1, 15])
+def test_journal_list_budget(client, profiled_request, author_and_follower, journal_count):
+    author, follower = author_and_follower
+    _journals(client, author, journal_count)
+    # Warm the principal and block-set caches, as on a worker in steady state.
+    client.get("/journals/", headers=follower)
+
+    response, profile = profiled_request("GET", "/journals/?limit=20", headers=follower)
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == journal_count
+    assert_query_budget(profile, 1)
+
+    response, profile = profiled_request("GET", "/journals/?limit=20")
+    assert response.status_code == 200
+    assert_query_budget(profile, 1)
+
+
+@pytest.mark.parametrize("journal_count", [1, 15])
+def test_feed_budget(client, profiled_request, author_and_follower, journal_count):
+    author, follower = author_and_follower
+    _journals(client, author, journal_count)
+    client.get("/feed/", headers=follower)
+
+    response, profile = profiled_request("GET", "/feed/?limit=20", headers=follower)
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == journal_count
+    # Pushed timeline and pulled authors.
+    assert_query_budget(profile, 2)
+
+
+def test_cold_caches_stay_within_budget(client, profiled_request, author_and_follower):
+    author, follower = author_and_follower
+    _journals(client, author, 3)
+    principal_cache.clear()
+    block_sets.entries.clear()
+    response, profile = profiled_request("GET", "/journals/", headers=follower)
+    assert response.status_code == 200
+    # Principal, block set and the page itself.
+    assert_query_budget(profile, 3)
+
+
+def test_budget_assertion_reports_repeated_statements():
+    profile = QueryProfile("GET /x")
+    for _ in range(3):
+        profile.record("SELECT * FROM journals WHERE id = ?", 0.001)
+    with pytest.raises(AssertionError, match="3x SELECT"):
+        assert_query_budget(profile, 5)
+    with pytest.raises(AssertionError, match="over a budget of 2"):
+        assert_query_budget(profile, 2, repeat_threshold=10)
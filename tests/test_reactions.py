@@ -0,0 +1,81 @@
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateTable
+from sqlmodel import select
+
+from models.journal import Journal, JournalReactions
+
+
+def _journal(client, headers):
+    response = client.post("/journals/", json={"title": "t", "html_content": "<p>x</p>"}, headers=headers)
+    return response.json()["data"]["id"]
+
+
+def _bulk(client, headers, items):
+    response = client.post("/journals/journal-reactions/bulk", json=items, headers=headers)
+    assert response.status_code == 200, response.json()
+    return response.json()["data"]
+
+
+def _state(run_db, journal_id):
+    async def read(session):
+        journal = (await session.exec(select(Journal).where(Journal.id == journal_id))).one()
+        types = (await session.exec(
+            select(JournalReactions.reaction_type).where(JournalReactions.journal_id == journal_id)
+        )).all()
+        return journal.reactions_count, sorted(types)
+
+    return run_db(read)
+
+
+def test_reaction_type_uses_a_binary_collation():
+    ddl = str(CreateTable(JournalReactions.__table__).compile(dialect=mysql.dialect()))
+    assert "reaction_type VARCHAR(255) COLLATE utf8mb4_bin" in ddl
+
+
+def test_single_and_bulk_reactions_store_the_same_type(client, run_db, make_user):
+    _, headers = make_user()
+    journal_id = _journal(client, headers)
+    response = client.post(
+        "/journals/journal-reactions", json={"journal_id": journal_id, "reaction_type": " Heart "}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["reaction_type"] == "Heart"
+
+    results = _bulk(
+        client,
+        headers,
+        [
+            {"journal_id": journal_id, "reaction_type": "Heart"},
+            {"journal_id": journal_id, "reaction_type": "heart"},
+            {"journal_id": journal_id, "reaction_type": "heart "},
+            {"journal_id": journal_id, "reaction_type": "  "},
+        ],
+    )
+    assert [result["status"] for result in results] == ["unchanged", "created", "duplicate", "rejected"]
+    assert results[0]["id"] == response.json()["data"]["id"]
+    assert _state(run_db, journal_id) == (2, ["Heart", "heart"])
+
+    blank = client.post(
+        "/journals/journal-reactions", json={"journal_id": journal_id, "reaction_type": " "}, headers=headers
+    )
+    assert blank.status_code == 400
+
+
+def test_bulk_reactions_move_counters_by_rows_inserted(client, run_db, make_user):
+    _, author = make_user()
+    _, reader = make_user()
+    first, second = _journal(client, author), _journal(client, author)
+    _bulk(client, reader, [{"journal_id": first, "reaction_type": "smile"}])
+    results = _bulk(
+        client,
+        reader,
+        [
+            {"journal_id": first, "reaction_type": "smile"},
+            {"journal_id": first, "reaction_type": "clap"},
+            {"journal_id": second, "reaction_type": "clap"},
+            {"journal_id": 999, "reaction_type": "clap"},
+        ],
+    )
+    assert [result["status"] for result in results] == ["unchanged", "created", "created", "rejected"]
+    assert _state(run_db, first) == (2, ["clap", "smile"])
+    assert _state(run_db, second) == (1, ["clap"])
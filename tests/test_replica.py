@@ -0,0 +1,105 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from db.migrate import create_all_and_stamp
+from db.replica import STICKY_COOKIE, ReplicaLagMonitor, recent_writers, replication_lag
+from db.sqlmodel import create_async_session_factory
+
+
+@pytest.mark.parametrize(
+    "row, expected",
+    [
+        ({"Seconds_Behind_Source": 1}, 1.0),
+        ({"Seconds_Behind_Master": 3}, 3.0),
+        ({"Seconds_Behind_Master": 0}, 0.0),
+        ({"Seconds_Behind_Master": None}, None),
+        ({"Slave_IO_Running": "Yes"}, None),
+        (None, None),
+    ],
+)
+def test_replication_lag_reads_mysql_and_mariadb_rows(row, expected):
+    assert replication_lag(row) == expected
+
+
+@pytest.fixture
+def replica(client, tmp_path, monkeypatch):
+    """An empty SQLite replica in front of the test database; returns its lag monitor.
+
+    Rows written through the API only reach the primary, so a listing shows
+    which database served it.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.sqlite'}")
+    client.portal.call(create_all_and_stamp, engine)
+    monitor = ReplicaLagMonitor(engine, interval_seconds=60, max_lag_seconds=2)
+    client.portal.call(monitor.check)
+    monkeypatch.setattr(client.app.state, "replica_session_factory", create_async_session_factory(engine))
+    monkeypatch.setattr(client.app.state, "replica_lag_monitor", monitor)
+    recent_writers.clear()
+    yield monitor
+    recent_writers.clear()
+    client.portal.call(engine.dispose)
+
+
+def _listed(client, headers=None) -> int:
+    response = client.get("/journals/", headers=headers)
+    assert response.status_code == 200
+    return len(response.json()["data"])
+
+
+def _write_journal(client, headers) -> None:
+    response = client.post("/journals/", json={"title": "t", "html_content": "<p>x</p>"}, headers=headers)
+    assert response.status_code == 200
+    client.cookies.clear()  # bearer-token clients do not keep cookies
+
+
+def test_reads_go_to_a_usable_replica(client, replica, make_user):
+    assert replica.usable
+    _, author = make_user()
+    _write_journal(client, author)
+    assert _listed(client) == 0
+
+
+def test_writer_reads_from_the_primary_without_a_cookie(client, replica, make_user):
+    _, author = make_user()
+    _, other = make_user()
+    _write_journal(client, author)
+    assert _listed(client, author) == 1
+    assert _listed(client, other) == 0
+    recent_writers.clear()  # READ_YOUR_WRITES_SECONDS elapsed
+    assert _listed(client, author) == 0
+
+
+def test_sticky_cookie_still_pins_cookie_clients(client, replica, make_user):
+    _, author = make_user()
+    response = client.post("/journals/", json={"title": "t", "html_content": "<p>x</p>"}, headers=author)
+    assert STICKY_COOKIE in response.cookies
+    recent_writers.clear()
+    assert _listed(client) == 1
+
+
+def test_lagging_replica_falls_back_to_the_primary(client, replica, make_user, monkeypatch):
+    _, author = make_user()
+    _write_journal(client, author)
+    recent_writers.clear()
+
+    async def behind():
+        return replica.max_lag_seconds + 1.0
+
+    monkeypatch.setattr(replica, "measure", behind)
+    client.portal.call(replica.check)
+    assert not replica.usable
+    assert _listed(client) == 1
+
+
+def test_unreachable_replica_falls_back_to_the_primary(client, replica, make_user, monkeypatch):
+    _, author = make_user()
+    _write_journal(client, author)
+    recent_writers.clear()
+
+    async def down():
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(replica, "measure", down)
+    client.portal.call(replica.check)
+    assert not replica.usable and replica.lag_seconds is None
+    assert _listed(client) == 1
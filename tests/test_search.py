@@ -0,0 +1,45 @@
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateTable
+
+from models.search import JournalSearchTerm
+
+
+def _journal(client, headers, title, body="<p>entry</p>"):
+    response = client.post("/journals/", json={"title": title, "html_content": body}, headers=headers)
+    assert response.status_code == 200
+    return response.json()["data"]["id"]
+
+
+def _search(client, q, **params):
+    response = client.get("/journals/search", params={"q": q, **params})
+    assert response.status_code == 200, response.json()
+    body = response.json()
+    return [journal["id"] for journal in body["data"]], body.get("next_cursor")
+
+
+def test_accented_terms_are_distinct(client, make_user):
+    _, headers = make_user()
+    accented = _journal(client, headers, "Café")
+    plain = _journal(client, headers, "Cafe")
+    assert _search(client, "café")[0] == [accented]
+    assert _search(client, "cafe")[0] == [plain]
+    ddl = str(CreateTable(JournalSearchTerm.__table__).compile(dialect=mysql.dialect()))
+    assert "term VARCHAR(64) COLLATE utf8mb4_bin" in ddl
+
+
+def test_later_pages_reuse_the_first_page_weights(client, make_user):
+    _, headers = make_user()
+    alphas = [_journal(client, headers, "alpha") for _ in range(2)]
+    beta = _journal(client, headers, "beta")
+    _journal(client, headers, "gamma")
+    first, cursor = _search(client, "alpha beta", limit=1)
+    assert first == [beta] and cursor
+
+    # Alpha becomes common enough that a fresh query would drop it as too
+    # common; the remaining pages still rank it with the first page's weights.
+    added = [_journal(client, headers, "alpha") for _ in range(10)]
+    seen = []
+    while cursor:
+        page, cursor = _search(client, "alpha beta", limit=5, cursor=cursor)
+        seen += page
+    assert sorted(seen) == sorted(alphas + added)
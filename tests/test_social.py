@@ -0,0 +1,12 @@
+def test_follow_target_must_exist_and_not_be_blocked(client, make_user):
+    follower_id, follower = make_user()
+    target_id, target = make_user()
+    other_id, _ = make_user()
+
+    def follow(user_id):
+        return client.post("/social/follow", json={"following_id": user_id}, headers=follower).status_code
+
+    assert follow(999) == 404
+    assert follow(other_id) == 200
+    assert client.post("/social/block", json={"blocked_id": follower_id}, headers=target).status_code == 200
+    assert follow(target_id) == 404
@@ -0,0 +1,50 @@
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateTable
+
+from models.user import UserSocialLinks
+
+
+def _bulk(client, headers, items):
+    response = client.post("/user/social-links/bulk", json=items, headers=headers)
+    assert response.status_code == 200, response.json()
+    return response.json()["data"]
+
+
+def test_platform_uses_a_binary_collation():
+    ddl = str(CreateTable(UserSocialLinks.__table__).compile(dialect=mysql.dialect()))
+    assert "platform VARCHAR(255) COLLATE utf8mb4_bin" in ddl
+
+
+def test_platforms_differing_in_case_are_separate_links(client, make_user):
+    _, headers = make_user()
+    first = _bulk(
+        client,
+        headers,
+        [{"platform": "GitHub", "url": "https://a.example"}, {"platform": "github", "url": "https://b.example"}],
+    )
+    assert [result["status"] for result in first] == ["created", "created"]
+    assert first[0]["id"] != first[1]["id"]
+
+    again = _bulk(
+        client,
+        headers,
+        [{"platform": " github ", "url": "https://b.example"}, {"platform": "GitHub", "url": "https://c.example"}],
+    )
+    assert [(result["status"], result["id"]) for result in again] == [
+        ("unchanged", first[1]["id"]),
+        ("updated", first[0]["id"]),
+    ]
+    links = client.get("/user/social-links", headers=headers).json()["data"]
+    assert sorted((link["platform"], link["url"]) for link in links) == [
+        ("GitHub", "https://c.example"),
+        ("github", "https://b.example"),
+    ]
+
+
+def test_single_and_bulk_store_the_same_platform_key(client, make_user):
+    _, headers = make_user()
+    response = client.post("/user/social-links", json={"platform": " Mastodon ", "url": "https://m.example"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["data"]["platform"] == "Mastodon"
+    (result,) = _bulk(client, headers, [{"platform": "Mastodon", "url": "https://m.example"}])
+    assert (result["status"], result["id"]) == ("unchanged", response.json()["data"]["id"])
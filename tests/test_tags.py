@@ -0,0 +1,47 @@
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateTable
+
+from models.journal import Tag
+from services.tag_service import get_or_create_tag_ids
+
+
+def test_tag_names_use_a_binary_collation():
+    ddl = str(CreateTable(Tag.__table__).compile(dialect=mysql.dialect()))
+    assert "name VARCHAR(100) COLLATE utf8mb4_bin" in ddl
+
+
+def test_accented_tags_get_their_own_rows(client, run_db):
+    async def create(session):
+        first = await get_or_create_tag_ids(session, ["café"])
+        both = await get_or_create_tag_ids(session, ["café", "cafe"])
+        await session.commit()
+        return first, both
+
+    first, both = run_db(create)
+    assert both["café"] == first["café"]
+    assert both["cafe"] != both["café"]
+
+
+def _journal(client, headers):
+    response = client.post("/journals/", json={"title": "t", "html_content": "<p>x</p>"}, headers=headers)
+    return response.json()["data"]["id"]
+
+
+def test_only_the_author_can_tag_a_journal(client, make_user):
+    _, author = make_user()
+    _, stranger = make_user()
+    journal_id = _journal(client, author)
+    item = {"journal_id": journal_id, "tag": "calm"}
+
+    anonymous = {"Authorization": "Bearer not-a-token"}
+    assert client.post("/journals/journal-tags", json=item, headers=anonymous).status_code == 401
+    assert client.post("/journals/journal-tags/bulk", json=[item], headers=anonymous).status_code == 401
+    assert client.post("/journals/journal-tags", json=item, headers=stranger).status_code == 404
+    response = client.post("/journals/journal-tags/bulk", json=[item], headers=stranger)
+    assert response.status_code == 200
+    assert response.json()["data"][0]["status"] == "rejected"
+    assert client.get(f"/journals/journal-tags/{journal_id}").json()["data"] == []
+
+    assert client.post("/journals/journal-tags", json=item, headers=author).status_code == 200
+    response = client.post("/journals/journal-tags/bulk", json=[item, {**item, "tag": "warm"}], headers=author)
+    assert [result["status"] for result in response.json()["data"]] == ["unchanged", "created"]
@@ -0,0 +1,71 @@
+import pytest
+
+
+def _journal(client, headers, title="hidden gem", private=False):
+    response = client.post(
+        "/journals/",
+        json={"title": title, "html_content": "<p>secret garden</p>", "is_private": private},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    return response.json()["data"]["id"]
+
+
+@pytest.fixture
+def blocked_pair(client, make_user):
+    """(author headers, reader headers, journal id) where the author has blocked the reader."""
+    _, author = make_user()
+    reader_id, reader = make_user()
+    journal_id = _journal(client, author)
+    client.post("/journals/journal-tags", json={"journal_id": journal_id, "tag": "calm"}, headers=author)
+    client.post("/comments/", json={"journal_id": journal_id, "text": "lovely"}, headers=author)
+    assert client.post("/social/block", json={"blocked_id": reader_id}, headers=author).status_code == 200
+    return author, reader, journal_id
+
+
+def _search_ids(client, headers, q="secret garden"):
+    response = client.get("/journals/search", params={"q": q}, headers=headers)
+    assert response.status_code == 200
+    return [journal["id"] for journal in response.json()["data"]]
+
+
+def test_search_hides_journals_across_a_block(client, blocked_pair):
+    author, reader, journal_id = blocked_pair
+    assert _search_ids(client, author) == [journal_id]
+    assert _search_ids(client, None) == [journal_id]
+    assert _search_ids(client, reader) == []
+
+
+def test_search_fills_pages_after_hidden_journals(client, make_user, blocked_pair):
+    _, reader, hidden = blocked_pair
+    _, other = make_user()
+    # Ranked below the hidden journal (longer body), so it only shows if the
+    # filter runs inside the ranking query rather than on the returned page.
+    visible = _journal(client, other, title="garden notes and more words")
+    response = client.get("/journals/search", params={"q": "secret garden", "limit": 1}, headers=reader)
+    assert [journal["id"] for journal in response.json()["data"]] == [visible]
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["/journals/journal-tags/{id}", "/journals/journal-reactions/{id}", "/comments/{id}", "/journals/{id}"],
+)
+def test_sub_resources_of_a_hidden_journal_are_not_found(client, blocked_pair, path):
+    author, reader, journal_id = blocked_pair
+    url = path.format(id=journal_id)
+    assert client.get(url, headers=author).status_code == 200
+    assert client.get(url).status_code == 200
+    response = client.get(url, headers=reader)
+    assert response.status_code == 404
+    assert "calm" not in response.text and "lovely" not in response.text
+
+
+@pytest.mark.parametrize("path", ["/journals/journal-tags/{id}", "/journals/journal-reactions/{id}", "/comments/{id}"])
+def test_sub_resources_of_private_and_missing_journals_are_not_found(client, make_user, path):
+    _, author = make_user()
+    _, stranger = make_user()
+    private = _journal(client, author, private=True)
+    assert client.get(path.format(id=private), headers=author).status_code == 200
+    assert client.get(path.format(id=private), headers=stranger).status_code == 404
+    assert client.get(path.format(id=private)).status_code == 404
+    assert client.get(path.format(id=999)).status_code == 404